@@ -331,6 +331,8 @@ class AgentConfig(BaseConfig):
     tooling: List[ToolingConfig] = field(default_factory=list)
     thinking: ThinkingConfig | None = None
     memories: List[MemoryAttachmentConfig] = field(default_factory=list)
+    parallel_tool_execution: bool = False
+    max_parallel_tools: int = 4
 
     # Runtime attributes (attached dynamically)
     token_tracker: Any | None = field(default=None, init=False, repr=False)
@@ -389,6 +391,14 @@ class AgentConfig(BaseConfig):
         if "retry" in mapping and mapping["retry"] is not None:
             retry_cfg = AgentRetryConfig.from_dict(mapping["retry"], path=extend_path(path, "retry"))
 
+        parallel_tool_execution = optional_bool(mapping, "parallel_tool_execution", path, default=False)
+        max_parallel_tools = 4
+        if mapping.get("max_parallel_tools") is not None:
+            max_parallel_tools = _coerce_positive_int(
+                mapping["max_parallel_tools"],
+                field_path=extend_path(path, "max_parallel_tools"),
+            )
+
         return cls(
             provider=provider,
             base_url=base_url,
@@ -401,6 +411,8 @@ class AgentConfig(BaseConfig):
             memories=memories_cfg,
             retry=retry_cfg,
             input_mode=input_mode,
+            parallel_tool_execution=bool(parallel_tool_execution),
+            max_parallel_tools=max_parallel_tools,
             path=path,
         )
 
@@ -501,6 +513,24 @@ class AgentConfig(BaseConfig):
             child=AgentRetryConfig,
             advance=True,
         ),
+        "parallel_tool_execution": ConfigFieldSpec(
+            name="parallel_tool_execution",
+            display_name="Parallel Tool Execution",
+            type_hint="bool",
+            required=False,
+            default=False,
+            description="Run independent tool calls from one model response concurrently",
+            advance=True,
+        ),
+        "max_parallel_tools": ConfigFieldSpec(
+            name="max_parallel_tools",
+            display_name="Max Parallel Tools",
+            type_hint="int",
+            required=False,
+            default=4,
+            description="Maximum number of tool calls running at once when parallel execution is enabled",
+            advance=True,
+        ),
     }
 
     @classmethod
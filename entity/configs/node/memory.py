@@ -1,5 +1,6 @@
 """Memory-related configuration dataclasses."""
 
+import hashlib
 from dataclasses import dataclass, field, replace
 from typing import Any, Dict, List, Mapping
 
@@ -17,6 +18,7 @@ from entity.configs.base import (
     ConfigFieldSpec,
     ChildKey,
     ensure_list,
+    optional_bool,
     optional_dict,
     optional_str,
     require_mapping,
@@ -24,6 +26,18 @@ from entity.configs.base import (
     extend_path,
 )
 
+VECTOR_INDEX_TYPES = ("flat", "ivf", "hnsw")
+RERANKER_TYPES = ("lexical", "token", "none")
+
+
+def _optional_positive_int(mapping: Mapping[str, Any], key: str, path: str, default: int) -> int:
+    value = mapping.get(key, default)
+    if value is None:
+        return default
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    raise ConfigError(f"{key} must be a positive integer", extend_path(path, key))
+
 
 @dataclass
 class EmbeddingConfig(BaseConfig):
@@ -32,6 +46,9 @@ class EmbeddingConfig(BaseConfig):
     api_key: str | None = None
     base_url: str | None = None
     params: Dict[str, Any] = field(default_factory=dict)
+    batch_size: int = 64
+    max_concurrency: int = 4
+    cache: bool = True
 
     @classmethod
     def from_dict(cls, data: Mapping[str, Any], *, path: str) -> "EmbeddingConfig":
@@ -41,7 +58,30 @@ class EmbeddingConfig(BaseConfig):
         api_key = optional_str(mapping, "api_key", path)
         base_url = optional_str(mapping, "base_url", path)
         params = optional_dict(mapping, "params", path) or {}
-        return cls(provider=provider, model=model, api_key=api_key, base_url=base_url, params=params, path=path)
+        batch_size = _optional_positive_int(mapping, "batch_size", path, 64)
+        max_concurrency = _optional_positive_int(mapping, "max_concurrency", path, 4)
+        cache = optional_bool(mapping, "cache", path, default=True)
+        return cls(
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            params=params,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            path=path,
+        )
+
+    def cache_key(self) -> str:
+        """Identify the vector space so cached embeddings are only reused for identical settings."""
+        payload = (
+            self.provider,
+            self.model,
+            self.base_url,
+            tuple(sorted((str(key), repr(value)) for key, value in self.params.items())),
+        )
+        return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
 
     FIELD_SPECS = {
         "provider": ConfigFieldSpec(
@@ -87,6 +127,33 @@ class EmbeddingConfig(BaseConfig):
             description="Embedding parameters (temperature, etc.)",
             advance=True,
         ),
+        "batch_size": ConfigFieldSpec(
+            name="batch_size",
+            display_name="Batch Size",
+            type_hint="int",
+            required=False,
+            default=64,
+            description="Number of texts sent per embedding request",
+            advance=True,
+        ),
+        "max_concurrency": ConfigFieldSpec(
+            name="max_concurrency",
+            display_name="Max Concurrent Requests",
+            type_hint="int",
+            required=False,
+            default=4,
+            description="Maximum embedding batches requested in parallel",
+            advance=True,
+        ),
+        "cache": ConfigFieldSpec(
+            name="cache",
+            display_name="Cache Embeddings",
+            type_hint="bool",
+            required=False,
+            default=True,
+            description="Reuse embeddings of identical text across runs and memory stores",
+            advance=True,
+        ),
     }
 
 
@@ -159,6 +226,9 @@ class FileSourceConfig(BaseConfig):
 class SimpleMemoryConfig(BaseConfig):
     memory_path: str | None = None
     embedding: EmbeddingConfig | None = None
+    index_type: str = "flat"
+    max_memories: int = 1000
+    reranker: str = "lexical"
 
     @classmethod
     def from_dict(cls, data: Mapping[str, Any], *, path: str) -> "SimpleMemoryConfig":
@@ -167,7 +237,31 @@ class SimpleMemoryConfig(BaseConfig):
         embedding_cfg = None
         if "embedding" in mapping and mapping["embedding"] is not None:
             embedding_cfg = EmbeddingConfig.from_dict(mapping["embedding"], path=extend_path(path, "embedding"))
-        return cls(memory_path=memory_path, embedding=embedding_cfg, path=path)
+
+        index_type = (optional_str(mapping, "index_type", path) or "flat").strip().lower()
+        if index_type not in VECTOR_INDEX_TYPES:
+            raise ConfigError(
+                f"index_type must be one of {list(VECTOR_INDEX_TYPES)}",
+                extend_path(path, "index_type"),
+            )
+
+        max_memories = _optional_positive_int(mapping, "max_memories", path, 1000)
+
+        reranker = (optional_str(mapping, "reranker", path) or "lexical").strip().lower()
+        if reranker not in RERANKER_TYPES:
+            raise ConfigError(
+                f"reranker must be one of {list(RERANKER_TYPES)}",
+                extend_path(path, "reranker"),
+            )
+
+        return cls(
+            memory_path=memory_path,
+            embedding=embedding_cfg,
+            index_type=index_type,
+            max_memories=max_memories,
+            reranker=reranker,
+            path=path,
+        )
 
     FIELD_SPECS = {
         "memory_path": ConfigFieldSpec(
@@ -186,6 +280,35 @@ class SimpleMemoryConfig(BaseConfig):
             description="Optional embedding configuration",
             child=EmbeddingConfig,
         ),
+        "index_type": ConfigFieldSpec(
+            name="index_type",
+            display_name="Vector Index Type",
+            type_hint="str",
+            required=False,
+            default="flat",
+            description="FAISS index used for retrieval: flat (exact), ivf or hnsw (approximate, for large stores)",
+            enum=list(VECTOR_INDEX_TYPES),
+            advance=True,
+        ),
+        "max_memories": ConfigFieldSpec(
+            name="max_memories",
+            display_name="Max Memories",
+            type_hint="int",
+            required=False,
+            default=1000,
+            description="Maximum number of stored memories; the oldest are evicted first",
+            advance=True,
+        ),
+        "reranker": ConfigFieldSpec(
+            name="reranker",
+            display_name="Reranker",
+            type_hint="str",
+            required=False,
+            default="lexical",
+            description="Rescoring of vector matches: lexical (tokens + LCS), token (token overlap only) or none",
+            enum=list(RERANKER_TYPES),
+            advance=True,
+        ),
     }
 
 
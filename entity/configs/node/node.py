@@ -1,7 +1,8 @@
 """Node configuration dataclasses."""
 
+import threading
 from dataclasses import dataclass, field, replace
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from entity.messages import Message, MessageRole
 from schema_registry import (
@@ -31,6 +32,9 @@ from entity.configs.node.tooling import FunctionToolConfig
 
 NodePayload = Message
 
+# Guards the per-node triggered-edge counters, which parallel branches update concurrently
+_TRIGGER_LOCK = threading.Lock()
+
 
 
 
@@ -54,10 +58,28 @@ class EdgeLink:
     process_metadata: Dict[str, Any] = field(default_factory=dict)
     payload_processor: Any = None
     dynamic_config: DynamicEdgeConfig | None = None
+    source: Optional["Node"] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.config = dict(self.config or {})
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name != "trigger" and name != "triggered":
+            object.__setattr__(self, name, value)
+            return
+        # Keep the target's count of active (trigger and triggered) incoming edges current
+        with _TRIGGER_LOCK:
+            state = self.__dict__
+            was_active = bool(state.get("trigger")) and bool(state.get("triggered"))
+            object.__setattr__(self, name, value)
+            is_active = bool(state.get("trigger")) and bool(state.get("triggered"))
+            if was_active == is_active:
+                return
+            target = state.get("target")
+            if target is None:
+                return
+            target._triggered_incoming += 1 if is_active else -1
+
 
 @dataclass
 class Node(BaseConfig):
@@ -77,6 +99,9 @@ class Node(BaseConfig):
     predecessors: List["Node"] = field(default_factory=list, repr=False)
     successors: List["Node"] = field(default_factory=list, repr=False)
     _outgoing_edges: List[EdgeLink] = field(default_factory=list, repr=False)
+    # Edges pointing at this node and how many of them are currently trigger-active
+    _incoming_edges: List[EdgeLink] = field(default_factory=list, repr=False, compare=False)
+    _triggered_incoming: int = field(default=0, repr=False, compare=False)
 
     FIELD_SPECS = {
         "id": ConfigFieldSpec(
@@ -406,23 +431,24 @@ class Node(BaseConfig):
                 existing.process_type = None
             existing.dynamic_config = dynamic_config
         else:
-            self._outgoing_edges.append(
-                EdgeLink(
-                    target=node,
-                    config=payload,
-                    trigger=trigger,
-                    condition=condition_label,
-                    condition_config=condition_config,
-                    condition_type=condition_type,
-                    carry_data=carry_data,
-                    keep_message=keep_message,
-                    clear_context=clear_context,
-                    clear_kept_context=clear_kept_context,
-                    process_config=process_config if isinstance(process_config, EdgeProcessorConfig) else None,
-                    process_type=process_type,
-                    dynamic_config=dynamic_config,
-                )
+            link = EdgeLink(
+                target=node,
+                config=payload,
+                trigger=trigger,
+                condition=condition_label,
+                condition_config=condition_config,
+                condition_type=condition_type,
+                carry_data=carry_data,
+                keep_message=keep_message,
+                clear_context=clear_context,
+                clear_kept_context=clear_kept_context,
+                process_config=process_config if isinstance(process_config, EdgeProcessorConfig) else None,
+                process_type=process_type,
+                dynamic_config=dynamic_config,
+                source=self,
             )
+            self._outgoing_edges.append(link)
+            node._incoming_edges.append(link)
 
     def add_predecessor(self, node: "Node") -> None:
         if node not in self.predecessors:
@@ -437,21 +463,23 @@ class Node(BaseConfig):
                 return link
         return None
 
+    def iter_incoming_edges(self) -> Iterator[EdgeLink]:
+        # Incoming edges only change while the graph is built, so no copy is needed
+        return iter(self._incoming_edges)
+
+    def find_incoming_edge(self, node_id: str) -> EdgeLink | None:
+        for link in self._incoming_edges:
+            if link.source is not None and link.source.id == node_id:
+                return link
+        return None
+
     def is_triggered(self) -> bool:
-        if self.start_triggered:
-            return True
-        for predecessor in self.predecessors:
-            for edge_link in predecessor.iter_outgoing_edges():
-                if edge_link.target is self and edge_link.trigger and edge_link.triggered:
-                    return True
-        return False
+        return self.start_triggered or self._triggered_incoming > 0
 
     def reset_triggers(self) -> None:
         self.start_triggered = False
-        for predecessor in self.predecessors:
-            for edge_link in predecessor.iter_outgoing_edges():
-                if edge_link.target is self:
-                    edge_link.triggered = False
+        for edge_link in self._incoming_edges:
+            edge_link.triggered = False
 
     def merge_vars(self, parent_vars: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         merged = dict(parent_vars or {})
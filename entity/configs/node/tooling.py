@@ -1,6 +1,7 @@
 """Tooling configuration models."""
 
 import hashlib
+import json
 from copy import deepcopy
 from dataclasses import dataclass, field, replace
 from typing import Any, Dict, List, Mapping, Tuple
@@ -273,6 +274,14 @@ class FunctionToolConfig(BaseConfig):
             path=path,
         )
 
+    def cache_key(self) -> str:
+        payload = (
+            json.dumps(self.tools, sort_keys=True, default=str),
+            self.auto_load,
+            self.timeout,
+        )
+        return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
+
     @staticmethod
     def _extract_module_from_all(value: str) -> str | None:
         if not value.endswith(MODULE_ALL_SUFFIX):
@@ -380,6 +389,8 @@ class McpLocalConfig(BaseConfig):
     inherit_env: bool = True
     startup_timeout: float = 10.0
     wait_for_log: str | None = None
+    pool_size: int = 1
+    concurrent_requests: bool = True
 
     FIELD_SPECS = {
         "command": ConfigFieldSpec(
@@ -438,6 +449,24 @@ class McpLocalConfig(BaseConfig):
             description="Regex that marks readiness when matched against stdout",
             advance=True,
         ),
+        "pool_size": ConfigFieldSpec(
+            name="pool_size",
+            display_name="Process Pool Size",
+            type_hint="int",
+            required=False,
+            default=1,
+            description="Number of server processes to launch; requests go to the least busy one",
+            advance=True,
+        ),
+        "concurrent_requests": ConfigFieldSpec(
+            name="concurrent_requests",
+            display_name="Concurrent Requests",
+            type_hint="bool",
+            required=False,
+            default=True,
+            description="Allow several in-flight requests per process; disable for servers that are not concurrency-safe",
+            advance=True,
+        ),
     }
 
     @classmethod
@@ -474,6 +503,19 @@ class McpLocalConfig(BaseConfig):
             raise ConfigError("startup_timeout must be numeric", extend_path(path, "startup_timeout"))
 
         wait_for_log = optional_str(mapping, "wait_for_log", path)
+
+        pool_size_value = mapping.get("pool_size", 1)
+        if pool_size_value is None:
+            pool_size = 1
+        elif isinstance(pool_size_value, int) and not isinstance(pool_size_value, bool) and pool_size_value >= 1:
+            pool_size = pool_size_value
+        else:
+            raise ConfigError("pool_size must be a positive integer", extend_path(path, "pool_size"))
+
+        concurrent_requests = optional_bool(mapping, "concurrent_requests", path, default=True)
+        if concurrent_requests is None:
+            concurrent_requests = True
+
         return cls(
             command=command,
             args=normalized_args,
@@ -482,6 +524,8 @@ class McpLocalConfig(BaseConfig):
             inherit_env=bool(inherit_env),
             startup_timeout=startup_timeout,
             wait_for_log=wait_for_log,
+            pool_size=pool_size,
+            concurrent_requests=bool(concurrent_requests),
             path=path,
         )
 
@@ -494,6 +538,8 @@ class McpLocalConfig(BaseConfig):
             self.inherit_env,
             self.startup_timeout,
             self.wait_for_log or "",
+            self.pool_size,
+            self.concurrent_requests,
         )
         return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
 
@@ -573,6 +619,16 @@ class ToolingConfig(BaseConfig):
         prefix = optional_str(mapping, "prefix", path)
         return cls(type=tooling_type, config=config_obj, prefix=prefix, path=path)
 
+    def cache_key(self) -> str:
+        config_key = ""
+        cache_key = getattr(self.config, "cache_key", None)
+        if callable(cache_key):
+            config_key = cache_key()
+        elif self.config is not None:
+            config_key = repr(self.config)
+        payload = (self.type, self.prefix or "", config_key)
+        return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
+
     @classmethod
     def field_specs(cls) -> Dict[str, ConfigFieldSpec]:
         specs = super().field_specs()
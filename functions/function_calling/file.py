@@ -96,6 +96,17 @@ class FileToolContext:
             return rel.as_posix() or "."
         return None
 
+    def record_write(self, *targets: Path) -> None:
+        """Tell the run's workspace watcher which node changed ``targets``."""
+        watcher = self._ctx.get("workspace_watcher")
+        node_id = self._ctx.get("node_id")
+        if watcher is None or node_id is None:
+            return
+        for target in targets:
+            relative = self.to_workspace_relative(target)
+            if relative and relative != ".":
+                watcher.claim(node_id, relative)
+
 
 def _check_attachments_not_modified(path: str) -> None:
     if path.startswith("attachments"):
@@ -305,6 +316,7 @@ def delete_path(
     else:
         target.unlink()
         deleted_type = "file"
+    ctx.record_write(target)
 
     return {
         "path": ctx.to_workspace_relative(target),
@@ -398,6 +410,7 @@ def save_file(
             handle.write(data)
     except OSError as exc:
         raise OSError(f"Failed to write file '{target}': {exc}") from exc
+    ctx.record_write(target)
 
     size = target.stat().st_size if target.exists() else None
     return {
@@ -585,6 +598,7 @@ def apply_text_edits(
 
     target.parent.mkdir(parents=True, exist_ok=True)
     target.write_text(rendered, encoding=used_encoding)
+    ctx.record_write(target)
     stat = target.stat()
     return {
         "path": ctx.to_workspace_relative(target),
@@ -628,6 +642,7 @@ def rename_path(
     _clear_destination(destination, overwrite)
     destination.parent.mkdir(parents=True, exist_ok=True)
     source.rename(destination)
+    ctx.record_write(source, destination)
     return {
         "path": ctx.to_workspace_relative(destination),
         "previous_path": ctx.to_workspace_relative(source),
@@ -664,6 +679,7 @@ def copy_path(
         shutil.copytree(source, destination)
     else:
         shutil.copy2(source, destination)
+    ctx.record_write(destination)
     return {
         "path": ctx.to_workspace_relative(destination),
         "source": ctx.to_workspace_relative(source),
@@ -700,6 +716,7 @@ def move_path(
     _clear_destination(destination, overwrite)
     destination.parent.mkdir(parents=True, exist_ok=True)
     shutil.move(source, destination)
+    ctx.record_write(source, destination)
     return {
         "path": ctx.to_workspace_relative(destination),
         "source": ctx.to_workspace_relative(source),
@@ -1,6 +1,5 @@
 """Lightweight append-only Blackboard memory implementation."""
 
-import json
 import os
 import time
 import uuid
@@ -14,6 +13,15 @@ from runtime.node.agent.memory.memory_base import (
     MemoryItem,
     MemoryWritePayload,
 )
+from runtime.node.agent.memory.storage import (
+    MemoryJournal,
+    decode_items,
+    encode_items,
+    journal_path,
+    read_store,
+    store_lock,
+    write_store,
+)
 
 
 class BlackboardMemory(MemoryBase):
@@ -27,35 +35,44 @@ class BlackboardMemory(MemoryBase):
         self.config = config
         self.memory_path = config.memory_path
         self.max_items = config.max_items
+        if self.memory_path:
+            self.journal = MemoryJournal(journal_path(self.memory_path), lock=store_lock(self.memory_path))
 
     # -------- Persistence --------
     def load(self) -> None:
-        if not self.memory_path or not os.path.exists(self.memory_path):
-            self.contents = []
-            return
-
-        try:
-            with open(self.memory_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            contents: List[MemoryItem] = []
-            for raw in data:
-                try:
-                    contents.append(MemoryItem.from_dict(raw))
-                except Exception:
-                    continue
-            self.contents = contents
-        except Exception:
-            # Corrupted file -> reset to empty to avoid blocking execution
+        with self.rw_lock.write():
             self.contents = []
+            if not self.memory_path:
+                self.content_index.rebuild(self.contents)
+                self._mark_changed()
+                return
+
+            # Another store sharing the path cannot compact between snapshot and journal reads
+            with store_lock(self.memory_path):
+                if os.path.exists(self.memory_path):
+                    try:
+                        data, matrix, _ = read_store(self.memory_path, self._snapshot_files)
+                        self.contents, _ = decode_items(data, matrix)
+                    except Exception:
+                        # Corrupted file -> reset to empty to avoid blocking execution
+                        self.contents = []
+                self.content_index.rebuild(self.contents)
+                self._mark_changed()
+                if self._replay_journal():
+                    self._write_snapshot()
 
     def save(self) -> None:
         if not self.memory_path:
             return
 
-        os.makedirs(os.path.dirname(self.memory_path), exist_ok=True)
-        payload = [item.to_dict() for item in self.contents[-self.max_items :]]
-        with open(self.memory_path, "w", encoding="utf-8") as file:
-            json.dump(payload, file, ensure_ascii=False, indent=2)
+        with self.rw_lock.read():
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        with store_lock(self.memory_path), self._persist_lock:
+            records, matrix = encode_items(self.contents[-self.max_items :])
+            write_store(self.memory_path, records, matrix, owned=self._snapshot_files)
+            self.journal.reset()
 
     # -------- Memory operations --------
     def retrieve(
@@ -65,13 +82,15 @@ class BlackboardMemory(MemoryBase):
         top_k: int,
         similarity_threshold: float,
     ) -> List[MemoryItem]:
-        if not self.contents:
-            return []
+        with self.rw_lock.read():
+            contents = self.contents
+            if not contents:
+                return []
 
-        if top_k <= 0 or top_k >= len(self.contents):
-            return list(self.contents)
+            if top_k <= 0 or top_k >= len(contents):
+                return list(contents)
 
-        return list(self.contents[-top_k:])
+            return list(contents[-top_k:])
 
     def update(self, payload: MemoryWritePayload) -> None:
         snapshot = payload.output_snapshot or payload.input_snapshot
@@ -94,6 +113,15 @@ class BlackboardMemory(MemoryBase):
             output_snapshot=payload.output_snapshot,
         )
 
-        self.contents.append(memory_item)
-        if len(self.contents) > self.max_items:
-            self.contents = self.contents[-self.max_items :]
+        # The board is append-only: repeated content is appended again so the
+        # latest write always holds the most recent position
+        with self.rw_lock.write():
+            self.contents.append(memory_item)
+            self.content_index.add(memory_item)
+            self._journal_add(memory_item)
+            self._mark_changed()
+            if len(self.contents) > self.max_items:
+                evicted = self.contents[: -self.max_items]
+                self.contents = self.contents[-self.max_items :]
+                self.content_index.discard(evicted)
+                self._journal_evict(evicted)
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import re
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
+import numpy as np
 import openai
 from tenacity import (
     retry,
@@ -11,6 +13,7 @@ from tenacity import (
 )
 
 from entity.configs import EmbeddingConfig
+from runtime.node.agent.memory.embedding_cache import embedding_cache_key, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,63 @@ class EmbeddingBase(ABC):
     def get_embedding(self, text):
         ...
 
+    def get_embeddings(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Embed ``texts`` in batches, reusing cached vectors for unchanged text.
+
+        Batches of ``batch_size`` texts are requested with up to
+        ``max_concurrency`` in flight. Results are read-only float32 arrays in
+        input order; entries are ``None`` where embedding failed.
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        namespace = self.config.cache_key()
+        # Identical texts are embedded once and share the result.
+        positions: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            positions.setdefault(embedding_cache_key(namespace, text), []).append(index)
+
+        cache = get_embedding_cache() if self.config.cache else None
+        # Blank inputs only ever embed to a placeholder vector; never persist those.
+        uncached = {
+            key for key, indexes in positions.items() if not self._preprocess_text(texts[indexes[0]])
+        }
+        if cache is not None:
+            for key, vector in cache.get_many([key for key in positions if key not in uncached]).items():
+                for index in positions.pop(key):
+                    results[index] = vector
+        if not positions:
+            return results
+
+        pending = list(positions)
+        batch_size = max(1, self.config.batch_size)
+        batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+
+        def embed(batch: List[str]) -> List[Optional[List[float]]]:
+            return self._embed_batch([texts[positions[key][0]] for key in batch])
+
+        workers = min(max(1, self.config.max_concurrency), len(batches))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding") as pool:
+                outputs = list(pool.map(embed, batches))
+        else:
+            outputs = [embed(batch) for batch in batches]
+
+        embedded: Dict[str, List[float]] = {}
+        for batch, vectors in zip(batches, outputs):
+            for key, vector in zip(batch, vectors):
+                if vector is not None:
+                    embedded[key] = vector
+        stored = {key: np.asarray(vector, dtype=np.float32) for key, vector in embedded.items()}
+        if cache is not None:
+            stored.update(cache.put_many({key: embedded[key] for key in embedded if key not in uncached}))
+        for key, vector in stored.items():
+            for index in positions[key]:
+                results[index] = vector
+        return results
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed one batch; providers with a native batch API override this."""
+        return [self.get_embedding(text) for text in texts]
+
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text to improve embedding quality."""
         if not text:
@@ -120,25 +180,59 @@ class OpenAIEmbedding(EmbeddingBase):
             logger.error(f"Error getting embedding: {e}")
             return [0.0] * 1536  # Return zero vector as fallback
 
-    def _get_chunked_embedding(self, text: str) -> List[float]:
-        """Chunk long text, embed each chunk, then aggregate."""
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed a batch with one request; failed texts come back as ``None``."""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        request_inputs: List[str] = []
+        request_positions: List[int] = []
+        for index, text in enumerate(texts):
+            processed_text = self._preprocess_text(text)
+            if not processed_text:
+                results[index] = [0.0] * 1536
+            elif self.use_chunking and len(processed_text) > self.max_length:
+                try:
+                    results[index] = self._get_chunked_embedding(processed_text, raise_on_error=True)
+                except Exception as e:
+                    logger.error(f"Error getting chunked embedding: {e}")
+            else:
+                request_inputs.append(processed_text[:self.max_length])
+                request_positions.append(index)
+
+        if request_inputs:
+            try:
+                embeddings = self._create_embeddings(request_inputs)
+            except Exception as e:
+                logger.error(f"Error getting batch embeddings: {e}")
+            else:
+                for index, embedding in zip(request_positions, embeddings):
+                    results[index] = embedding
+        return results
+
+    @retry(wait=wait_random_exponential(min=2, max=5), stop=stop_after_attempt(3), reraise=True)
+    def _create_embeddings(self, inputs: List[str]) -> List[List[float]]:
+        """Request embeddings for a list of inputs in a single API call."""
+        response = self.client.embeddings.create(
+            input=inputs,
+            model=self.model_name,
+            encoding_format="float"
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+
+    def _get_chunked_embedding(self, text: str, raise_on_error: bool = False) -> List[float]:
+        """Chunk long text, embed all chunks in one request, then aggregate."""
         chunks = self._chunk_text(text, self.max_length // 2)  # Halve the chunk length
         
         if not chunks:
             return [0.0] * 1536
         
-        chunk_embeddings = []
-        for chunk in chunks:
-            try:
-                response = self.client.embeddings.create(
-                    input=chunk,
-                    model=self.model_name,
-                    encoding_format="float"
-                )
-                chunk_embeddings.append(response.data[0].embedding)
-            except Exception as e:
-                logger.warning(f"Error getting chunk embedding: {e}")
-                continue
+        try:
+            chunk_embeddings = self._create_embeddings(chunks)
+        except Exception as e:
+            if raise_on_error:
+                raise
+            logger.warning(f"Error getting chunk embeddings: {e}")
+            chunk_embeddings = []
         
         if not chunk_embeddings:
             return [0.0] * 1536
@@ -187,3 +281,25 @@ class LocalEmbedding(EmbeddingBase):
         except Exception as e:
             logger.error(f"Error getting local embedding: {e}")
             return [0.0] * 768  # Return zero vector as fallback
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        processed = [self._preprocess_text(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        positions = [index for index, text in enumerate(processed) if text]
+        for index, text in enumerate(processed):
+            if not text:
+                results[index] = [0.0] * 768
+        if not positions:
+            return results
+        try:
+            embeddings = self.model.encode(
+                [processed[index] for index in positions],
+                batch_size=len(positions),
+                convert_to_tensor=False,
+            )
+        except Exception as e:
+            logger.error(f"Error getting local embeddings: {e}")
+            return results
+        for index, embedding in zip(positions, embeddings):
+            results[index] = embedding.tolist()
+        return results
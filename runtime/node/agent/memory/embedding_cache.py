@@ -0,0 +1,218 @@
+"""Content-addressed cache of embedding vectors shared by all memory stores.
+
+Vectors are keyed by the embedding settings plus a hash of the input text, so
+unchanged chunks are never sent to the provider twice. Recently used vectors
+stay in an in-process LRU; every vector is also written to a small SQLite
+database so later runs (and other stores) can reuse it. The database keeps at
+most ``EMBEDDING_CACHE_MAX_ROWS`` vectors, trimming the least recently used.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Maximum vectors kept in memory; older entries fall back to the database.
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+_PROJECT_ROOT = Path(__file__).resolve().parents[4]
+# Set EMBEDDING_CACHE_PATH to an empty string to keep the cache in memory only.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(_PROJECT_ROOT / "WareHouse" / ".cache" / "embedding_cache.db"))
+# Maximum vectors kept in the database; 0 disables trimming.
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+
+
+def embedding_cache_key(namespace: str, text: str) -> str:
+    """Return the cache key for ``text`` embedded under ``namespace``."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class EmbeddingCache:
+    """Thread-safe two-level (memory + SQLite) embedding cache.
+
+    Returned arrays are read-only float32 vectors shared between callers;
+    copy them before normalizing in place.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = EMBEDDING_CACHE_PATH,
+        max_size: int = EMBEDDING_CACHE_SIZE,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_size = max_size
+        self.max_rows = max_rows
+        # Rows written since the table was last trimmed; starts full so the first write checks.
+        self._writes_since_trim = max_rows
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db_ready = False
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever ``keys`` are known."""
+        found: Dict[str, np.ndarray] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+        if missing:
+            loaded = self._load(missing)
+            if loaded:
+                self._remember(loaded.items())
+                found.update(loaded)
+        return found
+
+    def put_many(self, entries: Dict[str, Sequence[float] | np.ndarray]) -> Dict[str, np.ndarray]:
+        """Store vectors and return them as the read-only arrays the cache now holds."""
+        stored = {key: self._freeze(vector) for key, vector in entries.items()}
+        if not stored:
+            return stored
+        self._remember(stored.items())
+        self._persist(stored)
+        return stored
+
+    def clear(self) -> None:
+        """Drop the in-memory entries; the database is left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _freeze(vector: Sequence[float] | np.ndarray) -> np.ndarray:
+        array = np.array(vector, dtype=np.float32).reshape(-1)
+        array.setflags(write=False)
+        return array
+
+    def _remember(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, vector in items:
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        try:
+            if not self._db_ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            if not self._db_ready:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        vector BLOB NOT NULL,
+                        last_used REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                columns = {row[1] for row in connection.execute("PRAGMA table_info(embeddings)")}
+                if "last_used" not in columns:
+                    connection.execute("ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+                connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+                connection.commit()
+                self._db_ready = True
+            return connection
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache database unavailable (%s); using memory only", exc)
+            self.db_path = None
+            return None
+
+    def _load(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        with self._db_lock:
+            connection = self._connect()
+            if connection is None:
+                return {}
+            loaded: Dict[str, np.ndarray] = {}
+            try:
+                # Stay well below SQLite's bound-parameter limit.
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = connection.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        batch,
+                    )
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        loaded[key] = vector
+                if loaded:
+                    now = time.time()
+                    connection.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in loaded],
+                    )
+                    connection.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Failed to read embedding cache: %s", exc)
+            finally:
+                connection.close()
+            return loaded
+
+    def _persist(self, entries: Dict[str, np.ndarray]) -> None:
+        with self._db_lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                now = time.time()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    [(key, vector.tobytes(), now) for key, vector in entries.items()],
+                )
+                connection.commit()
+                self._writes_since_trim += len(entries)
+                # Trim in batches so the count query runs once per ~10% of capacity
+                if self.max_rows > 0 and self._writes_since_trim >= max(1, self.max_rows // 10):
+                    self._trim(connection)
+            except sqlite3.Error as exc:
+                logger.warning("Failed to write embedding cache: %s", exc)
+            finally:
+                connection.close()
+
+    def _trim(self, connection: sqlite3.Connection) -> None:
+        """Delete the least recently used rows beyond ``max_rows``."""
+        self._writes_since_trim = 0
+        (count,) = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_rows
+        if excess <= 0:
+            return
+        connection.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        connection.commit()
+        logger.debug("Trimmed %s rows from the embedding cache", excess)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache()
+    return _embedding_cache
@@ -1,12 +1,13 @@
 """
 FileMemory: Memory system for vectorizing and retrieving file contents
 """
-import json
 import os
 import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import time
 
 import faiss
@@ -17,12 +18,43 @@ from runtime.node.agent.memory.memory_base import (
     MemoryContentSnapshot,
     MemoryItem,
     MemoryWritePayload,
+    content_hash,
+)
+from runtime.node.agent.memory.storage import (
+    decode_items,
+    encode_items,
+    read_store,
+    write_store,
 )
 from entity.configs import MemoryStoreConfig, FileSourceConfig
 from entity.configs.node.memory import FileMemoryConfig
 
 logger = logging.getLogger(__name__)
 
+# Threads used to hash, read and chunk files while (re)indexing
+FILE_MEMORY_INDEX_WORKERS = int(os.getenv("FILE_MEMORY_INDEX_WORKERS", "8"))
+# Log indexing progress every this many files
+_PROGRESS_INTERVAL = 500
+
+
+@dataclass
+class IndexingStats:
+    """Counters and timings for the most recent (re)indexing pass."""
+
+    files_scanned: int = 0
+    files_skipped: int = 0
+    files_hashed: int = 0
+    files_indexed: int = 0
+    files_removed: int = 0
+    chunks_embedded: int = 0
+    scan_seconds: float = 0.0
+    read_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
 
 class FileMemory(MemoryBase):
     """
@@ -47,27 +79,33 @@ class FileMemory(MemoryBase):
         self.chunk_size = 500  # Characters per chunk
         self.chunk_overlap = 50  # Overlapping characters between chunks
 
-        # File metadata cache {file_path: {hash, chunks_count, ...}}
+        # File metadata cache {file_path: {hash, size, mtime_ns, chunks_count, ...}}
         self.file_metadata: Dict[str, Dict[str, Any]] = {}
+        # Metrics of the last load(); see IndexingStats
+        self.index_stats = IndexingStats()
 
     def load(self) -> None:
         """
         Load existing index or build new one from file sources.
         Validates index integrity and performs incremental updates if needed.
         """
-        if self.index_path and os.path.exists(self.index_path):
-            logger.info(f"Loading existing index from {self.index_path}")
-            self._load_from_file()
-
-            # Validate and update if files changed
-            if self._validate_and_update_index():
-                logger.info("Index updated due to file changes")
-                self.save()
-        else:
-            logger.info("Building new index from file sources")
-            self._build_index_from_sources()
-            if self.index_path:
-                self.save()
+        with self.rw_lock.write():
+            if self.index_path and os.path.exists(self.index_path):
+                logger.info(f"Loading existing index from {self.index_path}")
+                self._load_from_file()
+                self.content_index.rebuild(self.contents)
+
+                # Validate and update if files changed
+                if self._validate_and_update_index():
+                    logger.info("Index updated due to file changes")
+                    self._write_snapshot()
+            else:
+                logger.info("Building new index from file sources")
+                self._build_index_from_sources()
+                self.content_index.rebuild(self.contents)
+                if self.index_path:
+                    self._write_snapshot()
+            self._mark_changed()
 
     def save(self) -> None:
         """Persist the memory index to disk"""
@@ -75,22 +113,23 @@ class FileMemory(MemoryBase):
             logger.warning("No index_path specified, skipping save")
             return
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
-
-        # Prepare data for serialization
-        data = {
-            "file_metadata": self.file_metadata,
-            "contents": [item.to_dict() for item in self.contents],
-            "config": {
-                "chunk_size": self.chunk_size,
-                "chunk_overlap": self.chunk_overlap,
+        with self.rw_lock.read():
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        with self._persist_lock:
+            # Prepare data for serialization; embeddings go to a binary matrix
+            records, matrix = encode_items(self.contents)
+            data = {
+                "file_metadata": self.file_metadata,
+                "contents": records,
+                "config": {
+                    "chunk_size": self.chunk_size,
+                    "chunk_overlap": self.chunk_overlap,
+                }
             }
-        }
 
-        # Save to JSON
-        with open(self.index_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            write_store(self.index_path, data, matrix, owned=self._snapshot_files)
 
         logger.info(f"Index saved to {self.index_path} ({len(self.contents)} chunks)")
 
@@ -116,20 +155,21 @@ class FileMemory(MemoryBase):
         if self.count_memories() == 0:
             return []
 
-        # Generate query embedding
-        query_embedding = self.embedding.get_embedding(query.text)
-        if isinstance(query_embedding, list):
-            query_embedding = np.array(query_embedding, dtype=np.float32)
-        query_embedding = query_embedding.reshape(1, -1)
+        # Generate query embedding (cached, so repeated queries skip the provider)
+        query_embedding = self.embedding.get_embeddings([query.text])[0]
+        if query_embedding is None:
+            return []
+        query_embedding = np.array(query_embedding, dtype=np.float32).reshape(1, -1)
         faiss.normalize_L2(query_embedding)
 
         # Collect embeddings from memory items
         memory_embeddings = []
         valid_items = []
-        for item in self.contents:
-            if item.embedding is not None:
-                memory_embeddings.append(item.embedding)
-                valid_items.append(item)
+        with self.rw_lock.read():
+            for item in self.contents:
+                if item.embedding is not None:
+                    memory_embeddings.append(item.embedding)
+                    valid_items.append(item)
 
         if not memory_embeddings:
             return []
@@ -161,23 +201,19 @@ class FileMemory(MemoryBase):
         logger.debug("FileMemory.update() called but FileMemory is read-only")
         pass
 
+    def checkpoint(self) -> None:
+        """FileMemory is read-only, so there are no per-update mutations to persist."""
+
     # ========== Private Helper Methods ==========
 
     def _load_from_file(self) -> None:
         """Load index from JSON file"""
         try:
-            with open(self.index_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data, matrix, _ = read_store(self.index_path, self._snapshot_files)
 
             self.file_metadata = data.get("file_metadata", {})
             raw_contents = data.get("contents", [])
-            contents: List[MemoryItem] = []
-            for raw in raw_contents:
-                try:
-                    contents.append(MemoryItem.from_dict(raw))
-                except Exception:
-                    continue
-            self.contents = contents
+            self.contents, legacy = decode_items(raw_contents, matrix)
 
             # Load config if present
             config = data.get("config", {})
@@ -185,6 +221,9 @@ class FileMemory(MemoryBase):
             self.chunk_overlap = config.get("chunk_overlap", self.chunk_overlap)
 
             logger.info(f"Loaded {len(self.contents)} chunks from index")
+            if legacy:
+                logger.info("Migrating index embeddings to binary storage")
+                self._write_snapshot()
         except Exception as e:
             logger.error(f"Error loading index: {e}")
             self.file_metadata = {}
@@ -192,69 +231,160 @@ class FileMemory(MemoryBase):
 
     def _build_index_from_sources(self) -> None:
         """Build index by scanning all file sources"""
-        all_chunks = []
-
-        for source in self.file_sources:
-            logger.info(f"Scanning source: {source.source_path}")
-            files = self._scan_files(source)
-            logger.info(f"Found {len(files)} files in {source.source_path}")
-
-            for file_path in files:
-                chunks = self._read_and_chunk_file(file_path, source.encoding)
-                all_chunks.extend(chunks)
+        started = time.perf_counter()
+        stats = self.index_stats = IndexingStats()
 
+        files = self._collect_files(stats)
+        all_chunks = self._read_files(list(files.items()), stats)
         logger.info(f"Total chunks to index: {len(all_chunks)}")
 
         # Generate embeddings for all chunks
-        self.contents = self._build_embeddings(all_chunks)
+        self.contents = self._embed_chunks(all_chunks, stats)
 
-        logger.info(f"Index built with {len(self.contents)} chunks")
+        stats.total_seconds = time.perf_counter() - started
+        logger.info(f"Index built with {len(self.contents)} chunks: {stats.to_dict()}")
 
     def _validate_and_update_index(self) -> bool:
         """
         Validate index integrity and update if files changed.
 
+        Files whose size and mtime match the stored metadata are skipped
+        without reading them; only suspected changes are hashed.
+
         Returns:
             True if index was updated, False otherwise
         """
+        started = time.perf_counter()
+        stats = self.index_stats = IndexingStats()
         updated = False
-        current_files = set()
 
-        # Scan current files
-        for source in self.file_sources:
-            files = self._scan_files(source)
-            current_files.update(files)
+        current_files = self._collect_files(stats)
 
         # Check for deleted files
-        indexed_files = set(self.file_metadata.keys())
-        deleted_files = indexed_files - current_files
-
+        deleted_files = set(self.file_metadata) - set(current_files)
         if deleted_files:
             logger.info(f"Removing {len(deleted_files)} deleted files from index")
             self._remove_files_from_index(deleted_files)
+            stats.files_removed = len(deleted_files)
             updated = True
 
-        # Check for new or modified files
+        # Only files whose size or mtime changed are read. New files are chunked
+        # straight away; indexed ones are hashed from the same bytes and dropped
+        # without chunking when their content turns out to be unchanged.
+        suspects = [
+            (file_path, encoding)
+            for file_path, encoding in current_files.items()
+            if self._stat_changed(file_path)
+        ]
+        stats.files_skipped = len(current_files) - len(suspects)
+        known_hashes = {
+            file_path: self.file_metadata[file_path].get("hash")
+            for file_path, _ in suspects
+            if file_path in self.file_metadata
+        }
+        stats.files_hashed = len(known_hashes)
+
+        read_started = time.perf_counter()
+        results = self._map_files(
+            lambda entry: self._read_and_chunk_file(*entry, unchanged_hash=known_hashes.get(entry[0])),
+            suspects,
+        )
+        stats.read_seconds += time.perf_counter() - read_started
+
+        pending_chunks: List[Dict] = []
+        changed: List[str] = []
+        for (file_path, _), chunks in zip(suspects, results):
+            if chunks is None:
+                # Touched but identical: remember the new stat so it is skipped next time
+                self._refresh_stat(file_path, self.file_metadata[file_path])
+                stats.files_skipped += 1
+                updated = True
+                continue
+            if file_path in known_hashes:
+                logger.info(f"Re-indexing modified file: {file_path}")
+                changed.append(file_path)
+            else:
+                logger.info(f"Indexing new file: {file_path}")
+            pending_chunks.extend(chunks)
+            stats.files_indexed += 1
+
+        # Embed before dropping the old chunks so unchanged ones reuse their vectors
+        new_items = self._embed_chunks(pending_chunks, stats) if pending_chunks else []
+        if changed:
+            self._drop_file_items(changed)
+            updated = True
+        if new_items:
+            self.contents.extend(new_items)
+            for item in new_items:
+                self.content_index.add(item)
+            updated = True
+
+        stats.total_seconds = time.perf_counter() - started
+        logger.info(f"Index validated: {stats.to_dict()}")
+        return updated
+
+    def _collect_files(self, stats: IndexingStats) -> Dict[str, str]:
+        """Scan every source once and map file paths to their encoding."""
+        started = time.perf_counter()
+        files: Dict[str, str] = {}
         for source in self.file_sources:
-            files = self._scan_files(source)
+            logger.info(f"Scanning source: {source.source_path}")
+            source_files = self._scan_files(source)
+            logger.info(f"Found {len(source_files)} files in {source.source_path}")
+            for file_path in source_files:
+                files.setdefault(file_path, source.encoding)
+        stats.files_scanned = len(files)
+        stats.scan_seconds = time.perf_counter() - started
+        return files
 
-            for file_path in files:
-                file_hash = self._compute_file_hash(file_path)
+    def _stat_changed(self, file_path: str) -> bool:
+        metadata = self.file_metadata.get(file_path)
+        if metadata is None:
+            return True
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return True
+        return metadata.get("size") != stat.st_size or metadata.get("mtime_ns") != stat.st_mtime_ns
 
-                # New file
-                if file_path not in self.file_metadata:
-                    logger.info(f"Indexing new file: {file_path}")
-                    self._index_file(file_path, source.encoding)
-                    updated = True
+    @staticmethod
+    def _refresh_stat(file_path: str, metadata: Dict[str, Any]) -> None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        metadata["size"] = stat.st_size
+        metadata["mtime_ns"] = stat.st_mtime_ns
 
-                # Modified file
-                elif self.file_metadata[file_path].get("hash") != file_hash:
-                    logger.info(f"Re-indexing modified file: {file_path}")
-                    self._remove_files_from_index([file_path])
-                    self._index_file(file_path, source.encoding)
-                    updated = True
+    def _map_files(self, func, entries: List[Tuple[str, str]]) -> List[Any]:
+        """Apply ``func`` to ``(file_path, encoding)`` entries on the index worker pool."""
+        if not entries:
+            return []
+        workers = max(1, min(FILE_MEMORY_INDEX_WORKERS, len(entries)))
+        if workers == 1:
+            return [func(entry) for entry in entries]
+        results: List[Any] = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-memory-index") as pool:
+            for done, result in enumerate(pool.map(func, entries), 1):
+                results.append(result)
+                if done % _PROGRESS_INTERVAL == 0:
+                    logger.info(f"Processed {done}/{len(entries)} files")
+        return results
 
-        return updated
+    def _read_files(self, entries: List[Tuple[str, str]], stats: IndexingStats) -> List[Dict]:
+        """Read and chunk files in parallel, preserving input order."""
+        started = time.perf_counter()
+        chunk_lists = self._map_files(lambda entry: self._read_and_chunk_file(*entry), entries)
+        stats.read_seconds += time.perf_counter() - started
+        stats.files_indexed += len(entries)
+        return [chunk for chunks in chunk_lists for chunk in chunks]
+
+    def _embed_chunks(self, chunks: List[Dict], stats: IndexingStats) -> List[MemoryItem]:
+        started = time.perf_counter()
+        items = self._build_embeddings(chunks)
+        stats.embed_seconds += time.perf_counter() - started
+        stats.chunks_embedded += len(items)
+        return items
 
     def _scan_files(self, source: FileSourceConfig) -> List[str]:
         """
@@ -300,33 +430,44 @@ class FileMemory(MemoryBase):
             return True
         return file_path.suffix in file_types
 
-    def _read_and_chunk_file(self, file_path: str, encoding: str = "utf-8") -> List[Dict]:
+    def _read_and_chunk_file(
+        self,
+        file_path: str,
+        encoding: str = "utf-8",
+        unchanged_hash: Optional[str] = None,
+    ) -> Optional[List[Dict]]:
         """
         Read file and split into chunks.
 
         Args:
             file_path: Path to file
             encoding: File encoding
+            unchanged_hash: Hash currently indexed for the file, if any
 
         Returns:
-            List of chunk dictionaries with content and metadata
+            List of chunk dictionaries with content and metadata, or None when
+            the file's hash equals ``unchanged_hash``
         """
         try:
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                content = f.read()
+            stat = os.stat(file_path)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
+            # Forget the file so it is re-read once it becomes readable again
+            self.file_metadata.pop(file_path, None)
             return []
 
-        if not content.strip():
-            return []
-
-        # Compute file hash
-        file_hash = self._compute_file_hash(file_path)
-        file_size = os.path.getsize(file_path)
+        # Hash the bytes we already read instead of reading the file again;
+        # decode with universal newlines like text-mode open() does
+        file_hash = hashlib.md5(raw).hexdigest()[:16]
+        if unchanged_hash is not None and file_hash == unchanged_hash:
+            return None
+        file_size = stat.st_size
+        content = raw.decode(encoding, errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
 
         # Chunk the content
-        chunks = self._chunk_text(content)
+        chunks = self._chunk_text(content) if content.strip() else []
 
         # Build chunk metadata
         chunk_dicts = []
@@ -349,6 +490,7 @@ class FileMemory(MemoryBase):
         self.file_metadata[file_path] = {
             "hash": file_hash,
             "size": file_size,
+            "mtime_ns": stat.st_mtime_ns,
             "chunks_count": len(chunks),
             "indexed_at": time.time(),
         }
@@ -412,66 +554,73 @@ class FileMemory(MemoryBase):
         Returns:
             List of MemoryItem objects
         """
-        memory_items = []
-
-        for chunk_dict in chunks:
-            content = chunk_dict["content"]
-            metadata = chunk_dict["metadata"]
+        if not chunks:
+            return []
 
-            # Generate embedding
+        # Chunks identical to already indexed content reuse its embedding
+        vectors: List[Any] = [None] * len(chunks)
+        missing: List[int] = []
+        for index, chunk in enumerate(chunks):
+            existing = self.content_index.get(content_hash(chunk["content"]))
+            if existing is not None and existing.embedding is not None:
+                vectors[index] = existing.embedding
+            else:
+                missing.append(index)
+
+        if missing:
             try:
-                embedding = self.embedding.get_embedding(content)
-                if isinstance(embedding, list):
-                    embedding = np.array(embedding, dtype=np.float32).reshape(1, -1)
-                faiss.normalize_L2(embedding)
-                embedding_list = embedding.tolist()[0]
+                embedded_vectors = self.embedding.get_embeddings([chunks[index]["content"] for index in missing])
             except Exception as e:
-                logger.error(f"Error generating embedding for chunk: {e}")
-                continue
+                logger.error(f"Error generating embeddings: {e}")
+                embedded_vectors = [None] * len(missing)
+            for index, vector in zip(missing, embedded_vectors):
+                vectors[index] = vector
+
+        embedded = [(chunk, vector) for chunk, vector in zip(chunks, vectors) if vector is not None]
+        if len(embedded) < len(chunks):
+            logger.error(f"Failed to embed {len(chunks) - len(embedded)} of {len(chunks)} chunks")
+        if not embedded:
+            return []
 
-            # Create MemoryItem
+        matrix = np.array([vector for _, vector in embedded], dtype=np.float32)
+        faiss.normalize_L2(matrix)
+
+        memory_items = []
+        timestamp = time.time()
+        for (chunk_dict, _), embedding in zip(embedded, matrix):
+            metadata = chunk_dict["metadata"]
             item_id = f"{metadata['file_hash']}_{metadata['chunk_index']}"
-            memory_item = MemoryItem(
-                id=item_id,
-                content_summary=content,
-                metadata=metadata,
-                embedding=embedding_list,
-                timestamp=time.time(),
+            memory_items.append(
+                MemoryItem(
+                    id=item_id,
+                    content_summary=chunk_dict["content"],
+                    metadata=metadata,
+                    embedding=embedding,
+                    timestamp=timestamp,
+                )
             )
 
-            memory_items.append(memory_item)
-
         return memory_items
 
-    def _compute_file_hash(self, file_path: str) -> str:
-        """Compute MD5 hash of file"""
-        hash_md5 = hashlib.md5()
-        try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()[:16]
-        except Exception as e:
-            logger.error(f"Error computing hash for {file_path}: {e}")
-            return "error"
-
-    def _index_file(self, file_path: str, encoding: str = "utf-8") -> None:
-        """Index a single file (helper for incremental updates)"""
-        chunks = self._read_and_chunk_file(file_path, encoding)
-        if chunks:
-            new_items = self._build_embeddings(chunks)
-            self.contents.extend(new_items)
-
     def _remove_files_from_index(self, file_paths: List[str]) -> None:
         """Remove chunks from deleted files"""
-        file_paths_set = set(file_paths)
-
-        # Filter out chunks from deleted files
-        self.contents = [
-            item for item in self.contents
-            if item.metadata.get("file_path") not in file_paths_set
-        ]
+        self._drop_file_items(file_paths)
 
         # Remove from metadata
         for file_path in file_paths:
             self.file_metadata.pop(file_path, None)
+
+    def _drop_file_items(self, file_paths: List[str]) -> None:
+        """Remove the indexed chunks of ``file_paths``, keeping their metadata"""
+        file_paths_set = set(file_paths)
+
+        # Filter out chunks from deleted files
+        kept: List[MemoryItem] = []
+        removed: List[MemoryItem] = []
+        for item in self.contents:
+            if item.metadata.get("file_path") in file_paths_set:
+                removed.append(item)
+            else:
+                kept.append(item)
+        self.contents = kept
+        self.content_index.discard(removed)
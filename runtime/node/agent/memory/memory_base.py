@@ -1,7 +1,11 @@
 """Base memory abstractions with multimodal snapshots."""
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import os
+import threading
 import time
 
 from entity.configs import MemoryAttachmentConfig, MemoryStoreConfig
@@ -9,6 +13,10 @@ from entity.configs.node.memory import FileMemoryConfig, SimpleMemoryConfig
 from entity.enums import AgentExecFlowStage
 from entity.messages import Message, MessageBlock
 from runtime.node.agent.memory.embedding import EmbeddingBase, EmbeddingFactory
+from utils.rw_lock import ReadWriteLock
+
+# Retrieval results cached per store; 0 disables the cache.
+MEMORY_RETRIEVAL_CACHE_SIZE = int(os.getenv("MEMORY_RETRIEVAL_CACHE_SIZE", "128"))
 
 
 @dataclass
@@ -190,11 +198,70 @@ class MemoryRetrievalResult:
         return attachments
 
 
+def content_hash(text: str) -> str:
+    """Digest used to detect duplicate memory content."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ContentHashIndex:
+    """Content hash -> items map kept in sync with a store's ``contents``.
+
+    Stores add items on insert, discard them on eviction and rebuild the
+    index after ``load()``, so duplicate checks no longer rehash every stored
+    item on each write.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, List[MemoryItem]] = {}
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._buckets
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get(self, digest: str) -> MemoryItem | None:
+        """Return the first stored item with ``digest``, if any."""
+        bucket = self._buckets.get(digest)
+        return bucket[0] if bucket else None
+
+    def add(self, item: MemoryItem, digest: str | None = None) -> str:
+        digest = digest or content_hash(item.content_summary)
+        self._buckets.setdefault(digest, []).append(item)
+        return digest
+
+    def discard(self, items: Iterable[MemoryItem]) -> None:
+        """Remove ``items`` (compared by identity) from the index."""
+        for item in items:
+            digest = content_hash(item.content_summary)
+            bucket = self._buckets.get(digest)
+            if not bucket:
+                continue
+            bucket[:] = [existing for existing in bucket if existing is not item]
+            if not bucket:
+                del self._buckets[digest]
+
+    def rebuild(self, items: Iterable[MemoryItem]) -> None:
+        self._buckets = {}
+        for item in items:
+            self.add(item)
+
+
 class MemoryBase:
     def __init__(self, store: MemoryStoreConfig):
         self.store = store
         self.name = store.name
         self.contents: List[MemoryItem] = []
+        # Stores keep this in sync with ``contents`` for O(1) duplicate checks
+        self.content_index = ContentHashIndex()
+        # Stores are shared by parallel agent nodes: retrieve() and save() take
+        # the read side, load() and the mutating part of update() the write side.
+        self.rw_lock = ReadWriteLock()
+        # Serializes snapshot writes, which run under the shared read lock
+        self._persist_lock = threading.Lock()
+        # Snapshot generation files this store loaded or wrote; only these are
+        # retired by its next snapshot, since other stores may share the path
+        self._snapshot_files: Set[str] = set()
 
         embedding_cfg = None
         simple_cfg = store.as_config(SimpleMemoryConfig)
@@ -207,10 +274,50 @@ class MemoryBase:
         self.embedding: EmbeddingBase | None = (
             EmbeddingFactory.create_embedding(embedding_cfg) if embedding_cfg else None
         )
+        # Stores with a snapshot file attach a ``MemoryJournal`` for incremental persistence
+        self.journal = None
+        # Bumped on every mutation; cached retrievals are keyed by it
+        self.version = 0
+        self._retrieval_cache: "OrderedDict[Tuple[Any, ...], List[MemoryItem]]" = OrderedDict()
+        self._retrieval_cache_lock = threading.Lock()
 
     def count_memories(self) -> int:
         return len(self.contents)
 
+    def retrieve_cached(
+        self,
+        agent_role: str,
+        query: MemoryContentSnapshot,
+        top_k: int,
+        similarity_threshold: float,
+    ) -> List[MemoryItem]:
+        """``retrieve()`` memoized on (store version, query fingerprint, top_k, threshold).
+
+        Loops that ask an unchanged store the same question (reviewer/critic
+        cycles) skip the embedding call and the search entirely.
+        """
+        if MEMORY_RETRIEVAL_CACHE_SIZE <= 0:
+            return self.retrieve(agent_role, query, top_k, similarity_threshold)
+        fingerprint = hashlib.sha1(f"{agent_role}\0{query.text}".encode("utf-8")).hexdigest()
+        key = (self.version, fingerprint, top_k, similarity_threshold)
+        with self._retrieval_cache_lock:
+            cached = self._retrieval_cache.get(key)
+            if cached is not None:
+                self._retrieval_cache.move_to_end(key)
+                return list(cached)
+        results = self.retrieve(agent_role, query, top_k, similarity_threshold)
+        with self._retrieval_cache_lock:
+            self._retrieval_cache[key] = list(results)
+            while len(self._retrieval_cache) > MEMORY_RETRIEVAL_CACHE_SIZE:
+                self._retrieval_cache.popitem(last=False)
+        return results
+
+    def _mark_changed(self) -> None:
+        """Record a mutation so cached retrievals are no longer served."""
+        self.version += 1
+        with self._retrieval_cache_lock:
+            self._retrieval_cache.clear()
+
     def load(self) -> None:  # pragma: no cover - implemented by subclasses
         raise NotImplementedError
 
@@ -229,6 +336,72 @@ class MemoryBase:
     def update(self, payload: MemoryWritePayload) -> None:
         raise NotImplementedError
 
+    def checkpoint(self) -> None:
+        """Persist mutations made since the last checkpoint.
+
+        Stores with a journal append the recorded mutations and only rewrite
+        the snapshot (``save()``) once the journal grows past its compaction
+        threshold; other stores fall back to ``save()``.
+        """
+        if self.journal is None:
+            self.save()
+            return
+        self.journal.flush()
+        if self.journal.needs_compaction:
+            self.save()
+
+    # -------- Journal helpers --------
+    def _journal_add(self, item: MemoryItem) -> None:
+        if self.journal is None:
+            return
+        record = item.to_dict()
+        if record.get("embedding") is not None:
+            record["embedding"] = [float(value) for value in record["embedding"]]
+        self.journal.record({"op": "add", "item": record})
+
+    def _journal_evict(self, items: List[MemoryItem]) -> None:
+        if self.journal is None or not items:
+            return
+        self.journal.record({"op": "evict", "ids": [item.id for item in items]})
+
+    def _replay_journal(self) -> bool:
+        """Apply journaled mutations on top of the loaded snapshot; return True if any."""
+        if self.journal is None:
+            return False
+        entries = self.journal.read()
+        known_ids = {item.id for item in self.contents}
+        for entry in entries:
+            op = entry.get("op")
+            if op == "add":
+                try:
+                    item = MemoryItem.from_dict(entry["item"])
+                except Exception:
+                    continue
+                # The snapshot may already contain entries from an interrupted compaction
+                if item.id in known_ids:
+                    continue
+                known_ids.add(item.id)
+                self._apply_add(item)
+            elif op == "evict":
+                evicted_ids = set(entry.get("ids") or [])
+                evicted = [item for item in self.contents if item.id in evicted_ids]
+                known_ids.difference_update(evicted_ids)
+                self._apply_evict(evicted)
+        return bool(entries)
+
+    def _apply_add(self, item: MemoryItem) -> None:
+        self.contents.append(item)
+        self.content_index.add(item)
+        self._mark_changed()
+
+    def _apply_evict(self, items: List[MemoryItem]) -> None:
+        if not items:
+            return
+        evicted = {id(item) for item in items}
+        self.contents = [item for item in self.contents if id(item) not in evicted]
+        self.content_index.discard(items)
+        self._mark_changed()
+
 
 class MemoryManager:
     def __init__(self, attachments: List[MemoryAttachmentConfig], stores: Dict[str, MemoryBase]):
@@ -255,7 +428,7 @@ class MemoryManager:
             memory = self.memories.get(attachment.name)
             if not memory:
                 continue
-            items = memory.retrieve(agent_role, query, attachment.top_k, attachment.similarity_threshold)
+            items = memory.retrieve_cached(agent_role, query, attachment.top_k, attachment.similarity_threshold)
             for item in items:
                 combined_score = self._score_memory(item, query.text)
                 results.append((attachment.name, item, combined_score))
@@ -285,7 +458,7 @@ class MemoryManager:
             if not memory:
                 continue
             memory.update(payload)
-            memory.save()
+            memory.checkpoint()
 
     def _score_memory(self, memory_item: MemoryItem, query: str) -> float:
         current_time = time.time()
@@ -0,0 +1,170 @@
+"""Rerankers that rescore vector-search candidates with lexical features."""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from runtime.node.agent.memory.memory_base import MemoryItem
+
+# Token sets are cached per memory item so repeated queries only tokenize the query.
+TOKEN_CACHE_SIZE = 4096
+
+
+def lcs_length(a: str, b: str) -> int:
+    """Length of the longest common subsequence of ``a`` and ``b``.
+
+    Bit-parallel algorithm (Hyyrö 2004): each row of the classic DP table is
+    one Python integer, so the cost is ``len(b)`` big-int operations instead
+    of ``len(a) * len(b)`` interpreted steps. Results match the DP exactly.
+    """
+    if not a or not b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    masks: Dict[str, int] = {}
+    for position, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count("1")
+
+
+class _TokenFeatures:
+    __slots__ = ("source", "text", "words", "keywords")
+
+    def __init__(self, text: str):
+        self.source = text
+        self.text = text.lower()
+        tokens = self.text.split()
+        self.words: FrozenSet[str] = frozenset(tokens)
+        self.keywords: FrozenSet[str] = frozenset(word for word in tokens if len(word) >= 2)
+
+
+class Reranker(ABC):
+    """Scores candidate memories against a query; higher is more relevant."""
+
+    @abstractmethod
+    def score(self, query: str, candidates: Sequence[MemoryItem]) -> List[float]:
+        ...
+
+
+class TokenReranker(Reranker):
+    """Token-overlap scoring over cached per-item token sets.
+
+    Combines Jaccard similarity, keyword recall and a length factor.
+    """
+
+    def __init__(self, cache_size: int = TOKEN_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._features: "OrderedDict[str, _TokenFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def score(self, query: str, candidates: Sequence[MemoryItem]) -> List[float]:
+        query_features = _TokenFeatures(query)
+        return [self._score(query_features, self._item_features(item)) for item in candidates]
+
+    def _score(self, query: _TokenFeatures, content: _TokenFeatures) -> float:
+        final_score = (
+            0.4 * self._jaccard(query, content)
+            + 0.2 * self._keyword_similarity(query, content)
+            + 0.1 * self._length_factor(query, content)
+        ) / 0.7
+        return min(final_score, 1.0)
+
+    def _item_features(self, item: MemoryItem) -> _TokenFeatures:
+        with self._lock:
+            features = self._features.get(item.id)
+            if features is not None and features.source == item.content_summary:
+                self._features.move_to_end(item.id)
+                return features
+        features = _TokenFeatures(item.content_summary)
+        with self._lock:
+            self._features[item.id] = features
+            if len(self._features) > self.cache_size:
+                self._features.popitem(last=False)
+        return features
+
+    @staticmethod
+    def _jaccard(query: _TokenFeatures, content: _TokenFeatures) -> float:
+        if not query.words or not content.words:
+            return 0.0
+        union = len(query.words | content.words)
+        return len(query.words & content.words) / union if union else 0.0
+
+    @staticmethod
+    def _keyword_similarity(query: _TokenFeatures, content: _TokenFeatures) -> float:
+        if not query.keywords:
+            return 0.0
+        return len(query.keywords & content.keywords) / len(query.keywords)
+
+    @staticmethod
+    def _length_factor(query: _TokenFeatures, content: _TokenFeatures) -> float:
+        """Penalize matches that deviate too much in length."""
+        query_len = len(query.text)
+        content_len = len(content.text)
+        if content_len == 0 or query_len == 0:
+            return 0.0
+        ratio = content_len / query_len
+        if 0.5 <= ratio <= 2.0:
+            return 1.0
+        if ratio < 0.5:
+            return ratio / 0.5
+        return max(0.1, 2.0 / ratio)
+
+
+class LexicalReranker(TokenReranker):
+    """Token features plus character-level LCS similarity (the default).
+
+    Produces the same scores as the original pure-Python scorer, using the
+    bit-parallel :func:`lcs_length`.
+    """
+
+    def _score(self, query: _TokenFeatures, content: _TokenFeatures) -> float:
+        longest = max(len(query.text), len(content.text))
+        lcs_sim = lcs_length(query.text, content.text) / longest if longest else 0.0
+        final_score = (
+            0.4 * self._jaccard(query, content)
+            + 0.3 * lcs_sim
+            + 0.2 * self._keyword_similarity(query, content)
+            + 0.1 * self._length_factor(query, content)
+        )
+        return min(final_score, 1.0)
+
+
+_RERANKERS: Dict[str, type] = {
+    "lexical": LexicalReranker,
+    "token": TokenReranker,
+}
+
+
+def create_reranker(name: str) -> Reranker | None:
+    """Instantiate the reranker registered as ``name``; ``"none"`` disables reranking."""
+    if name == "none":
+        return None
+    try:
+        return _RERANKERS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported reranker: {name}") from None
+
+
+def rerank(
+    reranker: Reranker | None,
+    query: str,
+    matches: Sequence[Tuple[MemoryItem, float]],
+    vector_weight: float = 0.7,
+) -> List[Tuple[MemoryItem, float]]:
+    """Blend vector similarity with reranker scores and sort best-first."""
+    if reranker is None or not matches:
+        combined = list(matches)
+    else:
+        scores = reranker.score(query, [item for item, _ in matches])
+        combined = [
+            (item, vector_weight * similarity + (1.0 - vector_weight) * score)
+            for (item, similarity), score in zip(matches, scores)
+        ]
+    combined.sort(key=lambda pair: pair[1], reverse=True)
+    return combined
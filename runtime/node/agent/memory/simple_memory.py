@@ -1,5 +1,4 @@
 import hashlib
-import json
 import os
 import re
 import time
@@ -12,7 +11,19 @@ from runtime.node.agent.memory.memory_base import (
     MemoryContentSnapshot,
     MemoryItem,
     MemoryWritePayload,
+    content_hash,
 )
+from runtime.node.agent.memory.reranker import create_reranker, rerank
+from runtime.node.agent.memory.storage import (
+    MemoryJournal,
+    decode_items,
+    encode_items,
+    journal_path,
+    read_store,
+    store_lock,
+    write_store,
+)
+from runtime.node.agent.memory.vector_index import VectorIndex
 import faiss
 import numpy as np
 
@@ -27,6 +38,12 @@ class SimpleMemory(MemoryBase):
         self.retrieve_prompt = "Query: {input}"
         self.update_prompt = "Input: {input}\nOutput: {output}"
         self.memory_path = self.config.memory_path  # auto
+        self.max_memories = self.config.max_memories
+        # Live FAISS index over item embeddings, kept in sync by update()/load()
+        self.vector_index = VectorIndex(self.config.index_type)
+        self.reranker = create_reranker(self.config.reranker)
+        if self.memory_path and self.memory_path.endswith(".json"):
+            self.journal = MemoryJournal(journal_path(self.memory_path), lock=store_lock(self.memory_path))
         
         # Content extraction configuration
         self.max_content_length = 500  # Maximum content length
@@ -67,25 +84,68 @@ class SimpleMemory(MemoryBase):
         return hashlib.md5(content.encode('utf-8')).hexdigest()[:8]
 
     def load(self) -> None:
-        if self.memory_path and os.path.exists(self.memory_path) and self.memory_path.endswith(".json"):
-            try:
-                with open(self.memory_path) as file:
-                    raw_data = json.load(file)
-                contents = []
-                for raw in raw_data:
-                    try:
-                        contents.append(MemoryItem.from_dict(raw))
-                    except Exception:
-                        continue
-                self.contents = contents
-            except Exception:
-                self.contents = []
+        if not self.memory_path or not self.memory_path.endswith(".json"):
+            return
+        # Another store sharing the path cannot compact between snapshot and journal reads
+        with self.rw_lock.write(), store_lock(self.memory_path):
+            matrix = None
+            index_path = None
+            legacy = False
+            if os.path.exists(self.memory_path):
+                try:
+                    raw_data, matrix, index_path = read_store(self.memory_path, self._snapshot_files)
+                    self.contents, legacy = decode_items(raw_data, matrix)
+                except Exception:
+                    self.contents = []
+            self.content_index.rebuild(self.contents)
+            self._load_vector_index(matrix, index_path)
+            self._mark_changed()
+            replayed = self._replay_journal()
+            if legacy or replayed:
+                # Fold the journal into a fresh snapshot (and migrate inline JSON embeddings)
+                self._write_snapshot()
 
     def save(self) -> None:
         if self.memory_path and self.memory_path.endswith(".json"):
-            os.makedirs(os.path.dirname(self.memory_path), exist_ok=True)
-            with open(self.memory_path, "w") as file:
-                json.dump([item.to_dict() for item in self.contents], file, indent=2, ensure_ascii=False)
+            with self.rw_lock.read():
+                self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        with store_lock(self.memory_path), self._persist_lock:
+            records, matrix = encode_items(self.contents)
+            item_ids = [item.id for item in self.vector_index.items]
+            write_store(
+                self.memory_path,
+                records,
+                matrix,
+                write_index=lambda path: self.vector_index.save(path, item_ids),
+                owned=self._snapshot_files,
+            )
+            if self.journal is not None:
+                self.journal.reset()
+
+    def _apply_add(self, item: MemoryItem) -> None:
+        super()._apply_add(item)
+        if item.embedding is not None:
+            self.vector_index.add(item, item.embedding)
+
+    def _apply_evict(self, items: List[MemoryItem]) -> None:
+        super()._apply_evict(items)
+        self.vector_index.evict(items)
+
+    def _load_vector_index(self, matrix: np.ndarray | None, index_path: str | None) -> None:
+        """Restore the persisted index, rebuilding it from item embeddings if stale."""
+        self.vector_index = VectorIndex(self.config.index_type)
+        embedded = [item for item in self.contents if item.embedding is not None]
+        if matrix is not None and index_path and self.vector_index.restore(
+            index_path,
+            embedded,
+            [item.id for item in embedded],
+            matrix,
+        ):
+            return
+        for item in embedded:
+            self.vector_index.add(item, item.embedding)
 
     def retrieve(
         self,
@@ -101,133 +161,24 @@ class SimpleMemory(MemoryBase):
         query_text = self.retrieve_prompt.format(input=query.text)
         query_text = self._extract_key_content(query_text)
         
-        inputs_embedding = self.embedding.get_embedding(query_text)
-        if isinstance(inputs_embedding, list):
-            inputs_embedding = np.array(inputs_embedding, dtype=np.float32)
-        inputs_embedding = inputs_embedding.reshape(1, -1)
-        faiss.normalize_L2(inputs_embedding)
+        if not len(self.vector_index):
+            return []
 
-        memory_embeddings = []
-        valid_items = []
-        for item in self.contents:
-            if item.embedding is not None:
-                memory_embeddings.append(item.embedding)
-                valid_items.append(item)
-        
-        if not memory_embeddings:
+        # Embed outside the lock so a slow provider call does not hold up writers;
+        # the embedding cache makes repeated queries free
+        inputs_embedding = self.embedding.get_embeddings([query_text])[0]
+        if inputs_embedding is None:
             return []
-            
-        memory_embeddings = np.array(memory_embeddings, dtype=np.float32)
 
-        # Use an efficient inner-product index
-        index = faiss.IndexFlatIP(memory_embeddings.shape[1])
-        index.add(memory_embeddings)
+        with self.rw_lock.read():
+            # Retrieve extra candidates for reranking
+            retrieval_k = min(top_k * 3, len(self.vector_index))
+            matches = self.vector_index.search(inputs_embedding, retrieval_k)
 
-        # Retrieve extra candidates for reranking
-        retrieval_k = min(top_k * 3, len(valid_items))
-        similarities, indices = index.search(inputs_embedding, retrieval_k)
-        
         # Filter and rerank the candidates
-        candidates = []
-        for i in range(len(indices[0])):
-            idx = indices[0][i]
-            similarity = similarities[0][i]
-
-            if idx != -1 and similarity >= similarity_threshold:
-                item = valid_items[idx]
-                # Calculate an auxiliary semantic similarity score
-                semantic_score = self._calculate_semantic_similarity(query_text, item.content_summary)
-                # Combine similarity metrics
-                combined_score = 0.7 * similarity + 0.3 * semantic_score
-                candidates.append((item, combined_score))
-        
-        # Sort by the combined score and return the top_k items
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        results = [item for item, score in candidates[:top_k]]
-        
-        return results
-    
-    def _calculate_semantic_similarity(self, query: str, content: str) -> float:
-        """Compute a semantic similarity value."""
-        # Enhanced semantic similarity computation
-        query_lower = query.lower()
-        content_lower = content.lower()
-        
-        # 1. Token overlap (Jaccard similarity)
-        query_words = set(query_lower.split())
-        content_words = set(content_lower.split())
-        
-        if not query_words or not content_words:
-            jaccard_sim = 0.0
-        else:
-            intersection = query_words & content_words
-            union = query_words | content_words
-            jaccard_sim = len(intersection) / len(union) if union else 0.0
-        
-        # 2. Longest common subsequence similarity
-        lcs_sim = self._calculate_lcs_similarity(query_lower, content_lower)
-        
-        # 3. Keyword match score
-        keyword_sim = self._calculate_keyword_similarity(query_lower, content_lower)
-        
-        # 4. Length penalty factor (avoid overly short/long matches)
-        length_factor = self._calculate_length_factor(query_lower, content_lower)
-        
-        # Weighted final score
-        final_score = (0.4 * jaccard_sim + 
-                      0.3 * lcs_sim + 
-                      0.2 * keyword_sim + 
-                      0.1 * length_factor)
-        
-        return min(final_score, 1.0)
-    
-    def _calculate_lcs_similarity(self, s1: str, s2: str) -> float:
-        """Compute longest common subsequence similarity."""
-        m, n = len(s1), len(s2)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if s1[i-1] == s2[j-1]:
-                    dp[i][j] = dp[i-1][j-1] + 1
-                else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-        
-        lcs_length = dp[m][n]
-        return lcs_length / max(len(s1), len(s2)) if max(len(s1), len(s2)) > 0 else 0.0
-    
-    def _calculate_keyword_similarity(self, query: str, content: str) -> float:
-        """Compute keyword match similarity."""
-        # Extract potential keywords (length >= 2)
-        query_keywords = set(word for word in query.split() if len(word) >= 2)
-        content_keywords = set(word for word in content.split() if len(word) >= 2)
-        
-        if not query_keywords:
-            return 0.0
-        
-        matches = query_keywords & content_keywords
-        return len(matches) / len(query_keywords)
-    
-    def _calculate_length_factor(self, query: str, content: str) -> float:
-        """Penalize matches that deviate too much in length."""
-        query_len = len(query)
-        content_len = len(content)
-        
-        if content_len == 0:
-            return 0.0
-        
-        # Ideal length ratio range
-        ideal_ratio_min = 0.5
-        ideal_ratio_max = 2.0
-        
-        ratio = content_len / query_len
-        
-        if ideal_ratio_min <= ratio <= ideal_ratio_max:
-            return 1.0
-        elif ratio < ideal_ratio_min:
-            return ratio / ideal_ratio_min
-        else:
-            return max(0.1, ideal_ratio_max / ratio)
+        candidates = [(item, similarity) for item, similarity in matches if similarity >= similarity_threshold]
+        ranked = rerank(self.reranker, query_text, candidates)
+        return [item for item, _ in ranked[:top_k]]
 
     def update(self, payload: MemoryWritePayload) -> None:
         if not self.embedding:
@@ -246,15 +197,11 @@ class SimpleMemory(MemoryBase):
         if len(extracted_content) < self.min_content_length:
             return
 
-        content_hash = self._generate_content_hash(extracted_content)
-        for existing_item in self.contents:
-            existing_hash = self._generate_content_hash(existing_item.content_summary)
-            if existing_hash == content_hash:
-                return
+        digest = content_hash(extracted_content)
+        if digest in self.content_index:
+            return
 
-        embedding_vector = self.embedding.get_embedding(extracted_content)
-        if isinstance(embedding_vector, list):
-            embedding_vector = np.array(embedding_vector, dtype=np.float32)
+        embedding_vector = self.embedding.get_embeddings([extracted_content])[0]
         if embedding_vector is None:
             return
         embedding_array = np.array(embedding_vector, dtype=np.float32).reshape(1, -1)
@@ -268,7 +215,7 @@ class SimpleMemory(MemoryBase):
         }
 
         memory_item = MemoryItem(
-            id=f"{content_hash}_{int(time.time())}",
+            id=f"{self._generate_content_hash(extracted_content)}_{int(time.time())}",
             content_summary=extracted_content,
             metadata=metadata,
             embedding=embedding_array.tolist()[0],
@@ -276,8 +223,19 @@ class SimpleMemory(MemoryBase):
             output_snapshot=snapshot,
         )
 
-        self.contents.append(memory_item)
-
-        max_memories = 1000
-        if len(self.contents) > max_memories:
-            self.contents = self.contents[-max_memories:]
+        with self.rw_lock.write():
+            # Another writer may have stored the same content while we were embedding
+            if digest in self.content_index:
+                return
+            self.contents.append(memory_item)
+            self.content_index.add(memory_item, digest)
+            self.vector_index.add(memory_item, embedding_array[0])
+            self._journal_add(memory_item)
+            self._mark_changed()
+
+            if len(self.contents) > self.max_memories:
+                evicted = self.contents[:-self.max_memories]
+                self.contents = self.contents[-self.max_memories:]
+                self.content_index.discard(evicted)
+                self.vector_index.evict(evicted)
+                self._journal_evict(evicted)
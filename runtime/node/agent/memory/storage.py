@@ -0,0 +1,363 @@
+"""Compact on-disk layout shared by the memory stores.
+
+Item metadata stays in JSON while embeddings live in a sibling ``.npy``
+matrix that is memory-mapped on load, so opening a store neither parses
+float text nor copies vectors. Records point at their vector through
+``embedding_row``; legacy records with inline ``embedding`` lists are still
+read and are migrated on the next save.
+
+A snapshot spans several files, so the matrix (and an optional vector
+index) are written under a fresh generation-stamped name first and the JSON,
+which names them, is swapped in last. A crash at any point leaves the old
+JSON pointing at the old, still-present generation. Several stores may share
+one path (e.g. parallel sessions), so reads and writes hold an interprocess
+lock and a store only deletes generations it loaded or wrote itself.
+
+Between snapshots, stores append their mutations to a ``.wal.jsonl``
+journal instead of rewriting the snapshot on every update.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from filelock import FileLock
+
+from runtime.node.agent.memory.memory_base import MemoryItem
+
+logger = logging.getLogger(__name__)
+
+# Windows cannot replace a file that is still mapped, so read it into memory there.
+_MMAP_MODE = None if os.name == "nt" else "r"
+# Journal entries written since the last snapshot before a store is compacted.
+MEMORY_WAL_COMPACT_THRESHOLD = int(os.getenv("MEMORY_WAL_COMPACT_THRESHOLD", "256"))
+# Set MEMORY_WAL_FSYNC=1 to fsync the journal on every flush (survives power loss).
+MEMORY_WAL_FSYNC = os.getenv("MEMORY_WAL_FSYNC", "0").strip().lower() in {"1", "true", "yes"}
+# Marks a JSON snapshot wrapped in the envelope that names its generation files.
+_STORE_FORMAT = 2
+
+
+def embedding_matrix_path(json_path: str) -> str:
+    """Return the legacy ``.npy`` path that stored embeddings for ``json_path``."""
+    root, _ = os.path.splitext(json_path)
+    return f"{root}.embeddings.npy"
+
+
+def vector_index_path(json_path: str) -> str:
+    """Return the legacy ``.npz`` path that stored the vector index for ``json_path``."""
+    root, _ = os.path.splitext(json_path)
+    return f"{root}.index.npz"
+
+
+def store_lock(json_path: str) -> FileLock:
+    """Return the interprocess lock guarding the snapshot at ``json_path``.
+
+    The lock is shared by every store in the process using that path and is
+    reentrant per thread, so callers may hold it around several operations.
+    """
+    root, _ = os.path.splitext(json_path)
+    return FileLock(f"{root}.lock", is_singleton=True)
+
+
+def journal_path(json_path: str) -> str:
+    """Return the write-ahead journal path for the snapshot at ``json_path``."""
+    root, _ = os.path.splitext(json_path)
+    return f"{root}.wal.jsonl"
+
+
+def encode_items(items: Sequence[MemoryItem]) -> Tuple[List[Dict[str, Any]], np.ndarray | None]:
+    """Split items into JSON records and a float32 embedding matrix.
+
+    Embeddings whose dimension differs from the first one (e.g. after an
+    embedding model change) stay inline in their record.
+    """
+    records: List[Dict[str, Any]] = []
+    vectors: List[Any] = []
+    dim: int | None = None
+    for item in items:
+        record = item.to_dict()
+        embedding = record.pop("embedding", None)
+        if embedding is not None:
+            if dim is None:
+                dim = len(embedding)
+            if len(embedding) == dim:
+                record["embedding_row"] = len(vectors)
+                vectors.append(embedding)
+            else:
+                record["embedding"] = [float(value) for value in embedding]
+        records.append(record)
+    matrix = np.asarray(vectors, dtype=np.float32) if vectors else None
+    return records, matrix
+
+
+def decode_items(
+    records: Sequence[Dict[str, Any]],
+    matrix: np.ndarray | None,
+) -> Tuple[List[MemoryItem], bool]:
+    """Rebuild items from JSON records and the embedding matrix.
+
+    Returns the items and whether any record used the legacy inline format.
+    """
+    items: List[MemoryItem] = []
+    legacy = False
+    for raw in records:
+        try:
+            item = MemoryItem.from_dict(raw)
+        except Exception:
+            continue
+        row = raw.get("embedding_row")
+        if row is not None:
+            if matrix is not None and 0 <= row < matrix.shape[0]:
+                item.embedding = matrix[row]
+            else:
+                item.embedding = None
+        elif raw.get("embedding") is not None:
+            legacy = True
+        items.append(item)
+    return items, legacy
+
+
+def load_matrix(path: str) -> np.ndarray | None:
+    """Memory-map the embedding matrix at ``path`` if it exists."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return np.load(path, mmap_mode=_MMAP_MODE, allow_pickle=False)
+    except Exception as exc:
+        logger.warning("Ignoring unreadable embedding matrix %s: %s", path, exc)
+        return None
+
+
+def read_store(
+    json_path: str,
+    owned: Optional[Set[str]] = None,
+) -> Tuple[Any, np.ndarray | None, Optional[str]]:
+    """Load a snapshot written by :meth:`write_store`.
+
+    Returns the payload, the memory-mapped embedding matrix and the path of
+    the vector index saved with it (``None`` when there is none). Snapshots
+    from before the envelope format use the fixed sibling file names. The
+    generation files of the loaded snapshot are added to ``owned``, so the
+    caller's next :func:`write_store` retires them.
+    """
+    with store_lock(json_path):
+        with open(json_path, encoding="utf-8") as file:
+            data = json.load(file)
+        if not (isinstance(data, dict) and data.get("store_format") == _STORE_FORMAT):
+            return data, load_matrix(embedding_matrix_path(json_path)), vector_index_path(json_path)
+
+        directory = os.path.dirname(json_path)
+        matrix = None
+        if data.get("matrix"):
+            matrix_path = os.path.join(directory, data["matrix"])
+            matrix = load_matrix(matrix_path)
+            if matrix is not None and matrix.shape[0] != data.get("rows"):
+                logger.warning("Ignoring embedding matrix for %s: row count does not match the snapshot", json_path)
+                matrix = None
+            if owned is not None:
+                owned.add(matrix_path)
+        index_path = os.path.join(directory, data["index"]) if data.get("index") else None
+        if owned is not None and index_path is not None:
+            owned.add(index_path)
+        return data.get("data"), matrix, index_path
+
+
+def write_store(
+    json_path: str,
+    payload: Any,
+    matrix: np.ndarray | None,
+    *,
+    write_index: Optional[Callable[[str], None]] = None,
+    owned: Optional[Set[str]] = None,
+) -> None:
+    """Atomically replace the snapshot at ``json_path``.
+
+    ``write_index``, if given, is called with the path the vector index for
+    this generation should be saved to. ``owned`` holds the generation files
+    the caller loaded or wrote before; they are deleted once the new JSON is
+    in place and replaced by the files of this generation. Files of other
+    stores sharing the path are never touched.
+    """
+    directory = os.path.dirname(json_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    root, _ = os.path.splitext(json_path)
+    with store_lock(json_path):
+        generation = uuid.uuid4().hex[:12]
+        envelope: Dict[str, Any] = {"store_format": _STORE_FORMAT, "matrix": None, "rows": 0, "index": None}
+        keep = set()
+        if matrix is not None:
+            matrix_path = f"{root}.embeddings.{generation}.npy"
+            with open(matrix_path, "wb") as file:
+                np.save(file, matrix, allow_pickle=False)
+            envelope["matrix"] = os.path.basename(matrix_path)
+            envelope["rows"] = int(matrix.shape[0])
+            keep.add(matrix_path)
+        if write_index is not None:
+            index_path = f"{root}.index.{generation}.npz"
+            write_index(index_path)
+            envelope["index"] = os.path.basename(index_path)
+            keep.add(index_path)
+        envelope["data"] = payload
+
+        fd, json_tmp = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(json_path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(envelope, file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(json_tmp, json_path)
+        except BaseException:
+            _remove_file(json_tmp)
+            raise
+
+        # Fixed-name files only ever belonged to a pre-envelope JSON, which is gone now
+        stale = {embedding_matrix_path(json_path), vector_index_path(json_path)}
+        if owned is not None:
+            stale.update(owned - keep)
+            owned.clear()
+            owned.update(keep)
+        for path in stale:
+            _remove_file(path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        logger.debug("Could not remove stale memory file %s: %s", path, exc)
+
+
+class MemoryJournal:
+    """Append-only JSONL log of memory mutations since the last snapshot.
+
+    Entries are buffered by :meth:`record` and appended by :meth:`flush`. A
+    torn final line (crash mid-write) is ignored on :meth:`read`; replay must
+    be idempotent because a crash between snapshot and :meth:`reset` leaves
+    entries that the snapshot already contains. Each entry carries an ``id``
+    so that :meth:`reset` only removes the entries this journal wrote or
+    replayed, leaving those of other stores sharing the file in place.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compact_threshold: int = MEMORY_WAL_COMPACT_THRESHOLD,
+        lock: Optional[FileLock] = None,
+    ):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.size = 0
+        # Interprocess lock shared with the snapshot (see store_lock); taken before _lock
+        self.file_lock = lock or FileLock(f"{path}.lock", is_singleton=True)
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._writer = uuid.uuid4().hex[:12]
+        self._seq = 0
+        # Ids of entries on disk that the owning store's contents already include
+        self._captured: Set[str] = set()
+        self._captured_untagged = False
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._seq += 1
+            self._pending.append({"id": f"{self._writer}:{self._seq}", **entry})
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.size >= self.compact_threshold
+
+    def flush(self) -> None:
+        """Append buffered entries to the journal file."""
+        with self.file_lock, self._lock:
+            if not self._pending:
+                return
+            lines = "".join(
+                json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for entry in self._pending
+            )
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(lines)
+                file.flush()
+                if MEMORY_WAL_FSYNC:
+                    os.fsync(file.fileno())
+            self._captured.update(entry["id"] for entry in self._pending)
+            self.size += len(self._pending)
+            self._pending = []
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Return the journaled entries, stopping at the first torn line.
+
+        The returned entries count as captured: the caller replays them into
+        its contents, so its next snapshot includes them.
+        """
+        entries: List[Dict[str, Any]] = []
+        with self.file_lock:
+            if os.path.exists(self.path):
+                valid_bytes = 0
+                with open(self.path, "rb") as file:
+                    for line in file:
+                        try:
+                            if not line.endswith(b"\n"):
+                                raise ValueError("incomplete line")
+                            entries.append(json.loads(line.decode("utf-8")))
+                        except ValueError:
+                            logger.warning("Ignoring truncated memory journal entry in %s", self.path)
+                            break
+                        valid_bytes += len(line)
+                if valid_bytes < os.path.getsize(self.path):
+                    # Cut the torn tail so later appends start on a clean line
+                    with open(self.path, "r+b") as file:
+                        file.truncate(valid_bytes)
+        with self._lock:
+            for entry in entries:
+                if "id" in entry:
+                    self._captured.add(entry["id"])
+                else:
+                    self._captured_untagged = True
+            self.size = len(entries)
+        return entries
+
+    def reset(self) -> None:
+        """Drop the entries a snapshot has just captured.
+
+        Entries appended by other stores sharing the file since this journal
+        last read it are kept for them (or the next load) to replay.
+        """
+        with self.file_lock, self._lock:
+            self._pending = []
+            self.size = 0
+            captured, self._captured = self._captured, set()
+            captured_untagged, self._captured_untagged = self._captured_untagged, False
+            if not os.path.exists(self.path):
+                return
+            kept: List[bytes] = []
+            with open(self.path, "rb") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        continue
+                    entry_id = entry.get("id") if isinstance(entry, dict) else None
+                    if entry_id is None:
+                        if not captured_untagged:
+                            kept.append(line)
+                    elif entry_id not in captured:
+                        kept.append(line)
+            if not kept:
+                os.remove(self.path)
+                return
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(self.path)}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.writelines(kept)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                _remove_file(tmp_path)
+                raise
@@ -0,0 +1,223 @@
+"""Incremental FAISS index over a FIFO window of memory embeddings."""
+
+import logging
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from entity.configs.node.memory import VECTOR_INDEX_TYPES
+
+logger = logging.getLogger(__name__)
+
+# IVF needs enough vectors to train its coarse quantizer; below this the
+# index stays exact (flat) until the next rebuild.
+IVF_MIN_TRAINING_SIZE = 256
+IVF_NPROBE = 8
+HNSW_M = 32
+HNSW_EF_SEARCH = 64
+
+
+class VectorIndex:
+    """Normalized embedding matrix plus a live FAISS index kept in sync.
+
+    Rows are appended as items arrive and evicted from the front, matching
+    the oldest-first trimming of memory stores. Evicted rows are only
+    tombstoned in the FAISS index (HNSW cannot delete) and filtered out of
+    search results; the index is rebuilt from the contiguous matrix once
+    tombstones pile up.
+    """
+
+    def __init__(self, index_type: str = "flat"):
+        if index_type not in VECTOR_INDEX_TYPES:
+            raise ValueError(f"Unsupported vector index type: {index_type}")
+        self.index_type = index_type
+        self.items: List[Any] = []
+        self._buffer: np.ndarray | None = None
+        self._start = 0
+        self._end = 0
+        self._index: faiss.Index | None = None
+        # FAISS ids are global row numbers; ids below _base are tombstones.
+        self._base = 0
+        self._next_id = 0
+        self._trained_size = 0
+
+    @property
+    def dim(self) -> int | None:
+        return None if self._buffer is None else self._buffer.shape[1]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Contiguous float32 view of the live, L2-normalized embeddings."""
+        if self._buffer is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._buffer[self._start:self._end]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: Any, vector: Sequence[float] | np.ndarray) -> bool:
+        """Normalize ``vector`` and append it for ``item``; return False if skipped."""
+        row = np.array(vector, dtype=np.float32).reshape(1, -1)
+        if self._buffer is not None and row.shape[1] != self.dim:
+            logger.warning(
+                "Skipping embedding with dimension %s (index dimension %s)", row.shape[1], self.dim
+            )
+            return False
+        faiss.normalize_L2(row)
+        self._append_rows(row)
+        self.items.append(item)
+        if self._index is None or self._should_retrain():
+            self._rebuild()
+        else:
+            self._index.add_with_ids(row, np.array([self._next_id], dtype=np.int64))
+        self._next_id += 1
+        return True
+
+    def evict(self, evicted: Sequence[Any]) -> None:
+        """Drop leading rows whose items are in ``evicted`` (compared by identity)."""
+        evicted_ids = {id(item) for item in evicted}
+        count = 0
+        while count < len(self.items) and id(self.items[count]) in evicted_ids:
+            count += 1
+        if not count:
+            return
+        del self.items[:count]
+        self._start += count
+        self._base += count
+        stale = self._index.ntotal - len(self.items) if self._index is not None else 0
+        if stale > max(64, len(self.items) // 4):
+            self._rebuild()
+
+    def search(self, query: Sequence[float] | np.ndarray, top_k: int) -> List[Tuple[Any, float]]:
+        """Return up to ``top_k`` ``(item, inner_product)`` pairs for ``query``."""
+        if self._index is None or not self.items or top_k <= 0:
+            return []
+        vector = np.array(query, dtype=np.float32).reshape(1, -1)
+        if vector.shape[1] != self.dim:
+            logger.warning("Query dimension %s does not match index dimension %s", vector.shape[1], self.dim)
+            return []
+        faiss.normalize_L2(vector)
+        stale = self._index.ntotal - len(self.items)
+        k = min(top_k + stale, self._index.ntotal)
+        similarities, ids = self._index.search(vector, k)
+        results: List[Tuple[Any, float]] = []
+        for row_id, similarity in zip(ids[0], similarities[0]):
+            if row_id < self._base:
+                continue
+            results.append((self.items[row_id - self._base], float(similarity)))
+            if len(results) >= top_k:
+                break
+        return results
+
+    def save(self, path: str, item_ids: Sequence[str]) -> None:
+        """Persist row ids and the serialized index; the matrix is stored by the caller."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload: Dict[str, Any] = {
+            "index_type": np.array(self.index_type),
+            "item_ids": np.array(list(item_ids), dtype=str),
+            "base": np.array(self._base, dtype=np.int64),
+            "next_id": np.array(self._next_id, dtype=np.int64),
+        }
+        if self._index is not None:
+            payload["index"] = faiss.serialize_index(self._index)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **payload)
+        os.replace(tmp_path, path)
+
+    def restore(
+        self,
+        path: str,
+        items: Sequence[Any],
+        item_ids: Sequence[str],
+        matrix: np.ndarray,
+    ) -> bool:
+        """Adopt the index saved by :meth:`save` if it matches ``item_ids``; return success.
+
+        ``matrix`` holds the already-normalized rows for ``items`` and may be a
+        read-only memory map; it is copied on the first append.
+        """
+        if not os.path.exists(path) or matrix.shape[0] != len(items):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["index_type"]) != self.index_type:
+                    return False
+                if list(data["item_ids"]) != list(item_ids):
+                    return False
+                index = faiss.deserialize_index(data["index"]) if "index" in data else None
+                base = int(data["base"])
+                next_id = int(data["next_id"])
+        except Exception as exc:
+            logger.warning("Ignoring unreadable vector index %s: %s", path, exc)
+            return False
+
+        self.items = list(items)
+        self._buffer = matrix if matrix.size else None
+        self._start = 0
+        self._end = matrix.shape[0]
+        self._index = index
+        self._base = base
+        self._next_id = next_id
+        self._trained_size = len(self.items) if self.index_type == "ivf" else 0
+        self._configure_search(self._index)
+        return True
+
+    def _append_rows(self, rows: np.ndarray) -> None:
+        if self._buffer is None:
+            self._buffer = np.empty((max(16, rows.shape[0]), rows.shape[1]), dtype=np.float32)
+        live = self._end - self._start
+        if self._end + rows.shape[0] > self._buffer.shape[0]:
+            capacity = self._buffer.shape[0]
+            if live + rows.shape[0] > capacity // 2:
+                capacity = max(capacity * 2, live + rows.shape[0])
+            buffer = np.empty((capacity, self._buffer.shape[1]), dtype=np.float32)
+            buffer[:live] = self._buffer[self._start:self._end]
+            self._buffer = buffer
+            self._start = 0
+            self._end = live
+        self._buffer[self._end:self._end + rows.shape[0]] = rows
+        self._end += rows.shape[0]
+
+    def _should_retrain(self) -> bool:
+        # Retrain IVF centroids as the store doubles so nlist tracks its size.
+        if self.index_type != "ivf":
+            return False
+        return len(self.items) >= max(IVF_MIN_TRAINING_SIZE, 2 * self._trained_size)
+
+    def _rebuild(self) -> None:
+        matrix = self.matrix
+        index = self._create_index(matrix)
+        ids = np.arange(self._base, self._base + matrix.shape[0], dtype=np.int64)
+        if matrix.shape[0]:
+            index.add_with_ids(matrix, ids)
+        self._index = index
+
+    def _create_index(self, matrix: np.ndarray) -> faiss.Index:
+        dim = matrix.shape[1]
+        count = matrix.shape[0]
+        if self.index_type == "hnsw":
+            inner: faiss.Index = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        elif self.index_type == "ivf" and count >= IVF_MIN_TRAINING_SIZE:
+            nlist = max(1, min(int(4 * np.sqrt(count)), count // 39))
+            quantizer = faiss.IndexFlatIP(dim)
+            inner = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            inner.train(matrix)
+            self._trained_size = count
+        else:
+            inner = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIDMap2(inner)
+        self._configure_search(index)
+        return index
+
+    @staticmethod
+    def _configure_search(index: faiss.Index | None) -> None:
+        if index is None:
+            return
+        inner = faiss.downcast_index(index.index) if hasattr(index, "index") else index
+        if isinstance(inner, faiss.IndexIVF):
+            inner.nprobe = IVF_NPROBE
+        elif isinstance(inner, faiss.IndexHNSW):
+            inner.hnsw.efSearch = HNSW_EF_SEARCH
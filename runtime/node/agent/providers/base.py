@@ -1,11 +1,13 @@
 """Abstract base classes for agent providers."""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional
 
 from entity.configs import AgentConfig
 from entity.messages import Message
 from schema_registry import register_model_provider_schema
 from entity.tool_spec import ToolSpec
+from runtime.node.agent.providers.client_pool import CLIENT_CACHE_ENABLED, get_client_pool
 from runtime.node.agent.providers.response import ModelResponse
 from utils.token_tracker import TokenUsage
 from utils.registry import Registry
@@ -38,6 +40,26 @@ class ModelProvider(ABC):
         """
         pass
 
+    def client_cache_key(self) -> Hashable | None:
+        """
+        Return a key identifying clients that can be shared across executions.
+
+        Providers whose clients hold reusable connections should return every
+        setting that affects the client (base URL, API key, client options).
+        Returning ``None`` disables caching for the provider.
+        """
+        return None
+
+    @contextmanager
+    def lease_client(self) -> Iterator[Any]:
+        """Yield a client, reusing a cached one when the provider supports it."""
+        key = self.client_cache_key()
+        if key is None or not CLIENT_CACHE_ENABLED:
+            yield self.create_client()
+            return
+        with get_client_pool().lease((self.provider, key), self.create_client) as client:
+            yield client
+
     @abstractmethod
     def call_model(
         self,
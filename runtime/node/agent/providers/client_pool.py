@@ -0,0 +1,133 @@
+"""Process-wide cache of provider SDK clients.
+
+Provider clients own HTTP connection pools, so creating one per node
+execution throws away warm TLS connections on every turn. ``ClientPool``
+keeps one client per connection identity and hands it out through leases so
+idle clients can be closed without pulling them from under a running call.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from utils.structured_logger import get_server_logger
+
+# HTTP pool tuning shared by providers that build their own httpx clients.
+HTTP_MAX_CONNECTIONS = int(os.getenv("PROVIDER_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PROVIDER_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("PROVIDER_HTTP_KEEPALIVE_EXPIRY", "60"))
+# Seconds a cached client may stay unused before it is closed; 0 disables eviction.
+CLIENT_IDLE_TIMEOUT = float(os.getenv("PROVIDER_CLIENT_IDLE_TIMEOUT", "600"))
+# Set PROVIDER_CLIENT_CACHE=0 to build a fresh client for every node execution.
+CLIENT_CACHE_ENABLED = os.getenv("PROVIDER_CLIENT_CACHE", "1").strip().lower() not in {"0", "false", "no"}
+
+
+def fingerprint_secret(value: Optional[str]) -> Optional[str]:
+    """Return a stable digest so raw API keys are not kept as cache keys."""
+    if not value:
+        return None
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    leases: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ClientPool:
+    """Thread-safe cache of provider clients keyed by connection settings."""
+
+    def __init__(self, idle_timeout: float = CLIENT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _PooledClient] = {}
+
+    @contextmanager
+    def lease(self, key: Hashable, factory: Callable[[], Any]) -> Iterator[Any]:
+        """Yield the cached client for ``key``, creating it with ``factory`` if needed."""
+        entry = self._acquire(key, factory)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    def evict_idle(self) -> int:
+        """Close clients that have been idle longer than ``idle_timeout``."""
+        if self.idle_timeout <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key
+                for key, entry in self._entries.items()
+                if entry.leases == 0 and now - entry.last_used > self.idle_timeout
+            ]
+            evicted = [self._entries.pop(key) for key in expired]
+        for entry in evicted:
+            self._close(entry.client)
+        return len(evicted)
+
+    def clear(self) -> None:
+        """Close and drop every idle client."""
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if entry.leases == 0]
+            evicted = [self._entries.pop(key) for key in idle]
+        for entry in evicted:
+            self._close(entry.client)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _acquire(self, key: Hashable, factory: Callable[[], Any]) -> _PooledClient:
+        self.evict_idle()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.leases += 1
+                return entry
+        # Build outside the lock; client construction can be slow.
+        client = factory()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PooledClient(client=client)
+                self._entries[key] = entry
+                client = None
+            entry.leases += 1
+        if client is not None:
+            # Another thread won the race; discard our duplicate.
+            self._close(client)
+        return entry
+
+    @staticmethod
+    def _close(client: Any) -> None:
+        close = getattr(client, "close", None)
+        if not callable(close):
+            return
+        try:
+            close()
+        except Exception as exc:  # pragma: no cover - best effort cleanup
+            get_server_logger().warning(f"Failed to close provider client: {exc}")
+
+
+_client_pool: Optional[ClientPool] = None
+_client_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide provider client pool."""
+    global _client_pool
+    if _client_pool is None:
+        with _client_pool_lock:
+            if _client_pool is None:
+                _client_pool = ClientPool()
+    return _client_pool
@@ -7,6 +7,7 @@ import os
 import uuid
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import httpx
 from google import genai
 from google.genai import types as genai_types
 from google.genai.types import GenerateContentResponse
@@ -23,6 +24,12 @@ from entity.messages import (
 from entity.tool_spec import ToolSpec
 from runtime.node.agent import ModelProvider
 from runtime.node.agent import ModelResponse
+from runtime.node.agent.providers.client_pool import (
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    fingerprint_secret,
+)
 from utils.token_tracker import TokenUsage
 
 
@@ -47,6 +54,10 @@ class GeminiProvider(ModelProvider):
 
         return genai.Client(**client_kwargs)
 
+    def client_cache_key(self):
+        """Gemini clients only depend on the endpoint and credentials."""
+        return ((self.base_url or "").strip() or None, fingerprint_secret(self.api_key))
+
     def call_model(
         self,
         client,
@@ -605,12 +616,28 @@ class GeminiProvider(ModelProvider):
         return genai_types.GenerateContentConfig(**config_kwargs)
 
     def _build_http_options(self, base_url: str) -> Optional[genai_types.HttpOptions]:
-        if not base_url:
-            return None
+        options: Dict[str, Any] = {
+            "client_args": {
+                "limits": httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            },
+        }
+        if base_url:
+            options["base_url"] = base_url
+            options["timeout"] = 4 * 60 * 1000  # 4 min
         try:
-            return genai_types.HttpOptions(base_url=base_url, timeout=4 * 60 * 1000)  # 4 min
+            return genai_types.HttpOptions(**options)
         except Exception:
-            return None
+            options.pop("client_args")
+            if not base_url:
+                return None
+            try:
+                return genai_types.HttpOptions(**options)
+            except Exception:
+                return None
 
     def _coerce_image_config(self, image_config: Any) -> Any:
         if isinstance(image_config, genai_types.ImageConfig):
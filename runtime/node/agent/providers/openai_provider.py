@@ -8,6 +8,7 @@ import os
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import unquote_to_bytes
 
+import httpx
 import openai
 from openai import OpenAI
 
@@ -23,6 +24,12 @@ from entity.messages import (
 from entity.tool_spec import ToolSpec
 from runtime.node.agent import ModelProvider
 from runtime.node.agent import ModelResponse
+from runtime.node.agent.providers.client_pool import (
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    fingerprint_secret,
+)
 from utils.token_tracker import TokenUsage
 
 
@@ -40,16 +47,29 @@ class OpenAIProvider(ModelProvider):
         Returns:
             OpenAI client instance with token tracking if available
         """
+        http_client = openai.DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
         if self.base_url:
             return OpenAI(
                 api_key=self.api_key,
                 base_url=self.base_url,
+                http_client=http_client,
             )
         else:
             return OpenAI(
                 api_key=self.api_key,
+                http_client=http_client,
             )
 
+    def client_cache_key(self):
+        """OpenAI clients only depend on the endpoint and credentials."""
+        return (self.base_url or None, fingerprint_secret(self.api_key))
+
     def call_model(
         self,
         client: openai.Client,
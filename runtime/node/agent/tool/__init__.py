@@ -1,5 +1,6 @@
-from .tool_manager import ToolManager
+from .tool_manager import ToolManager, get_tool_manager
 
 __all__ = [
-    "ToolManager"
+    "ToolManager",
+    "get_tool_manager",
 ]
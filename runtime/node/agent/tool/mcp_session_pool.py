@@ -0,0 +1,248 @@
+"""Long-lived MCP client sessions shared across tool calls and workflow runs.
+
+Opening a streamable-HTTP MCP session costs an initialize handshake, which
+dominates short tool calls. ``McpSessionPool`` keeps one connected
+``fastmcp.Client`` per server configuration on a dedicated event loop thread
+so any caller (sync code or a short-lived ``asyncio.run`` loop) can reuse it.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import anyio
+import httpx
+from fastmcp import Client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from utils.structured_logger import get_server_logger
+
+# Seconds a session may stay unused before it is closed; 0 keeps sessions open.
+MCP_SESSION_IDLE_TIMEOUT = float(os.getenv("MCP_SESSION_IDLE_TIMEOUT", "300"))
+# Sessions unused for longer than this are pinged before the next request.
+MCP_SESSION_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_SESSION_HEALTH_CHECK_INTERVAL", "30"))
+
+# Errors that mean the session itself is gone rather than the tool failing.
+_CONNECTION_ERRORS = (
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    ConnectionError,
+)
+# The streamable-HTTP client reports a server-side session loss (HTTP 404)
+# with this code; the request never reached a tool, so retrying is safe.
+_SESSION_TERMINATED = 32600
+# Failures raised before the request left the client.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Read-only methods that may run twice; other requests (``call_tool``) are only
+# retried when they provably never reached the server.
+_IDEMPOTENT_METHODS = frozenset({"list_tools", "list_resources", "list_prompts", "ping"})
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    if isinstance(exc, _CONNECTION_ERRORS):
+        return True
+    if isinstance(exc, McpError):
+        return exc.error.code in (CONNECTION_CLOSED, _SESSION_TERMINATED)
+    return False
+
+
+def _is_retry_safe(method: str, exc: BaseException) -> bool:
+    if method in _IDEMPOTENT_METHODS or isinstance(exc, _CONNECT_ERRORS):
+        return True
+    return isinstance(exc, McpError) and exc.error.code == _SESSION_TERMINATED
+
+
+class _PooledSession:
+    def __init__(self, factory: Callable[[], Client]):
+        self.factory = factory
+        self.client: Optional[Client] = None
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.connect_lock = asyncio.Lock()
+
+
+class McpSessionPool:
+    """Thread-safe pool of connected MCP clients keyed by server configuration.
+
+    Features:
+    - One session per key, reused by concurrent and subsequent calls
+    - Ping sessions that have been idle before reuse and reconnect when unhealthy
+    - Drop the session when a request fails with a connection error, and retry once
+      on a fresh one if the request is idempotent or never reached the server
+    - Close sessions that stay idle longer than ``idle_timeout``
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = MCP_SESSION_IDLE_TIMEOUT,
+        health_check_interval: float = MCP_SESSION_HEALTH_CHECK_INTERVAL,
+    ):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._sessions: Dict[str, _PooledSession] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def call(
+        self,
+        key: str,
+        factory: Callable[[], Client],
+        method: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Await ``client.<method>(*args)`` on the pooled session for ``key``."""
+        future = self._submit(self._call(key, factory, method, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    def call_sync(
+        self,
+        key: str,
+        factory: Callable[[], Client],
+        method: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Blocking variant of :meth:`call` for synchronous callers."""
+        return self._submit(self._call(key, factory, method, *args, **kwargs)).result()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self) -> None:
+        """Close every pooled session."""
+        if self._loop is None:
+            return
+        self._submit(self._close_all()).result()
+
+    def _submit(self, coro: Any) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    name="mcp-session-pool",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        if self.idle_timeout > 0:
+            self._loop.create_task(self._reap_idle_sessions())
+        self._loop.run_forever()
+
+    async def _call(
+        self,
+        key: str,
+        factory: Callable[[], Client],
+        method: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        session = self._sessions.get(key)
+        if session is None:
+            session = _PooledSession(factory)
+            with self._lock:
+                self._sessions[key] = session
+
+        session.in_flight += 1
+        try:
+            client = await self._ensure_healthy(session)
+            try:
+                return await getattr(client, method)(*args, **kwargs)
+            except Exception as exc:
+                if not _is_connection_error(exc):
+                    raise
+                await self._reset(session, client)
+                if not _is_retry_safe(method, exc):
+                    # The server may already have run the tool; never repeat it
+                    get_server_logger().warning(f"MCP session lost during {method} ({exc}); not retrying")
+                    raise
+                get_server_logger().warning(f"MCP session lost ({exc}); reconnecting")
+                client = await self._ensure_healthy(session)
+                return await getattr(client, method)(*args, **kwargs)
+        finally:
+            session.in_flight -= 1
+            session.last_used = time.monotonic()
+
+    async def _ensure_healthy(self, session: _PooledSession) -> Client:
+        async with session.connect_lock:
+            client = session.client
+            if client is not None and client.is_connected():
+                idle_for = time.monotonic() - session.last_used
+                if session.in_flight > 1 or idle_for < self.health_check_interval:
+                    return client
+                try:
+                    if await client.ping():
+                        return client
+                except Exception as exc:
+                    get_server_logger().warning(f"MCP session health check failed: {exc}")
+            if client is not None:
+                await self._close_client(client)
+            client = session.factory()
+            await client.__aenter__()
+            session.client = client
+            return client
+
+    async def _reset(self, session: _PooledSession, client: Client) -> None:
+        async with session.connect_lock:
+            if session.client is client:
+                session.client = None
+        await self._close_client(client)
+
+    async def _reap_idle_sessions(self) -> None:
+        interval = max(1.0, min(self.idle_timeout, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                expired = [
+                    key
+                    for key, session in self._sessions.items()
+                    if session.in_flight == 0 and now - session.last_used > self.idle_timeout
+                ]
+                evicted = [self._sessions.pop(key) for key in expired]
+            for session in evicted:
+                if session.client is not None:
+                    await self._close_client(session.client)
+
+    async def _close_all(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            if session.client is not None:
+                await self._close_client(session.client)
+
+    @staticmethod
+    async def _close_client(client: Client) -> None:
+        try:
+            await client.close()
+        except Exception as exc:  # pragma: no cover - best effort cleanup
+            get_server_logger().warning(f"Failed to close MCP session: {exc}")
+
+
+_session_pool: Optional[McpSessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_mcp_session_pool() -> McpSessionPool:
+    """Return the process-wide MCP session pool."""
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = McpSessionPool()
+    return _session_pool
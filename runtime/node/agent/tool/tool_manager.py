@@ -3,14 +3,18 @@
 import asyncio
 import base64
 import binascii
+import hashlib
 from dataclasses import dataclass
 import inspect
 import logging
 import mimetypes
 import os
 import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
 
 from fastmcp import Client
 from fastmcp.client.client import CallToolResult as FastMcpCallToolResult
@@ -21,65 +25,119 @@ from entity.configs import ToolingConfig, ConfigError
 from entity.configs.node.tooling import FunctionToolConfig, McpLocalConfig, McpRemoteConfig
 from entity.messages import MessageBlock, MessageBlockType
 from entity.tool_spec import ToolSpec
+from runtime.node.agent.tool.mcp_session_pool import MCP_SESSION_IDLE_TIMEOUT, get_mcp_session_pool
 from utils.attachments import AttachmentStore
 from utils.function_manager import FUNCTION_CALLING_DIR, FunctionManager
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MCP_HTTP_TIMEOUT = 10.0
+# Number of distinct tooling configurations whose ToolSpec lists are kept.
+TOOL_SPEC_CACHE_SIZE = int(os.getenv("TOOL_SPEC_CACHE_SIZE", "256"))
+# Seconds a remote or stdio MCP server's tool listing is reused before it is fetched again.
+MCP_TOOL_CACHE_TTL = float(os.getenv("MCP_TOOL_CACHE_TTL", "300"))
+# Minimum seconds between checks of the function directory for edited files.
+FUNCTION_RELOAD_CHECK_INTERVAL = float(os.getenv("FUNCTION_RELOAD_CHECK_INTERVAL", "2"))
 
 
 @dataclass
 class _FunctionManagerCacheEntry:
     manager: FunctionManager
+    signature: Tuple[int, int]
     auto_loaded: bool = False
+    checked_at: float = 0.0
+
+
+def _functions_signature(directory: Path) -> Tuple[int, int]:
+    """Return ``(file count, newest mtime)`` of the Python files under ``directory``."""
+    count = 0
+    newest = 0
+    try:
+        for file in directory.rglob("*.py"):
+            if "__pycache__" in file.parts:
+                continue
+            try:
+                mtime = file.stat().st_mtime_ns
+            except OSError:
+                continue
+            count += 1
+            newest = max(newest, mtime)
+    except OSError:
+        pass
+    return count, newest
 
 
 class ToolManager:
-    """Manage function tools for agent nodes."""
+    """Manage function tools for agent nodes.
+
+    A single instance is shared by every workflow run (see
+    :func:`get_tool_manager`), so tool specs, MCP tool listings and stdio MCP
+    processes stay warm between runs. All caches are keyed by configuration
+    content, so editing a tooling config simply misses the cache. Function
+    modules are reloaded when a file in the function directory changes, and
+    MCP tool listings expire after ``MCP_TOOL_CACHE_TTL`` seconds.
+    """
 
     def __init__(self) -> None:
         self._functions_dir: Path = FUNCTION_CALLING_DIR
+        self._lock = threading.RLock()
         self._function_managers: Dict[Path, _FunctionManagerCacheEntry] = {}
-        self._mcp_tool_cache: Dict[str, List[Any]] = {}
+        # {cache_key: (fetched_at, tools)}
+        self._mcp_tool_cache: Dict[str, Tuple[float, List[Any]]] = {}
         self._mcp_stdio_clients: Dict[str, "_StdioClientWrapper"] = {}
+        self._stdio_launch_locks: Dict[str, threading.Lock] = {}
+        # {cache_key: (expires_at, specs)}; lists including MCP tools expire with the MCP listing
+        self._tool_spec_cache: "OrderedDict[str, Tuple[float, List[ToolSpec]]]" = OrderedDict()
 
     def _get_function_manager(self) -> FunctionManager:
-        entry = self._function_managers.get(self._functions_dir)
-        if entry is None:
-            entry = _FunctionManagerCacheEntry(manager=FunctionManager(self._functions_dir))
-            self._function_managers[self._functions_dir] = entry
-        return entry.manager
+        with self._lock:
+            return self._function_manager_entry().manager
 
     def _ensure_functions_loaded(self, auto_load: bool) -> None:
         if not auto_load:
             return
-        entry = self._function_managers.setdefault(
-            self._functions_dir,
-            _FunctionManagerCacheEntry(manager=FunctionManager(self._functions_dir))
-        )
-        if not entry.auto_loaded:
-            entry.manager.load_functions()
-            entry.auto_loaded = True
+        with self._lock:
+            entry = self._function_manager_entry()
+            if not entry.auto_loaded:
+                entry.manager.load_functions()
+                entry.auto_loaded = True
+
+    def _function_manager_entry(self) -> _FunctionManagerCacheEntry:
+        """Return the manager for the function directory, replacing it once its files change.
+
+        Callers hold ``self._lock``.
+        """
+        entry = self._function_managers.get(self._functions_dir)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < FUNCTION_RELOAD_CHECK_INTERVAL:
+            return entry
+        signature = _functions_signature(self._functions_dir)
+        if entry is None or entry.signature != signature:
+            if entry is not None:
+                logger.info("Function directory %s changed; reloading function tools", self._functions_dir)
+                self._tool_spec_cache.clear()
+            entry = _FunctionManagerCacheEntry(manager=FunctionManager(self._functions_dir), signature=signature)
+            self._function_managers[self._functions_dir] = entry
+        entry.checked_at = now
+        return entry
+
+    def invalidate(self) -> None:
+        """Drop cached tool specs and MCP tool listings so they are fetched again."""
+        with self._lock:
+            self._tool_spec_cache.clear()
+            self._mcp_tool_cache.clear()
 
     async def _fetch_mcp_tools_http(
         self,
-        server_url: str,
+        config: McpRemoteConfig,
         *,
-        headers: Dict[str, str] | None = None,
-        timeout: float | None = None,
         attempts: int = 3,
     ) -> List[Any]:
         delay = 0.5
         last_error: Exception | None = None
         for attempt in range(1, attempts + 1):
             try:
-                client = Client(
-                    transport=StreamableHttpTransport(server_url, headers=headers or None),
-                    timeout=timeout or DEFAULT_MCP_HTTP_TIMEOUT,
-                )
-                async with client:
-                    return await client.list_tools()
+                return await self._call_mcp_remote(config, "list_tools")
             except Exception as exc:  # pragma: no cover - passthrough to caller
                 last_error = exc
                 if attempt == attempts:
@@ -90,15 +148,50 @@ class ToolManager:
             raise last_error
         return []
 
+    async def _call_mcp_remote(self, config: McpRemoteConfig, method: str, *args: Any) -> Any:
+        def factory() -> Client:
+            return Client(
+                transport=StreamableHttpTransport(config.server, headers=config.headers or None),
+                timeout=config.timeout or DEFAULT_MCP_HTTP_TIMEOUT,
+            )
+
+        return await get_mcp_session_pool().call(config.cache_key(), factory, method, *args)
+
     async def _fetch_mcp_tools_stdio(self, config: McpLocalConfig, launch_key: str) -> List[Any]:
-        client = self._get_stdio_client(config, launch_key)
-        return client.list_tools()
+        with self._lease_stdio_client(config, launch_key) as client:
+            return client.list_tools()
 
     def get_tool_specs(self, tool_configs: List[ToolingConfig] | None) -> List[ToolSpec]:
-        """Return provider-agnostic tool specifications for the given config list."""
+        """Return provider-agnostic tool specifications for the given config list.
+
+        Results are cached per tooling configuration; treat the returned
+        ``ToolSpec`` objects as read-only.
+        """
         if not tool_configs:
             return []
 
+        cache_key = hashlib.sha1(
+            repr(tuple(tool_config.cache_key() for tool_config in tool_configs)).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            cached = self._tool_spec_cache.get(cache_key)
+            if cached is not None:
+                expires_at, specs = cached
+                if time.monotonic() < expires_at:
+                    self._tool_spec_cache.move_to_end(cache_key)
+                    return list(specs)
+                del self._tool_spec_cache[cache_key]
+
+        specs = self._build_tool_specs(tool_configs)
+        uses_mcp = any(tool_config.type in ("mcp_remote", "mcp_local") for tool_config in tool_configs)
+        expires_at = time.monotonic() + MCP_TOOL_CACHE_TTL if uses_mcp else float("inf")
+        with self._lock:
+            self._tool_spec_cache[cache_key] = (expires_at, specs)
+            while len(self._tool_spec_cache) > TOOL_SPEC_CACHE_SIZE:
+                self._tool_spec_cache.popitem(last=False)
+        return list(specs)
+
+    def _build_tool_specs(self, tool_configs: List[ToolingConfig]) -> List[ToolSpec]:
         specs: List[ToolSpec] = []
         seen_tools: set[str] = set()
 
@@ -151,12 +244,22 @@ class ToolManager:
         tool_config: ToolingConfig,
         *,
         tool_context: Dict[str, Any] | None = None,
+        offload_blocking: bool = False,
     ) -> Any:
-        """Execute a tool using the provided configuration."""
+        """Execute a tool using the provided configuration.
+
+        Function tools are plain synchronous callables. Set ``offload_blocking``
+        when several tools are awaited on the same loop so each function runs
+        in a worker thread instead of blocking the others.
+        """
         if tool_config.type == "function":
             config = tool_config.as_config(FunctionToolConfig)
             if not config:
                 raise ValueError("Function tooling configuration missing")
+            if offload_blocking:
+                return await asyncio.to_thread(
+                    self._execute_function_tool, tool_name, arguments, config, tool_context
+                )
             return self._execute_function_tool(tool_name, arguments, config, tool_context)
 
         if tool_config.type == "mcp_remote":
@@ -190,18 +293,24 @@ class ToolManager:
             )
         return specs
 
+    def _cached_mcp_tools(self, cache_key: str) -> List[Any] | None:
+        with self._lock:
+            cached = self._mcp_tool_cache.get(cache_key)
+            if cached is None:
+                return None
+            fetched_at, tools = cached
+            if time.monotonic() - fetched_at >= MCP_TOOL_CACHE_TTL:
+                del self._mcp_tool_cache[cache_key]
+                return None
+            return tools
+
     def _build_mcp_remote_specs(self, config: McpRemoteConfig) -> List[ToolSpec]:
         cache_key = f"remote:{config.cache_key()}"
-        tools = self._mcp_tool_cache.get(cache_key)
+        tools = self._cached_mcp_tools(cache_key)
         if tools is None:
-            tools = asyncio.run(
-                self._fetch_mcp_tools_http(
-                    config.server,
-                    headers=config.headers,
-                    timeout=config.timeout,
-                )
-            )
-            self._mcp_tool_cache[cache_key] = tools
+            tools = asyncio.run(self._fetch_mcp_tools_http(config))
+            with self._lock:
+                self._mcp_tool_cache[cache_key] = (time.monotonic(), tools)
 
         specs: List[ToolSpec] = []
         for tool in tools:
@@ -221,10 +330,11 @@ class ToolManager:
             raise ValueError("MCP local configuration missing launch key")
 
         cache_key = f"stdio:{launch_key}"
-        tools = self._mcp_tool_cache.get(cache_key)
+        tools = self._cached_mcp_tools(cache_key)
         if tools is None:
             tools = asyncio.run(self._fetch_mcp_tools_stdio(config, launch_key))
-            self._mcp_tool_cache[cache_key] = tools
+            with self._lock:
+                self._mcp_tool_cache[cache_key] = (time.monotonic(), tools)
 
         specs: List[ToolSpec] = []
         for tool in tools:
@@ -283,12 +393,7 @@ class ToolManager:
         config: McpRemoteConfig,
         tool_context: Dict[str, Any] | None = None,
     ) -> Any:
-        client = Client(
-            transport=StreamableHttpTransport(config.server, headers=config.headers or None),
-            timeout=config.timeout or DEFAULT_MCP_HTTP_TIMEOUT,
-        )
-        async with client:
-            result = await client.call_tool(tool_name, arguments)
+        result = await self._call_mcp_remote(config, "call_tool", tool_name, arguments)
         return self._normalize_mcp_result(tool_name, result, tool_context)
 
     async def _execute_mcp_local_tool(
@@ -301,8 +406,8 @@ class ToolManager:
         launch_key = config.cache_key()
         if not launch_key:
             raise ValueError("MCP local configuration missing launch key")
-        stdio_client = self._get_stdio_client(config, launch_key)
-        result = stdio_client.call_tool(tool_name, arguments)
+        with self._lease_stdio_client(config, launch_key) as stdio_client:
+            result = await stdio_client.call_tool_async(tool_name, arguments)
         return self._normalize_mcp_result(tool_name, result, tool_context)
 
     def _normalize_mcp_result(
@@ -496,27 +601,88 @@ class ToolManager:
             return MessageBlockType.VIDEO
         return MessageBlockType.FILE
 
+    @contextmanager
+    def _lease_stdio_client(self, config: McpLocalConfig, launch_key: str) -> Iterator["_StdioClientWrapper"]:
+        """Yield the stdio client for ``launch_key``; it cannot be evicted while leased."""
+        client = self._get_stdio_client(config, launch_key)
+        try:
+            yield client
+        finally:
+            with self._lock:
+                client.leases -= 1
+                client.last_used = time.monotonic()
+
     def _get_stdio_client(self, config: McpLocalConfig, launch_key: str) -> "_StdioClientWrapper":
-        client = self._mcp_stdio_clients.get(launch_key)
-        if client is None:
+        """Return the client with a lease already taken; release it via :meth:`_lease_stdio_client`."""
+        self._close_idle_stdio_clients()
+        with self._lock:
+            client = self._mcp_stdio_clients.get(launch_key)
+            if client is not None:
+                # Taken under the lock the idle sweep uses, so eviction cannot race the hand-out
+                client.leases += 1
+                return client
+            launch_lock = self._stdio_launch_locks.setdefault(launch_key, threading.Lock())
+        # Launching can take seconds; only callers of the same server wait for it.
+        with launch_lock:
+            with self._lock:
+                client = self._mcp_stdio_clients.get(launch_key)
+                if client is not None:
+                    client.leases += 1
+                    return client
             client = _StdioClientWrapper(config)
-            self._mcp_stdio_clients[launch_key] = client
+            with self._lock:
+                client.leases += 1
+                self._mcp_stdio_clients[launch_key] = client
         return client
 
+    def _close_idle_stdio_clients(self) -> None:
+        if MCP_SESSION_IDLE_TIMEOUT <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key
+                for key, client in self._mcp_stdio_clients.items()
+                if client.leases == 0 and client.is_idle() and now - client.last_used > MCP_SESSION_IDLE_TIMEOUT
+            ]
+            evicted = [self._mcp_stdio_clients.pop(key) for key in expired]
+        for client in evicted:
+            try:
+                client.close()
+            except Exception as exc:  # pragma: no cover - best effort cleanup
+                logger.warning("Failed to close idle MCP stdio client: %s", exc)
+
 
 class _StdioClientWrapper:
+    """Stdio MCP client that multiplexes requests over one or more server processes.
+
+    MCP sessions support concurrent in-flight requests, so calls are not
+    serialized unless ``concurrent_requests`` is disabled. With ``pool_size``
+    above one, several server processes are launched and every request goes
+    to the least busy one.
+    """
+
     def __init__(self, config: McpLocalConfig) -> None:
         env = os.environ.copy() if config.inherit_env else {}
         env.update(config.env)
         env_payload = env or None
-        transport = StdioTransport(
-            command=config.command,
-            args=list(config.args),
-            env=env_payload,
-            cwd=config.cwd,
-            keep_alive=True,
-        )
-        self._client = Client(transport=transport)
+        self._clients = [
+            Client(
+                transport=StdioTransport(
+                    command=config.command,
+                    args=list(config.args),
+                    env=env_payload,
+                    cwd=config.cwd,
+                    keep_alive=True,
+                )
+            )
+            for _ in range(max(1, config.pool_size))
+        ]
+        self._concurrent_requests = config.concurrent_requests
+        self._in_flight = [0] * len(self._clients)
+        # Outstanding hand-outs from ToolManager; guarded by the manager's lock
+        self.leases = 0
+        self.last_used = time.monotonic()
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
@@ -528,8 +694,8 @@ class _StdioClientWrapper:
         self._loop.run_forever()
 
     async def _initialize(self) -> None:
-        self._lock = asyncio.Lock()
-        await self._client.__aenter__()
+        self._locks = [asyncio.Lock() for _ in self._clients]
+        await asyncio.gather(*(client.__aenter__() for client in self._clients))
 
     def list_tools(self) -> List[Any]:
         future = asyncio.run_coroutine_threadsafe(self._call("list_tools"), self._loop)
@@ -542,10 +708,31 @@ class _StdioClientWrapper:
         )
         return future.result()
 
+    async def call_tool_async(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Await ``call_tool`` from another event loop without blocking it."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._call("call_tool", name, arguments),
+            self._loop,
+        )
+        return await asyncio.wrap_future(future)
+
     async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
-        async with self._lock:
-            func = getattr(self._client, method)
-            return await func(*args, **kwargs)
+        # Runs on the wrapper loop only, so picking and counting need no lock.
+        index = min(range(len(self._clients)), key=self._in_flight.__getitem__)
+        self._in_flight[index] += 1
+        self.last_used = time.monotonic()
+        try:
+            func = getattr(self._clients[index], method)
+            if self._concurrent_requests:
+                return await func(*args, **kwargs)
+            async with self._locks[index]:
+                return await func(*args, **kwargs)
+        finally:
+            self._in_flight[index] -= 1
+            self.last_used = time.monotonic()
+
+    def is_idle(self) -> bool:
+        return not any(self._in_flight)
 
     def close(self) -> None:
         future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
@@ -554,5 +741,21 @@ class _StdioClientWrapper:
         self._thread.join()
 
     async def _shutdown(self) -> None:
-        async with self._lock:
-            await self._client.__aexit__(None, None, None)
+        await asyncio.gather(
+            *(client.__aexit__(None, None, None) for client in self._clients),
+            return_exceptions=True,
+        )
+
+
+_tool_manager: ToolManager | None = None
+_tool_manager_lock = threading.Lock()
+
+
+def get_tool_manager() -> ToolManager:
+    """Return the process-wide tool manager shared by all workflow runs."""
+    global _tool_manager
+    if _tool_manager is None:
+        with _tool_manager_lock:
+            if _tool_manager is None:
+                _tool_manager = ToolManager()
+    return _tool_manager
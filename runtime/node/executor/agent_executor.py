@@ -11,6 +11,7 @@ import asyncio
 import base64
 import json
 import traceback
+from contextlib import ExitStack
 from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from entity.configs import Node
@@ -57,6 +58,7 @@ class AgentNodeExecutor(NodeExecutor):
         if not agent_config:
             raise ValueError(f"Node {node.id} missing agent config")
         
+        client_lease = ExitStack()
         try:
             self._current_node_id = node.id
             provider_class = ProviderRegistry.get_provider(agent_config.provider)
@@ -73,7 +75,7 @@ class AgentNodeExecutor(NodeExecutor):
             input_mode = agent_config.input_mode or AgentInputMode.PROMPT
 
             provider = provider_class(agent_config)
-            client = provider.create_client()
+            client = client_lease.enter_context(provider.lease_client())
 
             if input_mode is AgentInputMode.PROMPT:
                 conversation = self._prepare_prompt_messages(node, input_data)
@@ -171,6 +173,7 @@ class AgentNodeExecutor(NodeExecutor):
                 source=node.id,
             )]
         finally:
+            client_lease.close()
             self._current_node_id = None
     
     def _prepare_prompt_messages(self, node: Node, input_data: str) -> List[Message]:
@@ -526,142 +529,171 @@ class AgentNodeExecutor(NodeExecutor):
         tool_calls: List[ToolCallPayload],
         tool_specs: List[ToolSpec],
     ) -> tuple[List[Message], List[FunctionCallOutputEvent]]:
-        """Execute a batch of tool calls and return conversation + timeline events."""
-        messages: List[Message] = []
-        events: List[FunctionCallOutputEvent] = []
+        """Execute a batch of tool calls and return conversation + timeline events.
+
+        All calls share one event loop. When the node enables
+        ``parallel_tool_execution`` they run concurrently (bounded by
+        ``max_parallel_tools``); results are always returned in call order.
+        """
         model = node.as_config(AgentConfig)
         
         # Build map for fast lookup
         spec_map = {spec.name: spec for spec in tool_specs}
         configs = model.tooling if model else []
+        max_parallel = 1
+        if model and model.parallel_tool_execution:
+            max_parallel = max(1, model.max_parallel_tools)
+
+        # Each call receives its own tool context carrying node_id, so the shared
+        # global state is never mutated here
+        outcomes = asyncio.run(
+            self._run_tool_calls(node, tool_calls, spec_map, configs, max_parallel)
+        )
 
-        context_state = self.context.global_state
-        previous_node_id = context_state.get("node_id") if context_state is not None else None
-        if context_state is not None:
-            context_state["node_id"] = node.id
+        messages = [message for message, _ in outcomes]
+        events = [event for _, event in outcomes]
+        return messages, events
 
-        try:
+    async def _run_tool_calls(
+        self,
+        node: Node,
+        tool_calls: List[ToolCallPayload],
+        spec_map: Dict[str, ToolSpec],
+        configs: Sequence[Any],
+        max_parallel: int,
+    ) -> List[tuple[Message, FunctionCallOutputEvent]]:
+        if max_parallel <= 1 or len(tool_calls) <= 1:
+            outcomes = []
             for tool_call in tool_calls:
-                self._ensure_not_cancelled()
-                tool_name = tool_call.function_name
-                arguments = self._parse_tool_call_arguments(tool_call.arguments)
-                
-                # Resolve tool config
-                spec = spec_map.get(tool_name)
-                tool_config = None
-                execution_name = tool_name
-                
-                if spec:
-                    idx = spec.metadata.get("_config_index")
-                    if idx is not None and 0 <= idx < len(configs):
-                        tool_config = configs[idx]
-                    # Use original name if prefixed
-                    execution_name = spec.metadata.get("original_name", tool_name)
-                
-                if not tool_config:
-                     # Fallback check: if we have 1 config, maybe it's that one? 
-                     # But strict routing is safer. If spec not found, it's a hallucination or error.
-                     # We proceed and let tool_manager raise error or handle it.
-                     # But execute_tool requires tool_config. 
-                     
-                     # Construct a helpful error message
-                     error_msg = f"Tool '{tool_name}' configuration not found."
-                     self.log_manager.record_tool_call(
-                        node.id,
-                        tool_name,
-                        False,
-                        None,
-                        {"error": error_msg, "arguments": arguments},
-                        CallStage.AFTER,
-                    )
-                     tool_message = Message(
-                        role=MessageRole.TOOL,
-                        content=f"Error: {error_msg}",
-                        tool_call_id=tool_call.id,
-                        metadata={"tool_name": tool_name, "source": node.id},
-                    )
-                     events.append(
-                        FunctionCallOutputEvent(
-                            call_id=tool_call.id or tool_call.function_name or "tool_call",
-                            function_name=tool_call.function_name,
-                            output_text=f"error: {error_msg}",
-                        )
-                    )
-                     messages.append(tool_message)
-                     continue
-
-                try:
-                    self.log_manager.record_tool_call(
-                        node.id,
-                        tool_name,
-                        None,
-                        None,
-                        {"arguments": arguments},
-                        CallStage.BEFORE,
-                    )
-                    with self.log_manager.tool_timer(node.id, tool_name):
-                        result = asyncio.run(
-                            self.tool_manager.execute_tool(
-                                execution_name,
-                                arguments,
-                                tool_config,
-                                tool_context=self.context.global_state,
-                            )
-                        )
-
-                    tool_message = self._build_tool_message(
-                        result,
-                        tool_call,
-                        node_id=node.id,
-                        tool_name=tool_name,
-                    )
-                    events.append(
-                        self._build_function_call_output_event(
-                            tool_call,
-                            result,
-                        )
-                    )
-
-                    self.log_manager.record_tool_call(
-                        node.id,
-                        tool_name,
-                        True,
-                        self._serialize_tool_result(result),
-                        {"arguments": arguments},
-                        CallStage.AFTER,
-                    )
-                except Exception as exc:
-                    self.log_manager.record_tool_call(
-                        node.id,
-                        tool_name,
-                        False,
-                        None,
-                        {"error": str(exc), "arguments": arguments},
-                        CallStage.AFTER,
-                    )
-                    tool_message = Message(
-                        role=MessageRole.TOOL,
-                        content=f"Tool {tool_name} error: {exc}",
-                        tool_call_id=tool_call.id,
-                        metadata={"tool_name": tool_name, "source": node.id},
-                    )
-                    events.append(
-                        FunctionCallOutputEvent(
-                            call_id=tool_call.id or tool_call.function_name or "tool_call",
-                            function_name=tool_call.function_name,
-                            output_text=f"error: {exc}",
-                        )
-                    )
-
-                messages.append(tool_message)
-        finally:
-            if context_state is not None:
-                if previous_node_id is None:
-                    context_state.pop("node_id", None)
-                else:
-                    context_state["node_id"] = previous_node_id
+                outcomes.append(await self._run_tool_call(node, tool_call, spec_map, configs))
+            return outcomes
 
-        return messages, events
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def run_limited(tool_call: ToolCallPayload) -> tuple[Message, FunctionCallOutputEvent]:
+            async with semaphore:
+                return await self._run_tool_call(
+                    node,
+                    tool_call,
+                    spec_map,
+                    configs,
+                    offload_blocking=True,
+                )
+
+        return list(await asyncio.gather(*(run_limited(tool_call) for tool_call in tool_calls)))
+
+    async def _run_tool_call(
+        self,
+        node: Node,
+        tool_call: ToolCallPayload,
+        spec_map: Dict[str, ToolSpec],
+        configs: Sequence[Any],
+        *,
+        offload_blocking: bool = False,
+    ) -> tuple[Message, FunctionCallOutputEvent]:
+        """Execute one tool call and return its tool message and timeline event."""
+        self._ensure_not_cancelled()
+        tool_name = tool_call.function_name
+        arguments = self._parse_tool_call_arguments(tool_call.arguments)
+        
+        # Resolve tool config
+        spec = spec_map.get(tool_name)
+        tool_config = None
+        execution_name = tool_name
+        
+        if spec:
+            idx = spec.metadata.get("_config_index")
+            if idx is not None and 0 <= idx < len(configs):
+                tool_config = configs[idx]
+            # Use original name if prefixed
+            execution_name = spec.metadata.get("original_name", tool_name)
+        
+        if not tool_config:
+            # Strict routing: a missing spec means the model hallucinated the tool
+            # or the configuration changed, so report it back as a tool error.
+            error_msg = f"Tool '{tool_name}' configuration not found."
+            self.log_manager.record_tool_call(
+                node.id,
+                tool_name,
+                False,
+                None,
+                {"error": error_msg, "arguments": arguments},
+                CallStage.AFTER,
+            )
+            tool_message = Message(
+                role=MessageRole.TOOL,
+                content=f"Error: {error_msg}",
+                tool_call_id=tool_call.id,
+                metadata={"tool_name": tool_name, "source": node.id},
+            )
+            event = FunctionCallOutputEvent(
+                call_id=tool_call.id or tool_call.function_name or "tool_call",
+                function_name=tool_call.function_name,
+                output_text=f"error: {error_msg}",
+            )
+            return tool_message, event
+
+        try:
+            self.log_manager.record_tool_call(
+                node.id,
+                tool_name,
+                None,
+                None,
+                {"arguments": arguments},
+                CallStage.BEFORE,
+            )
+            with self.log_manager.tool_timer(node.id, tool_name):
+                result = await self.tool_manager.execute_tool(
+                    execution_name,
+                    arguments,
+                    tool_config,
+                    tool_context={**self.context.global_state, "node_id": node.id},
+                    offload_blocking=offload_blocking,
+                )
+
+            tool_message = self._build_tool_message(
+                result,
+                tool_call,
+                node_id=node.id,
+                tool_name=tool_name,
+            )
+            event = self._build_function_call_output_event(
+                tool_call,
+                result,
+            )
+
+            # Nothing awaits between the timer and this record, so concurrent
+            # calls to the same tool cannot overwrite the logged duration.
+            self.log_manager.record_tool_call(
+                node.id,
+                tool_name,
+                True,
+                self._serialize_tool_result(result),
+                {"arguments": arguments},
+                CallStage.AFTER,
+            )
+        except Exception as exc:
+            self.log_manager.record_tool_call(
+                node.id,
+                tool_name,
+                False,
+                None,
+                {"error": str(exc), "arguments": arguments},
+                CallStage.AFTER,
+            )
+            tool_message = Message(
+                role=MessageRole.TOOL,
+                content=f"Tool {tool_name} error: {exc}",
+                tool_call_id=tool_call.id,
+                metadata={"tool_name": tool_name, "source": node.id},
+            )
+            event = FunctionCallOutputEvent(
+                call_id=tool_call.id or tool_call.function_name or "tool_call",
+                function_name=tool_call.function_name,
+                output_text=f"error: {exc}",
+            )
+
+        return tool_message, event
 
     def _build_function_call_output_event(
         self,
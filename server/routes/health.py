@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from server.state import get_websocket_manager
 from utils.structured_logger import get_server_logger, LogType
 
 router = APIRouter()
@@ -20,3 +21,8 @@ async def liveness_check():
 @router.get("/health/ready")
 async def readiness_check():
     return {"status": "ready"}
+
+
+@router.get("/health/websocket")
+async def websocket_queue_metrics():
+    return get_websocket_manager().queue_metrics()
@@ -2,15 +2,28 @@
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from server.services.event_subscription import EventSubscription
 from server.state import get_websocket_manager
+from utils.exceptions import ValidationError
 
 router = APIRouter()
 
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    """Live session channel.
+
+    Optional query parameters narrow the log stream: ``events`` lists the
+    categories to receive (node, model, tool, edge, debug) and ``max_payload``
+    caps string lengths in log details, e.g. ``max_payload=4096,model:2000``.
+    """
+    try:
+        subscription = EventSubscription.from_query(websocket.query_params)
+    except ValidationError as exc:
+        await websocket.close(code=1008, reason=str(exc))
+        return
     manager = get_websocket_manager()
-    session_id = await manager.connect(websocket)
+    session_id = await manager.connect(websocket, subscription=subscription)
     try:
         while True:
             message = await websocket.receive_text()
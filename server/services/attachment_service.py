@@ -4,14 +4,14 @@ import logging
 import mimetypes
 import os
 import shutil
-import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import UploadFile
 
 from entity.messages import MessageBlock, MessageBlockType
-from utils.attachments import AttachmentStore, AttachmentRecord
+from utils.attachments import AttachmentStore, AttachmentRecord, referenced_blobs
+from utils.blob_store import get_blob_store
 
 
 class AttachmentService:
@@ -34,6 +34,7 @@ class AttachmentService:
         if self.clean_on_cleanup:
             shutil.rmtree(attachment_dir, ignore_errors=True)
             self.logger.info("Cleaned attachment directory for session %s", session_id)
+            self._collect_blobs()
         else:
             self.logger.info(
                 "Attachment cleanup disabled; preserved files for session %s", session_id
@@ -45,19 +46,18 @@ class AttachmentService:
 
     async def save_upload_file(self, session_id: str, upload: UploadFile) -> AttachmentRecord:
         filename = upload.filename or "upload.bin"
-        temp_dir = Path(tempfile.mkdtemp(prefix="mac_upload_"))
-        temp_path = temp_dir / filename
-        try:
-            with temp_path.open("wb") as buffer:
-                while True:
-                    chunk = await upload.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    buffer.write(chunk)
-            store = self.get_attachment_store(session_id)
-            mime_type = upload.content_type or mimetypes.guess_type(filename)[0]
-            record = store.register_file(
-                temp_path,
+        store = self.get_attachment_store(session_id)
+        mime_type = upload.content_type or mimetypes.guess_type(filename)[0]
+        # Hash while streaming the upload to disk so it is read exactly once
+        with store.open_writer() as writer:
+            while True:
+                chunk = await upload.read(1024 * 1024)
+                if not chunk:
+                    break
+                writer.write(chunk)
+            return store.register_writer(
+                writer,
+                name=Path(filename).name,
                 kind=MessageBlockType.from_mime_type(mime_type),
                 display_name=filename,
                 mime_type=mime_type,
@@ -67,17 +67,6 @@ class AttachmentService:
                     "session_id": session_id,
                 },
             )
-            return record
-        finally:
-            if temp_path.exists():
-                try:
-                    temp_path.unlink()
-                except OSError:
-                    pass
-            try:
-                temp_dir.rmdir()
-            except OSError:
-                pass
 
     def build_attachment_blocks(
         self,
@@ -106,6 +95,16 @@ class AttachmentService:
         store = self.get_attachment_store(session_id)
         return store.export_manifest()
 
+    def _collect_blobs(self) -> None:
+        """Drop blobs that no attachment manifest under the WareHouse still references."""
+        try:
+            removed = get_blob_store().collect_garbage(referenced_blobs(self.attachments_root))
+        except OSError as exc:
+            self.logger.warning("Attachment blob cleanup failed: %s", exc)
+            return
+        if removed:
+            self.logger.info("Removed %d unreferenced attachment blobs", removed)
+
     def _session_attachments_path(self, session_id: str, *, create: bool = True) -> Optional[Path]:
         session_dir_name = session_id if session_id.startswith("session_") else f"session_{session_id}"
         path = self.attachments_root / session_dir_name / "code_workspace" / "attachments"
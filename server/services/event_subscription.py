@@ -0,0 +1,113 @@
+"""Per-connection filtering of the live workflow log stream."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+from entity.enums import EventType, LogLevel
+from utils.exceptions import ValidationError
+
+EVENT_CATEGORIES: Dict[EventType, str] = {
+    EventType.NODE_START: "node",
+    EventType.NODE_END: "node",
+    EventType.MODEL_CALL: "model",
+    EventType.AGENT_CALL: "model",
+    EventType.THINKING_PROCESS: "model",
+    EventType.TOOL_CALL: "tool",
+    EventType.EDGE_PROCESS: "edge",
+}
+CATEGORIES: FrozenSet[str] = frozenset({"node", "model", "tool", "edge", "debug"})
+
+
+def event_category(level: LogLevel, event_type: Optional[EventType]) -> Optional[str]:
+    """Category an entry belongs to, or None for entries that are always streamed.
+
+    Warnings and errors, workflow start/end, human interaction and memory
+    events are never filtered. Uncategorized DEBUG entries fall under ``debug``.
+    """
+    if level >= LogLevel.WARNING:
+        return None
+    category = EVENT_CATEGORIES.get(event_type) if event_type else None
+    if category is None and level == LogLevel.DEBUG:
+        return "debug"
+    return category
+
+
+def _truncate(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}... [truncated {len(value) - limit} chars]"
+    if isinstance(value, dict):
+        return {key: _truncate(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate(item, limit) for item in value]
+    return value
+
+
+def _parse_limit(raw: str) -> int:
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValidationError("max_payload must be an integer", details={"value": raw}) from None
+    if limit <= 0:
+        raise ValidationError("max_payload must be positive", details={"value": raw})
+    return limit
+
+
+@dataclass(frozen=True)
+class EventSubscription:
+    """Which log categories a client receives and how large their details may be.
+
+    ``categories`` of None subscribes to everything (the default). Limits cap
+    the length of every string inside a log entry's ``details``.
+    """
+
+    categories: Optional[FrozenSet[str]] = None
+    max_payload: Dict[str, int] = field(default_factory=dict)
+    default_max_payload: Optional[int] = None
+
+    def accepts(self, level: LogLevel, event_type: Optional[EventType]) -> bool:
+        if self.categories is None:
+            return True
+        category = event_category(level, event_type)
+        return category is None or category in self.categories
+
+    def limit_details(self, level: LogLevel, event_type: Optional[EventType], details: Dict[str, Any]) -> Dict[str, Any]:
+        category = event_category(level, event_type)
+        limit = self.max_payload.get(category, self.default_max_payload) if category else self.default_max_payload
+        if limit is None or not details:
+            return details
+        return _truncate(details, limit)
+
+    @classmethod
+    def from_query(cls, params: Mapping[str, str]) -> "EventSubscription":
+        """Parse ``?events=node,model&max_payload=4096,model:2000`` style parameters."""
+        categories = None
+        raw_events = params.get("events")
+        if raw_events is not None:
+            categories = frozenset(name.strip() for name in raw_events.split(",") if name.strip())
+            unknown = sorted(categories - CATEGORIES)
+            if unknown:
+                raise ValidationError(
+                    f"Unknown event categories: {', '.join(unknown)}",
+                    details={"allowed": sorted(CATEGORIES)},
+                )
+
+        max_payload: Dict[str, int] = {}
+        default_max_payload = None
+        for part in (params.get("max_payload") or "").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            name, sep, raw_limit = part.partition(":")
+            if not sep:
+                default_max_payload = _parse_limit(name)
+                continue
+            name = name.strip()
+            if name not in CATEGORIES:
+                raise ValidationError(
+                    f"Unknown event category in max_payload: {name}",
+                    details={"allowed": sorted(CATEGORIES)},
+                )
+            max_payload[name] = _parse_limit(raw_limit.strip())
+        return cls(categories, max_payload, default_max_payload)
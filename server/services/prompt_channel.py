@@ -9,6 +9,7 @@ from server.services.session_execution import SessionExecutionController
 from utils.attachments import AttachmentStore
 from utils.exceptions import TimeoutError
 from utils.human_prompt import PromptChannel, PromptResult
+from utils.logger import get_log_writer
 from utils.structured_logger import get_server_logger
 
 
@@ -108,6 +109,8 @@ class WebPromptChannel(PromptChannel):
                 "task_description": task,
             },
         }
+        # Let the node's pending log frames reach the socket before the prompt
+        get_log_writer().flush()
         if self._loop and self._loop.is_running():
             future = asyncio.run_coroutine_threadsafe(
                 self.websocket_manager.send_message(self.session_id, message),
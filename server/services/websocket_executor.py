@@ -3,7 +3,7 @@
 import asyncio
 from typing import List
 
-from utils.logger import WorkflowLogger
+from utils.logger import WorkflowLogger, get_log_writer
 from workflow.graph import GraphExecutor
 from workflow.graph_context import GraphContext
 
@@ -44,11 +44,14 @@ class WebSocketGraphExecutor(GraphExecutor):
                 attachment_service=attachment_service,
                 attachment_store=runtime_context.attachment_store,
             )
-            return WorkspaceArtifactHook(
+            hook = WorkspaceArtifactHook(
                 attachment_store=runtime_context.attachment_store,
                 emit_callback=self._handle_workspace_artifacts,
                 prompt_channel=prompt_channel,
             )
+            # File tools report which node wrote a path through the tool context
+            runtime_context.global_state["workspace_watcher"] = hook.watcher
+            return hook
 
         super().__init__(
             graph,
@@ -63,7 +66,15 @@ class WebSocketGraphExecutor(GraphExecutor):
         return WebSocketLogger(self.websocket_manager, self.session_id, self.graph.name, self.graph.log_level)
 
     async def execute_graph_async(self, task_prompt):
-        await asyncio.get_event_loop().run_in_executor(None, self._execute, task_prompt)
+        await asyncio.get_event_loop().run_in_executor(None, self._execute_and_flush_logs, task_prompt)
+
+    def _execute_and_flush_logs(self, task_prompt):
+        try:
+            self._execute(task_prompt)
+        finally:
+            # Log frames are encoded on the background writer; queue them ahead
+            # of the completion or error message the caller sends next
+            get_log_writer().flush()
 
     def get_results(self):
         return self.outputs
@@ -2,7 +2,7 @@ import asyncio
 from typing import Any, Dict
 
 from entity.enums import LogLevel, EventType
-from utils.logger import WorkflowLogger, LogEntry
+from utils.logger import WorkflowLogger, LogEntry, get_log_writer
 from utils.structured_logger import get_workflow_logger
 
 
@@ -13,18 +13,26 @@ class WebSocketLogger(WorkflowLogger):
         super().__init__(workflow_id, log_level, log_to_console=False)
         self.websocket_manager = websocket_manager
         self.session_id = session_id
+        self.subscription = websocket_manager.get_subscription(session_id)
 
     def add_log(self, level: LogLevel, message: str = None, node_id: str = None,
                 event_type: EventType = None, details: Dict[str, Any] = None,
                 duration: float = None) -> LogEntry | None:
+        # Categories the client did not subscribe to are recorded in the workflow
+        # log only; none of the socket-bound encoding below is done for them
+        accepted = self.subscription.accepts(level, event_type)
         log_entry = super().add_log(level, message, node_id, event_type, details, duration)
-        if not log_entry:
-            return None
+        if not log_entry or not accepted:
+            return log_entry
 
-        # Send the message using the sync method which handles event loop properly
+        # Serialization for the socket happens on the background writer, in log order
+        get_log_writer().submit(self._send_entry, log_entry)
+        return log_entry
+
+    def _send_entry(self, log_entry: LogEntry) -> None:
+        data = log_entry.to_dict()
+        data["details"] = self.subscription.limit_details(log_entry.level, log_entry.event_type, data["details"])
         self.websocket_manager.send_message_sync(self.session_id, {
             "type": "log",
-            "data": log_entry.to_dict()
+            "data": data
         })
-        
-        return log_entry
@@ -4,7 +4,6 @@ import asyncio
 import json
 import logging
 import time
-import traceback
 import uuid
 from typing import Any, Dict, Optional
 
@@ -12,8 +11,10 @@ from fastapi import WebSocket
 
 from server.services.message_handler import MessageHandler
 from server.services.attachment_service import AttachmentService
+from server.services.event_subscription import EventSubscription
 from server.services.session_execution import SessionExecutionController
 from server.services.session_store import WorkflowSessionStore, SessionStatus
+from server.services.websocket_outbox import SessionOutbox, is_droppable
 from server.services.workflow_run_service import WorkflowRunService
 
 
@@ -49,6 +50,10 @@ class WebSocketManager:
     ):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_timestamps: Dict[str, float] = {}
+        self.outboxes: Dict[str, SessionOutbox] = {}
+        self.subscriptions: Dict[str, EventSubscription] = {}
+        # Loop that owns the sockets; worker threads hand messages over to it
+        self._loop: asyncio.AbstractEventLoop | None = None
         self.session_store = session_store or WorkflowSessionStore()
         self.session_controller = session_controller or SessionExecutionController(self.session_store)
         self.attachment_service = attachment_service or AttachmentService()
@@ -63,12 +68,22 @@ class WebSocketManager:
             self.workflow_run_service,
         )
 
-    async def connect(self, websocket: WebSocket, session_id: Optional[str] = None) -> str:
+    async def connect(
+        self,
+        websocket: WebSocket,
+        session_id: Optional[str] = None,
+        subscription: EventSubscription | None = None,
+    ) -> str:
         await websocket.accept()
         if not session_id:
             session_id = str(uuid.uuid4())
+        self.subscriptions[session_id] = subscription or EventSubscription()
+        self._loop = asyncio.get_running_loop()
         self.active_connections[session_id] = websocket
         self.connection_timestamps[session_id] = time.time()
+        outbox = SessionOutbox(session_id, websocket)
+        self.outboxes[session_id] = outbox
+        outbox.start()
         logging.info("WebSocket connected: %s", session_id)
         await self.send_message(
             session_id,
@@ -90,6 +105,10 @@ class WebSocketManager:
             del self.active_connections[session_id]
         if session_id in self.connection_timestamps:
             del self.connection_timestamps[session_id]
+        self.subscriptions.pop(session_id, None)
+        outbox = self.outboxes.pop(session_id, None)
+        if outbox is not None:
+            outbox.close()
         self.session_controller.cleanup_session(session_id)
         remaining_session = self.session_store.get_session(session_id)
         if remaining_session and remaining_session.executor is None:
@@ -98,24 +117,48 @@ class WebSocketManager:
         logging.info("WebSocket disconnected: %s", session_id)
 
     async def send_message(self, session_id: str, message: Dict[str, Any]) -> None:
-        if session_id in self.active_connections:
-            websocket = self.active_connections[session_id]
-            try:
-                await websocket.send_text(_encode_ws_message(message))
-            except Exception as exc:
-                traceback.print_exc()
-                logging.error("Failed to send message to %s: %s", session_id, exc)
-                # self.disconnect(session_id)
+        self._enqueue(session_id, _encode_ws_message(message), is_droppable(message))
 
     def send_message_sync(self, session_id: str, message: Dict[str, Any]) -> None:
+        """Queue ``message`` from any thread without blocking on the socket.
+
+        Encoding happens on the calling thread; the server loop only appends
+        the payload to the session outbox, whose drain task does the sending.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or session_id not in self.active_connections:
+            return
+        payload = _encode_ws_message(message)
+        droppable = is_droppable(message)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._enqueue(session_id, payload, droppable)
+            return
         try:
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                asyncio.create_task(self.send_message(session_id, message))
-            else:
-                asyncio.run(self.send_message(session_id, message))
+            loop.call_soon_threadsafe(self._enqueue, session_id, payload, droppable)
         except RuntimeError:
-            asyncio.run(self.send_message(session_id, message))
+            # Loop shut down between the check and the hand-off
+            pass
+
+    def _enqueue(self, session_id: str, payload: str, droppable: bool) -> None:
+        outbox = self.outboxes.get(session_id)
+        if outbox is not None:
+            outbox.put(payload, droppable)
+
+    def get_subscription(self, session_id: str) -> EventSubscription:
+        return self.subscriptions.get(session_id) or EventSubscription()
+
+    def queue_metrics(self) -> Dict[str, Any]:
+        """Outbound queue depth and throughput per connected session."""
+        sessions = {session_id: outbox.stats() for session_id, outbox in list(self.outboxes.items())}
+        return {
+            "sessions": sessions,
+            "total_depth": sum(stats["depth"] for stats in sessions.values()),
+            "total_dropped": sum(stats["dropped"] for stats in sessions.values()),
+        }
 
     async def broadcast(self, message: Dict[str, Any]) -> None:
         for session_id in list(self.active_connections.keys()):
@@ -0,0 +1,187 @@
+"""Per-session outbound message queue for WebSocket connections."""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from fastapi import WebSocket
+
+# Droppable messages (DEBUG logs) beyond this depth evict the oldest droppable entry.
+WS_OUTBOUND_QUEUE_SIZE = int(os.getenv("WS_OUTBOUND_QUEUE_SIZE", "1000"))
+# Maximum number of messages coalesced into a single frame.
+WS_OUTBOUND_BATCH_SIZE = int(os.getenv("WS_OUTBOUND_BATCH_SIZE", "50"))
+# Hard cap on queued payload characters. Once droppable entries cannot bring the
+# queue back under it, the client is too slow to keep up and is disconnected.
+WS_OUTBOUND_MAX_BYTES = int(os.getenv("WS_OUTBOUND_MAX_BYTES", str(32 * 1024 * 1024)))
+# Close code sent to clients disconnected for falling behind ("try again later").
+_SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+def is_droppable(message: Any) -> bool:
+    """Only DEBUG log entries may be shed; lifecycle and control messages are always delivered."""
+    if not isinstance(message, dict) or message.get("type") != "log":
+        return False
+    data = message.get("data")
+    return isinstance(data, dict) and data.get("level") == "DEBUG"
+
+
+class SessionOutbox:
+    """Buffers encoded messages for one connection and drains them from the server loop.
+
+    All methods except :meth:`stats` must run on the event loop that owns the
+    WebSocket. Messages queued while a send is in flight are coalesced into one
+    ``{"type": "bundle", "data": [...]}`` frame on the next pass. DEBUG logs are
+    shed first when the queue grows; a client whose backlog still exceeds
+    ``max_bytes`` is disconnected rather than buffered without bound.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        websocket: WebSocket,
+        *,
+        max_size: int = WS_OUTBOUND_QUEUE_SIZE,
+        batch_size: int = WS_OUTBOUND_BATCH_SIZE,
+        max_bytes: int = WS_OUTBOUND_MAX_BYTES,
+    ):
+        self.session_id = session_id
+        self.websocket = websocket
+        self.max_size = max(1, max_size)
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max(1, max_bytes)
+        self._pending: Deque[Tuple[str, bool]] = deque()
+        self._pending_bytes = 0
+        self._droppable = 0
+        self._closed = False
+        self._dropped_since_notice = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.dropped_total = 0
+        self.sent_messages = 0
+        self.sent_frames = 0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain(), name=f"ws-outbox-{self.session_id}")
+
+    def close(self) -> int:
+        """Stop draining and return the number of messages left undelivered."""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        undelivered = len(self._pending)
+        if undelivered:
+            logging.warning(
+                "Discarding %s undelivered WebSocket messages for %s (%s DEBUG logs)",
+                undelivered,
+                self.session_id,
+                self._droppable,
+            )
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._droppable = 0
+        return undelivered
+
+    def put(self, payload: str, droppable: bool = False) -> None:
+        if self._closed:
+            return
+        if droppable and self._droppable >= self.max_size:
+            self._evict_oldest_droppable()
+        self._pending.append((payload, droppable))
+        self._pending_bytes += len(payload)
+        if droppable:
+            self._droppable += 1
+        while self._pending_bytes > self.max_bytes and self._droppable:
+            self._evict_oldest_droppable()
+        self.max_depth = max(self.max_depth, len(self._pending))
+        if self._pending_bytes > self.max_bytes:
+            self._disconnect_slow_client()
+            return
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._pending),
+            "pending_bytes": self._pending_bytes,
+            "max_depth": self.max_depth,
+            "dropped": self.dropped_total,
+            "sent_messages": self.sent_messages,
+            "sent_frames": self.sent_frames,
+        }
+
+    def _evict_oldest_droppable(self) -> None:
+        for index, (_, droppable) in enumerate(self._pending):
+            if droppable:
+                payload, _ = self._pending[index]
+                del self._pending[index]
+                self._pending_bytes -= len(payload)
+                self._droppable -= 1
+                self.dropped_total += 1
+                self._dropped_since_notice += 1
+                return
+
+    def _next_batch(self) -> List[str]:
+        batch: List[str] = []
+        if self._dropped_since_notice:
+            batch.append(json.dumps({"type": "log_dropped", "data": {"count": self._dropped_since_notice}}))
+            self._dropped_since_notice = 0
+        while self._pending and len(batch) < self.batch_size:
+            payload, droppable = self._pending.popleft()
+            self._pending_bytes -= len(payload)
+            if droppable:
+                self._droppable -= 1
+            batch.append(payload)
+        return batch
+
+    def _requeue(self, batch: List[str]) -> None:
+        """Put an unsent batch back at the head of the queue, in order."""
+        for payload in reversed(batch):
+            self._pending.appendleft((payload, False))
+            self._pending_bytes += len(payload)
+
+    def _disconnect_slow_client(self) -> None:
+        logging.warning(
+            "Disconnecting %s: %s messages (%s bytes) queued, exceeding %s bytes",
+            self.session_id,
+            len(self._pending),
+            self._pending_bytes,
+            self.max_bytes,
+        )
+        self.close()
+        # The endpoint's receive loop sees the close and runs the usual disconnect cleanup
+        asyncio.create_task(self._close_socket(), name=f"ws-close-{self.session_id}")
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.websocket.close(code=_SLOW_CLIENT_CLOSE_CODE, reason="Client too slow")
+        except Exception as exc:
+            logging.debug("Failed to close slow WebSocket %s: %s", self.session_id, exc)
+
+    async def _drain(self) -> None:
+        while True:
+            if not self._pending and not self._dropped_since_notice:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            batch = self._next_batch()
+            if len(batch) == 1:
+                frame = batch[0]
+            else:
+                frame = '{"type": "bundle", "data": [' + ", ".join(batch) + "]}"
+            try:
+                await self.websocket.send_text(frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # The socket is unusable; keep the batch so close() can account for it
+                logging.error("Failed to send message to %s: %s", self.session_id, exc)
+                self._requeue(batch)
+                self._task = None
+                return
+            self.sent_messages += len(batch)
+            self.sent_frames += 1
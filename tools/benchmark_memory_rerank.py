@@ -0,0 +1,115 @@
+"""Micro-benchmark for SimpleMemory reranking.
+
+Compares the original pure-Python LCS scorer with the registered rerankers on
+synthetic candidates of the size SimpleMemory produces (summaries capped at
+500 characters, ``top_k * 3`` candidates per query).
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Sequence
+
+from runtime.node.agent.memory.memory_base import MemoryItem
+from runtime.node.agent.memory.reranker import LexicalReranker, TokenReranker
+
+WORDS = (
+    "agent memory vector index query result workflow node graph edge tool call "
+    "embedding summary retrieval context model prompt output input file chunk"
+).split()
+
+
+def _dp_lcs_similarity(s1: str, s2: str) -> float:
+    m, n = len(s1), len(s2)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if s1[i - 1] == s2[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+    return dp[m][n] / max(m, n) if max(m, n) > 0 else 0.0
+
+
+def _baseline_score(query: str, candidates: Sequence[MemoryItem]) -> List[float]:
+    """Scorer SimpleMemory used before rerankers became pluggable."""
+    scores = []
+    query_lower = query.lower()
+    query_words = set(query_lower.split())
+    query_keywords = {word for word in query_lower.split() if len(word) >= 2}
+    for item in candidates:
+        content_lower = item.content_summary.lower()
+        content_words = set(content_lower.split())
+        union = query_words | content_words
+        jaccard = len(query_words & content_words) / len(union) if query_words and content_words else 0.0
+        content_keywords = {word for word in content_lower.split() if len(word) >= 2}
+        keyword = len(query_keywords & content_keywords) / len(query_keywords) if query_keywords else 0.0
+        ratio = len(content_lower) / len(query_lower)
+        if 0.5 <= ratio <= 2.0:
+            length = 1.0
+        elif ratio < 0.5:
+            length = ratio / 0.5
+        else:
+            length = max(0.1, 2.0 / ratio)
+        lcs = _dp_lcs_similarity(query_lower, content_lower)
+        scores.append(min(0.4 * jaccard + 0.3 * lcs + 0.2 * keyword + 0.1 * length, 1.0))
+    return scores
+
+
+def _make_text(rng: random.Random, length: int) -> str:
+    words: List[str] = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)[:length]
+
+
+def _time_per_query(score: Callable[[str, Sequence[MemoryItem]], List[float]], queries, candidates, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            score(query, candidates)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark SimpleMemory rerankers")
+    parser.add_argument("--top-k", type=int, default=5, help="Retrieval top_k (candidates = top_k * 3)")
+    parser.add_argument("--length", type=int, default=400, help="Characters per memory summary")
+    parser.add_argument("--queries", type=int, default=20, help="Number of distinct queries")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    candidates = [
+        MemoryItem(id=f"m{index}", content_summary=_make_text(rng, args.length), metadata={})
+        for index in range(args.top_k * 3)
+    ]
+    queries = [f"Query: {_make_text(rng, 120)}" for _ in range(args.queries)]
+
+    lexical = LexicalReranker()
+    mismatches = sum(
+        abs(a - b) > 1e-9
+        for query in queries
+        for a, b in zip(_baseline_score(query, candidates), lexical.score(query, candidates))
+    )
+
+    timings = {
+        "baseline (DP LCS)": _time_per_query(_baseline_score, queries, candidates, args.repeat),
+        "lexical": _time_per_query(lexical.score, queries, candidates, args.repeat),
+        "token": _time_per_query(TokenReranker().score, queries, candidates, args.repeat),
+    }
+    baseline = timings["baseline (DP LCS)"]
+    print(f"{len(candidates)} candidates x {args.length} chars, {len(queries)} queries")
+    for name, seconds in timings.items():
+        print(f"  {name:<18} {seconds * 1000:8.3f} ms/query  ({baseline / seconds:6.1f}x)")
+    print(f"  lexical score mismatches vs baseline: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # uv run -m tools.benchmark_memory_rerank
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Micro-benchmark for per-node WorkflowLogger overhead.
+
+Replays the log calls a typical agent node makes (enter, memory, model call
+before/after, tool call, edge debug entries, exit) with realistic payloads and
+measures the time spent on the calling thread. The baseline reproduces the
+eager ``add_log`` that deep-copied the path and serialized details inline.
+"""
+
+import argparse
+import contextlib
+import copy
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from entity.enums import CallStage, EventType, LogLevel
+from utils.logger import LogEntry, WorkflowLogger, _json_safe, get_log_writer
+
+
+class _Message:
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+        self.metadata = {"source": "benchmark", "tokens": len(content) // 4}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"role": self.role, "content": self.content, "metadata": dict(self.metadata)}
+
+
+class _EagerWorkflowLogger(WorkflowLogger):
+    """``add_log`` as it was before details were serialized lazily."""
+
+    def add_log(self, level: LogLevel, message: str = None, node_id: str = None,
+                event_type: EventType = None, details: Dict[str, Any] = None,
+                duration: float = None) -> LogEntry | None:
+        if level < self.log_level:
+            return None
+        timestamp = datetime.now().isoformat()
+        execution_path = copy.deepcopy(self.current_path)
+        safe_details = _json_safe(details or {})
+        log_entry = LogEntry(
+            timestamp=timestamp,
+            level=level,
+            node_id=node_id,
+            event_type=event_type,
+            message=message,
+            raw_details=safe_details,
+            execution_path=execution_path,
+            duration=duration,
+        )
+        self.logs.append(log_entry)
+        if self.log_to_console:
+            print(f"[{timestamp}] [{level.value}] "
+                  f"{f'Node {node_id} - ' if node_id else ''}"
+                  f"{f'Event {event_type} - ' if event_type else ''}"
+                  f"{message} "
+                  f"{f'Details: {details} ' if details else ''}"
+                  f"{f'Duration: {duration}' if duration else ''}")
+        if self.use_structured_logging and self.structured_logger:
+            structured_details = {
+                "workflow_id": self.workflow_id,
+                "node_id": node_id,
+                "event_type": event_type.value if event_type else None,
+                "execution_path": execution_path,
+                "duration": duration,
+                **safe_details,
+            }
+            getattr(self.structured_logger, level.value.lower())(message, **structured_details)
+        return log_entry
+
+
+def _log_node(logger: WorkflowLogger, node_id: str, inputs: List[_Message], output: str, edges: int) -> None:
+    logger.enter_node(node_id, inputs, node_type="agent")
+    logger.record_memory_operation(node_id, output[:500], "RETRIEVE", "gen")
+    logger.record_model_call(node_id, "gpt-4o", input_data=inputs, stage=CallStage.BEFORE)
+    logger.record_model_call(node_id, "gpt-4o", input_data=inputs, output=output, duration=1.0, stage=CallStage.AFTER)
+    logger.record_tool_call(node_id, "search", output[:1000], duration=0.2, stage=CallStage.AFTER)
+    for index in range(edges):
+        logger.record_edge_process(node_id, f"next_{index}", {"payload": inputs, "condition": "true"})
+        logger.debug(f"Edge condition evaluated for {node_id}", node_id=node_id, details={"inputs": inputs})
+    logger.exit_node(node_id, output, duration=1.2, output_size=len(output))
+
+
+def _time_per_node(logger_cls, args: argparse.Namespace, inputs: List[_Message], output: str) -> float:
+    logger = logger_cls(
+        "benchmark",
+        LogLevel[args.level],
+        use_structured_logging=args.structured,
+        log_to_console=args.console,
+    )
+    start = time.perf_counter()
+    for index in range(args.nodes):
+        _log_node(logger, f"node_{index}", inputs, output, args.edges)
+    return (time.perf_counter() - start) / args.nodes
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark WorkflowLogger per-node overhead")
+    parser.add_argument("--nodes", type=int, default=200, help="Nodes logged per run")
+    parser.add_argument("--messages", type=int, default=20, help="Input messages per node")
+    parser.add_argument("--content", type=int, default=2000, help="Characters per message")
+    parser.add_argument("--edges", type=int, default=3, help="Outgoing edges per node")
+    parser.add_argument("--level", default="DEBUG", choices=[level.value for level in LogLevel])
+    parser.add_argument("--no-structured", dest="structured", action="store_false",
+                        help="Disable the structured JSON log")
+    parser.add_argument("--no-console", dest="console", action="store_false",
+                        help="Disable console output (on by default, as for CLI and SDK runs)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    # Keep benchmark output out of logs/
+    os.environ.setdefault("WORKFLOW_LOG_FILE", os.path.join(tempfile.mkdtemp(), "workflow.log"))
+    inputs = [_Message("user" if index % 2 else "assistant", "x" * args.content) for index in range(args.messages)]
+    output = "y" * args.content
+
+    # Console lines are still formatted and written, just not to the terminal
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        eager = _time_per_node(_EagerWorkflowLogger, args, inputs, output)
+        lazy = _time_per_node(WorkflowLogger, args, inputs, output)
+        start = time.perf_counter()
+        get_log_writer().flush()
+        drain = (time.perf_counter() - start) / args.nodes
+
+    console = "on" if args.console else "off"
+    print(f"{args.nodes} nodes, {args.messages} x {args.content}-char inputs, level {args.level}, console {console}")
+    print(f"  eager add_log  {eager * 1000:8.3f} ms/node")
+    print(f"  lazy add_log   {lazy * 1000:8.3f} ms/node  ({eager / lazy:6.1f}x)")
+    print(f"  writer drain   {drain * 1000:8.3f} ms/node (background thread)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # uv run -m tools.benchmark_workflow_logging
+    raise SystemExit(main())
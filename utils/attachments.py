@@ -8,9 +8,10 @@ import shutil
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 from entity.messages import AttachmentRef, MessageBlock, MessageBlockType
+from utils.blob_store import BlobStore, BlobWriter, copy_file_hashing, get_blob_store
 
 DEFAULT_INLINE_LIMIT = 512 * 1024  # 512 KB
 
@@ -57,12 +58,26 @@ class AttachmentRecord:
 
 
 class AttachmentStore:
-    """Filesystem-backed attachment manifest for a workflow execution."""
+    """Filesystem-backed attachment manifest for a workflow execution.
 
-    def __init__(self, root_dir: Path | str, inline_size_limit: int = DEFAULT_INLINE_LIMIT) -> None:
+    Copied files are stored at ``<root>/<attachment_id>/<name>``. Where the
+    filesystem supports reflinks, the content also lives once in a shared
+    :class:`BlobStore`, keyed by the ``sha256`` on the ref, and each stored
+    file is a copy-on-write reflink of that blob. Otherwise files are written
+    to ``<root>`` directly and the blob store is left out.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path | str,
+        inline_size_limit: int = DEFAULT_INLINE_LIMIT,
+        blob_store: Optional[BlobStore] = None,
+    ) -> None:
         self.root = Path(root_dir)
         self.inline_size_limit = inline_size_limit
+        self.blob_store = blob_store or get_blob_store()
         self.root.mkdir(parents=True, exist_ok=True)
+        self.deduplicates = self.blob_store.shares_storage_with(self.root)
         self.manifest_path = self.root / "attachments_manifest.json"
         self._records: Dict[str, AttachmentRecord] = {}
         self._persistent_ids: set[str] = set()
@@ -83,33 +98,120 @@ class AttachmentStore:
         persist: bool = True,
         deduplicate: bool = False,
     ) -> AttachmentRecord:
-        """Register a local file and return its attachment record."""
+        """Register a local file and return its attachment record.
+
+        With ``copy_file`` the content is copied in a single read.
+        """
         source = Path(file_path)
         if not source.exists():
             raise FileNotFoundError(f"Attachment source not found: {source}")
 
-        guessed_mime = mime_type or (mimetypes.guess_type(source.name)[0] or "application/octet-stream")
-        attachment_id = attachment_id or uuid.uuid4().hex
-        sha256_source = _sha256_file(source)
+        if copy_file and not self.deduplicates:
+            attachment_id = attachment_id or uuid.uuid4().hex
+            target_path = self.root / attachment_id / source.name
+            sha256 = copy_file_hashing(source, target_path)
+            existing = None
+            if deduplicate:
+                existing = self._find_duplicate_by_hash(sha256, copy_file=True, source_path=source)
+            if existing:
+                if existing.ref.attachment_id != attachment_id:
+                    shutil.rmtree(target_path.parent, ignore_errors=True)
+                return existing
+            return self._add_file_record(
+                target_path,
+                sha256,
+                kind=kind,
+                display_name=display_name or source.name,
+                mime_type=mime_type,
+                attachment_id=attachment_id,
+                description=description,
+                extra=extra,
+                persist=persist,
+            )
+
+        if copy_file:
+            sha256, _ = self.blob_store.put_file(source)
+        else:
+            sha256 = _sha256_file(source)
 
         if deduplicate:
             existing = self._find_duplicate_by_hash(
-                sha256_source,
+                sha256,
                 copy_file=copy_file,
                 source_path=source,
             )
             if existing:
                 return existing
         if copy_file:
-            target_dir = self.root / attachment_id
-            target_dir.mkdir(parents=True, exist_ok=True)
-            target_path = target_dir / source.name
-            shutil.copy2(source, target_path)
-        else:
-            target_path = source.resolve()
+            return self.register_blob(
+                sha256,
+                name=source.name,
+                kind=kind,
+                display_name=display_name,
+                mime_type=mime_type,
+                attachment_id=attachment_id,
+                description=description,
+                extra=extra,
+                persist=persist,
+            )
+        return self._add_file_record(
+            source.resolve(),
+            sha256,
+            kind=kind,
+            display_name=display_name or source.name,
+            mime_type=mime_type,
+            attachment_id=attachment_id,
+            description=description,
+            extra=extra,
+            persist=persist,
+        )
+
+    def register_blob(
+        self,
+        sha256: str,
+        *,
+        name: str,
+        kind: MessageBlockType = MessageBlockType.FILE,
+        display_name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        attachment_id: Optional[str] = None,
+        description: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        persist: bool = True,
+    ) -> AttachmentRecord:
+        """Register content already in the blob store under ``<attachment_id>/<name>``."""
+        if not self.blob_store.has(sha256):
+            raise FileNotFoundError(f"Blob not found: {sha256}")
+        attachment_id = attachment_id or uuid.uuid4().hex
+        target_path = self.blob_store.materialize(sha256, self.root / attachment_id / name)
+        return self._add_file_record(
+            target_path,
+            sha256,
+            kind=kind,
+            display_name=display_name or name,
+            mime_type=mime_type,
+            attachment_id=attachment_id,
+            description=description,
+            extra=extra,
+            persist=persist,
+        )
 
+    def _add_file_record(
+        self,
+        target_path: Path,
+        sha256: str,
+        *,
+        kind: MessageBlockType,
+        display_name: str,
+        mime_type: Optional[str],
+        attachment_id: Optional[str],
+        description: Optional[str],
+        extra: Optional[Dict[str, Any]],
+        persist: bool,
+    ) -> AttachmentRecord:
+        guessed_mime = mime_type or (mimetypes.guess_type(target_path.name)[0] or "application/octet-stream")
+        attachment_id = attachment_id or uuid.uuid4().hex
         size = target_path.stat().st_size
-        sha256 = sha256_source or _sha256_file(target_path)
         data_uri = None
         # if size <= self.inline_size_limit:
         #     data_uri = encode_file_to_data_uri(target_path, guessed_mime)
@@ -117,7 +219,7 @@ class AttachmentStore:
         ref = AttachmentRef(
             attachment_id=attachment_id,
             mime_type=guessed_mime,
-            name=display_name or source.name,
+            name=display_name,
             size=size,
             sha256=sha256,
             local_path=str(target_path),
@@ -156,22 +258,77 @@ class AttachmentStore:
         if not isinstance(data, (bytes, bytearray)):
             raise TypeError("register_bytes expects bytes or bytearray data")
 
-        attachment_id = attachment_id or uuid.uuid4().hex
         filename = display_name or _default_filename_for_mime(mime_type)
+        if not self.deduplicates:
+            attachment_id = attachment_id or uuid.uuid4().hex
+            target_path = self.root / attachment_id / filename
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            target_path.write_bytes(data)
+            return self._add_file_record(
+                target_path,
+                hashlib.sha256(data).hexdigest(),
+                kind=kind,
+                display_name=filename,
+                mime_type=mime_type,
+                attachment_id=attachment_id,
+                description=description,
+                extra=extra,
+                persist=persist,
+            )
+        sha256, _ = self.blob_store.put_bytes(data)
+        return self.register_blob(
+            sha256,
+            name=filename,
+            kind=kind,
+            display_name=filename,
+            mime_type=mime_type,
+            attachment_id=attachment_id,
+            description=description,
+            extra=extra,
+            persist=persist,
+        )
 
-        target_dir = self.root / attachment_id
-        target_dir.mkdir(parents=True, exist_ok=True)
-        target_path = target_dir / filename
-        with target_path.open("wb") as handle:
-            handle.write(bytes(data))
+    def open_writer(self) -> BlobWriter:
+        """Stream a payload in chunks; finish it with :meth:`register_writer`."""
+        return self.blob_store.open_writer()
 
-        return self.register_file(
+    def register_writer(
+        self,
+        writer: BlobWriter,
+        *,
+        name: str,
+        kind: MessageBlockType = MessageBlockType.FILE,
+        display_name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        attachment_id: Optional[str] = None,
+        description: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        persist: bool = True,
+    ) -> AttachmentRecord:
+        """Register the payload streamed into ``writer`` under ``<attachment_id>/<name>``."""
+        if self.deduplicates:
+            sha256, _ = writer.commit()
+            return self.register_blob(
+                sha256,
+                name=name,
+                kind=kind,
+                display_name=display_name,
+                mime_type=mime_type,
+                attachment_id=attachment_id,
+                description=description,
+                extra=extra,
+                persist=persist,
+            )
+        attachment_id = attachment_id or uuid.uuid4().hex
+        target_path = self.root / attachment_id / name
+        sha256 = writer.commit_to(target_path)
+        return self._add_file_record(
             target_path,
+            sha256,
             kind=kind,
-            display_name=display_name or filename,
+            display_name=display_name or name,
             mime_type=mime_type,
             attachment_id=attachment_id,
-            copy_file=False,
             description=description,
             extra=extra,
             persist=persist,
@@ -274,7 +431,8 @@ class AttachmentStore:
     ) -> AttachmentRecord:
         """
         Import an existing attachment record (e.g., from a session upload) into this store.
-        Optionally copies the underlying file into the store directory.
+        Optionally copies the underlying file into the store directory; content
+        already in the blob store is reflinked rather than copied or rehashed.
         """
         source_ref = record.ref
         attachment_id = source_ref.attachment_id or uuid.uuid4().hex
@@ -284,12 +442,19 @@ class AttachmentStore:
         local_path = source_ref.local_path
         if local_path and copy_file:
             source_path = Path(local_path)
-            if source_path.exists():
-                target_dir = self.root / attachment_id
-                target_dir.mkdir(parents=True, exist_ok=True)
-                target_path = target_dir / source_path.name
-                shutil.copy2(source_path, target_path)
-                new_ref.local_path = str(target_path)
+            sha256 = source_ref.sha256
+            target_path = self.root / attachment_id / source_path.name
+            if not self.deduplicates:
+                if source_path.exists():
+                    new_ref.sha256 = copy_file_hashing(source_path, target_path)
+                    new_ref.local_path = str(target_path)
+            else:
+                if not self.blob_store.has(sha256) and source_path.exists():
+                    sha256, _ = self.blob_store.put_file(source_path)
+                if self.blob_store.has(sha256):
+                    target_path = self.blob_store.materialize(sha256, target_path)
+                    new_ref.local_path = str(target_path)
+                    new_ref.sha256 = sha256
         self._records[attachment_id] = AttachmentRecord(
             ref=new_ref,
             kind=record.kind,
@@ -327,6 +492,21 @@ class AttachmentStore:
         self.manifest_path.write_text(json.dumps(serialized, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+def referenced_blobs(root: Path | str) -> Set[str]:
+    """Collect the ``sha256`` of every attachment in the manifests under ``root``."""
+    referenced: Set[str] = set()
+    for manifest_path in Path(root).rglob("attachments_manifest.json"):
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        for record_data in data.values():
+            sha256 = ((record_data or {}).get("ref") or {}).get("sha256")
+            if sha256:
+                referenced.add(sha256)
+    return referenced
+
+
 def _sha256_file(path: Path) -> str:
     hasher = hashlib.sha256()
     with path.open("rb") as handle:
@@ -0,0 +1,266 @@
+"""Content-addressed storage for attachment payloads."""
+
+import hashlib
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Shared by every session and batch task so identical uploads are stored once.
+ATTACHMENT_BLOB_DIR = Path(os.getenv("ATTACHMENT_BLOB_DIR", str(Path("WareHouse") / ".blobs")))
+# Unreferenced blobs and temp files younger than this survive collect_garbage(), so an
+# upload stored but not yet registered in a manifest is not swept from under it.
+BLOB_GC_MIN_AGE = float(os.getenv("BLOB_GC_MIN_AGE", "3600"))
+
+_CHUNK_SIZE = 1024 * 1024
+# Linux FICLONE ioctl: copy-on-write clone on btrfs, XFS and other reflink-capable filesystems
+_FICLONE = 0x40049409
+# Mode of files handed out by materialize(); blobs themselves stay read-only
+_MATERIALIZED_MODE = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+class BlobWriter:
+    """Streams a payload into a temporary blob file, hashing it as it is written."""
+
+    def __init__(self, store: "BlobStore"):
+        self.store = store
+        self.temp_path = store._temp_path()
+        self._handle = self.temp_path.open("wb")
+        self._hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> Tuple[str, Path]:
+        """Finish the write and return ``(sha256, blob_path)``."""
+        self._handle.close()
+        sha256 = self._hasher.hexdigest()
+        return sha256, self.store._commit(self.temp_path, sha256)
+
+    def commit_to(self, target: Path | str) -> str:
+        """Finish the write by moving the payload to ``target``, outside the store."""
+        self._handle.close()
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(self.temp_path), str(target))
+        os.chmod(target, _MATERIALIZED_MODE)
+        return self._hasher.hexdigest()
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._handle.close()
+        _remove(self.temp_path)
+
+
+class BlobStore:
+    """Stores each distinct payload once as ``<root>/<sha[:2]>/<sha256>``.
+
+    Blobs are read-only and never modified. Ingestion reflinks the source where
+    the filesystem allows it and otherwise copies it, hashing in the same pass.
+    Attachment stores expose blobs under their own names through
+    :meth:`materialize`, which hands out independent copy-on-write reflinks so
+    no attachment can alter the shared blob. Where reflinks are unavailable
+    (see :meth:`shares_storage_with`) a blob would only add a second copy, so
+    callers write straight to their own file instead.
+    """
+
+    def __init__(self, root: Path | str = ATTACHMENT_BLOB_DIR):
+        self.root = Path(root)
+        self._tmp_dir = self.root / "tmp"
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._reflink_devices: Dict[int, bool] = {}
+        self._probe_lock = threading.Lock()
+
+    def path_for(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def has(self, sha256: Optional[str]) -> bool:
+        return bool(sha256) and self.path_for(sha256).exists()
+
+    def put_file(self, source: Path | str) -> Tuple[str, Path]:
+        """Store ``source`` and return ``(sha256, blob_path)``."""
+        source = Path(source)
+        temp_path = self._temp_path()
+        try:
+            if _reflink(source, temp_path):
+                sha256 = _sha256_file(temp_path)
+            else:
+                sha256 = _copy_hashing(source, temp_path)
+            return sha256, self._commit(temp_path, sha256)
+        finally:
+            _remove(temp_path)
+
+    def put_bytes(self, data: bytes | bytearray) -> Tuple[str, Path]:
+        sha256 = hashlib.sha256(data).hexdigest()
+        if self.has(sha256):
+            return sha256, self._touch(self.path_for(sha256))
+        with self.open_writer() as writer:
+            writer.write(bytes(data))
+            return writer.commit()
+
+    def open_writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def materialize(self, sha256: str, target: Path | str) -> Path:
+        """Expose the blob at ``target`` as a writable file of its own.
+
+        Reflinks share storage copy-on-write; otherwise the blob is copied.
+        Hardlinks are never used, since a write through one would alter the blob.
+        """
+        blob = self.path_for(sha256)
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            _remove(target)
+        if not _reflink(blob, target):
+            shutil.copyfile(blob, target)
+        # Neither path copies the blob's read-only mode
+        os.chmod(target, _MATERIALIZED_MODE)
+        return target
+
+    def shares_storage_with(self, directory: Path | str) -> bool:
+        """Whether blobs can be reflinked into ``directory``.
+
+        Probed once per filesystem. Without reflinks a materialized file is a
+        full copy, so keeping the blob as well would store the payload twice.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        device = directory.stat().st_dev
+        with self._probe_lock:
+            if device not in self._reflink_devices:
+                self._reflink_devices[device] = self._probe_reflink(directory)
+            return self._reflink_devices[device]
+
+    def collect_garbage(self, referenced: Iterable[str], min_age: float = BLOB_GC_MIN_AGE) -> int:
+        """Delete blobs outside ``referenced`` and stale temp files; return how many blobs went.
+
+        Materialized files never share storage the blob store depends on, so
+        removing a blob only costs deduplication for later copies of it.
+        """
+        keep = set(referenced)
+        cutoff = time.time() - min_age
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if path.parent == self._tmp_dir:
+                _remove(path)
+            elif path.name not in keep:
+                _remove(path)
+                removed += 1
+        return removed
+
+    def _probe_reflink(self, directory: Path) -> bool:
+        source = self._temp_path()
+        target = directory / f".reflink-probe-{uuid.uuid4().hex}"
+        try:
+            source.write_bytes(b"\0")
+            return _reflink(source, target)
+        except OSError:
+            return False
+        finally:
+            _remove(source)
+            _remove(target)
+
+    def _commit(self, temp_path: Path, sha256: str) -> Path:
+        blob = self.path_for(sha256)
+        if blob.exists():
+            return self._touch(blob)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(temp_path, blob)
+        return blob
+
+    def _temp_path(self) -> Path:
+        return self._tmp_dir / uuid.uuid4().hex
+
+    @staticmethod
+    def _touch(blob: Path) -> Path:
+        # A blob stored again counts as new for collect_garbage()
+        try:
+            os.utime(blob)
+        except OSError:
+            pass
+        return blob
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        with _blob_store_lock:
+            if _blob_store is None:
+                _blob_store = BlobStore(ATTACHMENT_BLOB_DIR)
+    return _blob_store
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with source.open("rb") as src, target.open("wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        _remove(target)
+        return False
+    return True
+
+
+def copy_file_hashing(source: Path | str, target: Path | str) -> str:
+    """Copy ``source`` to a writable ``target`` and return its sha256, reading it once."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists() or target.is_symlink():
+        _remove(target)
+    sha256 = _copy_hashing(Path(source), target)
+    os.chmod(target, _MATERIALIZED_MODE)
+    return sha256
+
+
+def _copy_hashing(source: Path, target: Path) -> str:
+    hasher = hashlib.sha256()
+    with source.open("rb") as src, target.open("wb") as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            dst.write(chunk)
+    return hasher.hexdigest()
+
+
+def _sha256_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # Read-only files cannot be unlinked on Windows until made writable
+        os.chmod(path, stat.S_IWRITE)
+        path.unlink()
@@ -0,0 +1,95 @@
+"""Append-only JSONL sink for workflow log entries."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+# A segment is rotated once it grows past this many bytes; all segments are kept.
+WORKFLOW_LOG_SEGMENT_BYTES = int(os.getenv("WORKFLOW_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+
+class JsonlLogStream:
+    """Writes one JSON object per line to ``<stem>.jsonl``, rotating by size.
+
+    The active file is always ``path``; full segments are renamed to
+    ``<stem>.1.jsonl``, ``<stem>.2.jsonl``, ... in write order, so a crash
+    loses at most the line being written. The handle is reopened lazily, so
+    writes after :meth:`close` simply append again.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = WORKFLOW_LOG_SEGMENT_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._file: Optional[IO[str]] = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._segments = len(self._rotated_paths())
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        size = len(line.encode("utf-8"))
+        with self._lock:
+            handle = self._open()
+            if self.max_bytes > 0 and self._size and self._size + size > self.max_bytes:
+                self._rotate()
+                handle = self._open()
+            handle.write(line)
+            handle.flush()
+            self._size += size
+
+    def reset(self) -> None:
+        """Delete every segment, e.g. left behind by an earlier run in the same directory."""
+        self.close()
+        with self._lock:
+            for segment in self.segment_paths():
+                # Another process may have removed it since it was listed
+                segment.unlink(missing_ok=True)
+            self._segments = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def segment_paths(self) -> List[Path]:
+        """All segments, oldest first, ending with the active file if present."""
+        paths = self._rotated_paths()
+        if self.path.exists():
+            paths.append(self.path)
+        return paths
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield raw JSON lines across all segments without loading them at once."""
+        for segment in self.segment_paths():
+            with segment.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if line:
+                        yield line
+
+    def _open(self) -> IO[str]:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+            self._size = self.path.stat().st_size
+        return self._file
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+        self._segments += 1
+        os.replace(self.path, self._segment_path(self._segments))
+
+    def _segment_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+    def _rotated_paths(self) -> List[Path]:
+        paths = []
+        index = 1
+        while self._segment_path(index).exists():
+            paths.append(self._segment_path(index))
+            index += 1
+        return paths
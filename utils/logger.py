@@ -1,18 +1,26 @@
+import atexit
 import os
+import queue
+import threading
+import textwrap
 import time
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import json
-import copy
 import traceback
 
 from entity.enums import CallStage, EventType, LogLevel
 from utils.structured_logger import StructuredLogger, LogType, get_workflow_logger
 from utils.exceptions import MACException
+from utils.log_stream import JsonlLogStream
+
+# Entries kept in memory for get_logs() once a run streams its log to disk.
+WORKFLOW_LOG_BUFFER_SIZE = int(os.getenv("WORKFLOW_LOG_BUFFER_SIZE", "10000"))
 
 
 def _json_safe(value: Any) -> Any:
@@ -37,17 +45,46 @@ def _json_safe(value: Any) -> Any:
     return str(value)
 
 
+def _snapshot(value: Any) -> Any:
+    """Copy nested dicts, lists, tuples and sets without converting their leaves.
+
+    Containers the caller mutates after logging keep their logged state;
+    other objects are kept by reference and converted by :func:`_json_safe` later.
+    """
+    if isinstance(value, dict):
+        return {key: _snapshot(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_snapshot(item) for item in value]
+    return value
+
+
 @dataclass
 class LogEntry:
-    """Single log entry that captures execution details."""
+    """Single log entry that captures execution details.
+
+    ``raw_details`` holds a structural copy of the caller's containers whose
+    leaves are the caller's objects as-is; they are converted to JSON-safe
+    primitives the first time :attr:`details` is read (by an exporter, the
+    structured log writer or a WebSocket client), not on the node execution
+    thread that logged them.
+    """
     timestamp: str
     level: LogLevel
     node_id: Optional[str] = None
     event_type: Optional[EventType] = None
     message: Optional[str] = None
-    details: Dict[str, Any] = field(default_factory=dict)
-    execution_path: List[str] = field(default_factory=list)  # Execution path for tracing
+    raw_details: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    execution_path: Sequence[str] = ()  # Execution path for tracing
     duration: Optional[float] = None  # Duration in seconds
+    _materialized: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        if not self._materialized:
+            # Racing readers at worst convert already JSON-safe data again
+            self.raw_details = _json_safe(self.raw_details or {})
+            self._materialized = True
+        return self.raw_details
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -57,20 +94,67 @@ class LogEntry:
             "event_type": self.event_type,
             "message": self.message,
             "details": self.details,
-            "execution_path": self.execution_path,
+            "execution_path": list(self.execution_path),
             "duration": self.duration
         }
 
 
+class _BackgroundLogWriter:
+    """Single daemon thread that serializes log entries off the execution threads."""
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[tuple[Callable[..., None], tuple]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="workflow-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable[..., None], *args: Any) -> None:
+        self._queue.put((func, args))
+
+    def flush(self) -> None:
+        """Block until every submitted write has been handled."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+
+_log_writer: Optional[_BackgroundLogWriter] = None
+_log_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> _BackgroundLogWriter:
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = _BackgroundLogWriter()
+                atexit.register(_log_writer.flush)
+    return _log_writer
+
+
 class WorkflowLogger:
     """Workflow logger that tracks the entire execution lifecycle."""
 
     def __init__(self, workflow_id: str = None, log_level: LogLevel = LogLevel.DEBUG, use_structured_logging: bool = True, log_to_console: bool = True):
         self.workflow_id = workflow_id or f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.logs: List[LogEntry] = []
+        self.logs: "deque[LogEntry]" = deque()
         self.start_time = datetime.now()
         self.current_path: List[str] = []
         self.log_level: LogLevel = log_level
+        # Running totals so summaries stay exact when ``logs`` is a bounded buffer
+        self.total_logs = 0
+        self._error_count = 0
+        self._warning_count = 0
+        self._node_durations: Dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+        self.stream: Optional[JsonlLogStream] = None
 
         self.log_to_console: bool = log_to_console
         self.use_structured_logging = use_structured_logging
@@ -81,60 +165,110 @@ class WorkflowLogger:
     def add_log(self, level: LogLevel, message: str = None, node_id: str = None,
                 event_type: EventType = None, details: Dict[str, Any] = None,
                 duration: float = None) -> LogEntry | None:
-        """Add a log entry."""
+        """Add a log entry.
+
+        Only cheap copies are taken here; formatting and serialization of
+        ``details`` for the console, the JSONL stream and the structured log
+        happen on the background writer thread.
+        """
         if level < self.log_level:
             return None
 
         timestamp = datetime.now().isoformat()
-        execution_path = copy.deepcopy(self.current_path)
-
-        safe_details = _json_safe(details or {})
-
         log_entry = LogEntry(
             timestamp=timestamp,
             level=level,
             node_id=node_id,
             event_type=event_type,
             message=message,
-            details=safe_details,
-            execution_path=execution_path,
+            # Copy nested containers so later edits by the caller do not leak in
+            raw_details=_snapshot(details) if details else None,
+            execution_path=tuple(self.current_path),
             duration=duration
         )
         self.logs.append(log_entry)
+        with self._stats_lock:
+            self.total_logs += 1
+            if level in (LogLevel.ERROR, LogLevel.CRITICAL):
+                self._error_count += 1
+            elif level == LogLevel.WARNING:
+                self._warning_count += 1
+            if node_id and duration:
+                self._node_durations[node_id] = self._node_durations.get(node_id, 0) + duration
 
-        # Log to console if enabled
+        # Console lines repr the full details, so they are formatted by the writer too
         if self.log_to_console:
-            print(f"[{timestamp}] [{level.value}] "
-                  f"{f'Node {node_id} - ' if node_id else ''}"
-                  f"{f'Event {event_type} - ' if event_type else ''}"
-                  f"{message} "
-                  f"{f'Details: {details} ' if details else ''}"
-                  f"{f'Duration: {duration}' if duration else ''}")
-        
-        # Log using structured logger if enabled
-        if self.use_structured_logging and self.structured_logger:
-            structured_details = {
-                "workflow_id": self.workflow_id,
-                "node_id": node_id,
-                "event_type": event_type.value if event_type else None,
-                "execution_path": execution_path,
-                "duration": duration,
-                **safe_details
-            }
-            
-            if level == LogLevel.DEBUG:
-                self.structured_logger.debug(message, **structured_details)
-            elif level == LogLevel.INFO:
-                self.structured_logger.info(message, **structured_details)
-            elif level == LogLevel.WARNING:
-                self.structured_logger.warning(message, **structured_details)
-            elif level == LogLevel.ERROR:
-                self.structured_logger.error(message, **structured_details)
-            elif level == LogLevel.CRITICAL:
-                self.structured_logger.critical(message, **structured_details)
+            get_log_writer().submit(self._write_console, log_entry)
+
+        if self.stream is not None:
+            get_log_writer().submit(self._write_stream, self.stream, log_entry)
+
+        # Log using structured logger if enabled and the level passes its threshold
+        if self.use_structured_logging and self.structured_logger and self.structured_logger.is_enabled(level):
+            get_log_writer().submit(self._write_structured, log_entry)
 
         return log_entry
 
+    def stream_to(self, path: str | Path, buffer_size: int = WORKFLOW_LOG_BUFFER_SIZE) -> None:
+        """Append every entry to a rotating JSONL file at ``path`` as it is logged.
+
+        Existing segments at ``path`` are discarded. From then on only the
+        last ``buffer_size`` entries stay in memory; :meth:`save_to_file`
+        rebuilds the full log from the JSONL segments.
+        """
+        stream = JsonlLogStream(path)
+        stream.reset()
+        self.logs = deque(self.logs, maxlen=buffer_size)
+        for log_entry in self.logs:
+            get_log_writer().submit(self._write_stream, stream, log_entry)
+        self.stream = stream
+
+    @staticmethod
+    def _write_console(log_entry: LogEntry) -> None:
+        node_id = log_entry.node_id
+        event_type = log_entry.event_type
+        details = log_entry.raw_details
+        duration = log_entry.duration
+        print(f"[{log_entry.timestamp}] [{log_entry.level.value}] "
+              f"{f'Node {node_id} - ' if node_id else ''}"
+              f"{f'Event {event_type} - ' if event_type else ''}"
+              f"{log_entry.message} "
+              f"{f'Details: {details} ' if details else ''}"
+              f"{f'Duration: {duration}' if duration else ''}")
+
+    @staticmethod
+    def _write_stream(stream: JsonlLogStream, log_entry: LogEntry) -> None:
+        stream.write(log_entry.to_dict())
+
+    def _write_structured(self, log_entry: LogEntry) -> None:
+        """Emit ``log_entry`` to the structured logger (runs on the writer thread)."""
+        structured_details = {
+            "workflow_id": self.workflow_id,
+            "node_id": log_entry.node_id,
+            "event_type": log_entry.event_type.value if log_entry.event_type else None,
+            "execution_path": list(log_entry.execution_path),
+            "duration": log_entry.duration,
+            **log_entry.details
+        }
+
+        level = log_entry.level
+        message = log_entry.message
+        if level == LogLevel.DEBUG:
+            self.structured_logger.debug(message, **structured_details)
+        elif level == LogLevel.INFO:
+            self.structured_logger.info(message, **structured_details)
+        elif level == LogLevel.WARNING:
+            self.structured_logger.warning(message, **structured_details)
+        elif level == LogLevel.ERROR:
+            self.structured_logger.error(message, **structured_details)
+        elif level == LogLevel.CRITICAL:
+            self.structured_logger.critical(message, **structured_details)
+
+    def flush(self) -> None:
+        """Wait for pending console, structured log and JSONL writes to complete."""
+        if self.log_to_console or self.stream is not None or (self.use_structured_logging and self.structured_logger):
+            get_log_writer().flush()
+
     def debug(self, message: str, node_id: str = None, event_type: EventType = None,
               details: Dict[str, Any] = None, duration: float | None = None) -> None:
         self.add_log(LogLevel.DEBUG, message, node_id, event_type, details, duration)
@@ -323,7 +457,7 @@ class WorkflowLogger:
         """Record the workflow end event."""
         end_details = {
             "success": success,
-            "total_logs": len(self.logs),
+            "total_logs": self.total_logs,
             **(details or {})
         }
 
@@ -337,7 +471,7 @@ class WorkflowLogger:
         )
 
     def get_logs(self) -> List[Dict[str, Any]]:
-        """Return all log entries as dictionaries."""
+        """Return buffered log entries as dictionaries (all of them unless streaming)."""
         return [log.to_dict() for log in self.logs]
 
     def get_logs_by_level(self, level: str) -> List[Dict[str, Any]]:
@@ -352,21 +486,16 @@ class WorkflowLogger:
         """Return an execution summary."""
         total_duration = (datetime.now() - self.start_time).total_seconds() * 1000
 
-        node_durations = {}
-        for log in self.logs:
-            if log.node_id and log.duration:
-                if log.node_id not in node_durations:
-                    node_durations[log.node_id] = 0
-                node_durations[log.node_id] += log.duration
-
-        error_count = len([log for log in self.logs if log.level in ["ERROR", "CRITICAL"]])
-        warning_count = len([log for log in self.logs if log.level == "WARNING"])
+        with self._stats_lock:
+            node_durations = dict(self._node_durations)
+            error_count = self._error_count
+            warning_count = self._warning_count
 
         return {
             "workflow_id": self.workflow_id,
             "start_time": self.start_time.isoformat(),
             "total_duration": total_duration,
-            "total_logs": len(self.logs),
+            "total_logs": self.total_logs,
             "error_count": error_count,
             "warning_count": warning_count,
             "node_durations": node_durations,
@@ -388,11 +517,24 @@ class WorkflowLogger:
 
     def save_to_file(self, filepath: str) -> None:
         """Persist logs to a file on disk."""
-        # with open(filepath, 'w', encoding='utf-8') as f:
-        #     f.write(self.to_json())
+        self.flush()
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)  # Create any missing parent directories
-        path.write_text(self.to_json(), encoding='utf-8')
+        if self.stream is None:
+            path.write_text(self.to_json(), encoding='utf-8')
+            return
+
+        # Rebuild the document from the JSONL segments one entry at a time
+        header = json.dumps({"workflow_id": self.workflow_id, "start_time": self.start_time.isoformat()},
+                            ensure_ascii=False, indent=2)
+        summary = json.dumps(self.get_execution_summary(), ensure_ascii=False, indent=2)
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write(header[:-2] + ',\n  "logs": [')
+            for index, line in enumerate(self.stream.iter_lines()):
+                entry = json.dumps(json.loads(line), ensure_ascii=False, indent=2)
+                handle.write(("," if index else "") + "\n" + textwrap.indent(entry, "    "))
+            handle.write('\n  ],\n  "summary": ' + textwrap.indent(summary, "  ").lstrip() + "\n}")
+        self.stream.close()
     
     # ================================================================
     # Timer Context Managers (integrated from LogManager)
@@ -65,6 +65,10 @@ class StructuredLogger:
         """Check if a log level should be logged based on configured level."""
         return level >= self.log_level
     
+    def is_enabled(self, level: LogLevel) -> bool:
+        """Whether entries at ``level`` would be written; lets callers skip building them."""
+        return self._should_log(level)
+
     def _format_log(self, log_type: LogType, level: LogLevel, message: str, 
                     correlation_id: str = None, **kwargs) -> str:
         """Format log entry as JSON string."""
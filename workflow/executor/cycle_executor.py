@@ -2,15 +2,39 @@
 
 import copy
 import threading
-from typing import Dict, List, Callable, Any, Set, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Callable, Any, Mapping, Sequence, Set, Optional, Tuple
 
 from entity.configs import Node, EdgeLink
 from utils.log_manager import LogManager
 from workflow.cycle_manager import CycleManager
 from workflow.executor.parallel_executor import ParallelExecutor
+from workflow.executor.worker_pool import WorkerScope
 from workflow.topology_builder import GraphTopologyBuilder
 
 
+@dataclass(frozen=True)
+class CyclePlan:
+    """Compiled execution order for one pass over a cycle scope."""
+
+    inner_cycles: Tuple[FrozenSet[str], ...]
+    layers: Tuple[Tuple[Mapping[str, Any], ...], ...]
+
+
+def _freeze_layers(layers: List[List[Dict[str, Any]]]) -> Tuple[Tuple[Mapping[str, Any], ...], ...]:
+    frozen = []
+    for layer in layers:
+        items = []
+        for item in layer:
+            item = dict(item)
+            if "nodes" in item:
+                item["nodes"] = tuple(item["nodes"])
+            items.append(MappingProxyType(item))
+        frozen.append(tuple(items))
+    return tuple(frozen)
+
+
 class CycleExecutor:
     """Execute workflow graphs that contain cycles.
     
@@ -27,6 +51,7 @@ class CycleExecutor:
         cycle_execution_order: List[Dict[str, Any]],
         cycle_manager: CycleManager,
         execute_node_func: Callable[[Node], None],
+        worker_scope: Optional[WorkerScope] = None,
     ):
         """Initialize the cycle executor.
         
@@ -36,13 +61,18 @@ class CycleExecutor:
             cycle_execution_order: Super-node execution order with cycles
             cycle_manager: Cycle manager coordinating iterations
             execute_node_func: Callable that executes a single node
+            worker_scope: Scope on the shared worker pool
         """
         self.log_manager = log_manager
         self.nodes = nodes
         self.cycle_execution_order = cycle_execution_order
         self.cycle_manager = cycle_manager
         self.execute_node_func = execute_node_func
-        self.parallel_executor = ParallelExecutor(log_manager, nodes)
+        self.parallel_executor = ParallelExecutor(log_manager, nodes, worker_scope)
+        # Scope topology never changes during a run, so plans are compiled once per
+        # (cycle, scope, entry node, triggered-set signature) and reused by every iteration
+        self._plans: Dict[Tuple[str, Tuple[str, ...], str, Optional[FrozenSet[str]]], CyclePlan] = {}
+        self._plans_lock = threading.Lock()
     
     def execute(self) -> None:
         """Run the workflow that contains cycles."""
@@ -151,16 +181,17 @@ class CycleExecutor:
             ValueError: If no node or multiple nodes are triggered
         """
         triggered_nodes: List[str] = []
+        scope = set(nodes)
 
         for node_id in nodes:
             node = self.nodes[node_id]
+            if not node.is_triggered():
+                continue
             # Check if any external predecessor (node outside the cycle) triggers this node
-            for predecessor in node.predecessors:
-                if predecessor.id not in nodes:  # External node
-                    edge = predecessor.find_outgoing_edge(node_id)
-                    if edge and edge.trigger and edge.triggered:
-                        triggered_nodes.append(node_id)
-                        break
+            for edge in node.iter_incoming_edges():
+                if edge.source.id not in scope and edge.trigger and edge.triggered:
+                    triggered_nodes.append(node_id)
+                    break
 
         cycle_info = self.cycle_manager.cycles.get(cycle_id)
         configured_entry = cycle_info.configured_entry_node if cycle_info else None
@@ -212,18 +243,15 @@ class CycleExecutor:
                 f"Cycle {cycle_id} iteration {iteration + 1}/{max_iterations}"
             )
 
-            # Step 1: Detect nested cycles in the scoped subgraph
-            inner_cycles = self._detect_cycles_in_scope(cycle_nodes, initial_node_id)
-
-            # Build topological layers (whether there are nested cycles or not)
-            execution_layers = self._build_topological_layers_in_scope(
-                cycle_nodes, initial_node_id, inner_cycles,
+            # Step 1: Look up (or compile) the plan for this iteration's entry points
+            plan = self._get_cycle_plan(
+                cycle_id, cycle_nodes, initial_node_id,
                 is_first_iteration=(iteration == 0)
             )
 
             # Execute the topological layers
             external_nodes = self._execute_scope_layers(
-                execution_layers,
+                plan.layers,
                 cycle_id,
                 cycle_nodes,
                 initial_node_id=initial_node_id,
@@ -250,6 +278,45 @@ class CycleExecutor:
                 f"Cycle {cycle_id} reached max iterations ({max_iterations})"
             )
         return set()
+
+    def _get_cycle_plan(
+        self,
+        cycle_id: str,
+        cycle_nodes: Sequence[str],
+        initial_node_id: str,
+        is_first_iteration: bool,
+    ) -> CyclePlan:
+        """Return the memoized plan for a pass over ``cycle_nodes``.
+
+        The first pass enters through ``initial_node_id`` only; later passes
+        enter through every node that is currently triggered, so the set of
+        triggered nodes is part of the key.
+        """
+        triggered: Optional[FrozenSet[str]] = None
+        if not is_first_iteration:
+            triggered = frozenset(node_id for node_id in cycle_nodes if self.nodes[node_id].is_triggered())
+        key = (cycle_id, tuple(cycle_nodes), initial_node_id, triggered)
+        with self._plans_lock:
+            plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        scope_nodes = list(cycle_nodes)
+        inner_cycles = self._detect_cycles_in_scope(scope_nodes, initial_node_id)
+        layers = self._build_topological_layers_in_scope(
+            scope_nodes, initial_node_id, inner_cycles,
+            is_first_iteration=is_first_iteration,
+            triggered_nodes=triggered,
+        )
+        plan = CyclePlan(
+            inner_cycles=tuple(frozenset(cycle) for cycle in inner_cycles),
+            layers=_freeze_layers(layers),
+        )
+        with self._plans_lock:
+            self._plans.setdefault(key, plan)
+        self.log_manager.debug(f"Compiled execution plan for cycle {cycle_id} entered at {initial_node_id}")
+        return plan
+
     def _detect_cycles_in_scope(
         self,
         scope_nodes: List[str],
@@ -354,7 +421,8 @@ class CycleExecutor:
         scope_nodes: List[str],
         initial_node_id: str,
         inner_cycles: List[Set[str]],
-        is_first_iteration: bool = False
+        is_first_iteration: bool = False,
+        triggered_nodes: Optional[FrozenSet[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build topological execution order for the scoped subgraph.
@@ -364,10 +432,14 @@ class CycleExecutor:
             initial_node_id: Initial node ID
             inner_cycles: List of nested cycles detected in the scope
             is_first_iteration: Whether this is the first iteration (affects initial node handling)
+            triggered_nodes: Nodes currently triggered in the scope; looked up when omitted
 
         Returns:
             List of execution layers, each containing execution items
         """
+        if not is_first_iteration and triggered_nodes is None:
+            triggered_nodes = frozenset(node_id for node_id in scope_nodes if self.nodes[node_id].is_triggered())
+
         # Build scoped nodes WITHOUT clearing entry node
         # We want to keep all edges intact for execution
         scoped_nodes = self._build_scoped_nodes(scope_nodes, clear_entry_node=None)
@@ -382,7 +454,7 @@ class CycleExecutor:
         else:
             # Subsequent iterations: clear predecessors for all triggered nodes
             for node_id in scope_nodes:
-                if self.nodes[node_id].is_triggered():
+                if node_id in triggered_nodes:
                     scoped_nodes[node_id].predecessors = []
 
         # Extract scoped edges from scoped_nodes (not original nodes)
@@ -398,7 +470,7 @@ class CycleExecutor:
         else:
             # Subsequent iterations: exclude edges to all triggered nodes
             for node_id in scope_nodes:
-                if self.nodes[node_id].is_triggered():
+                if node_id in triggered_nodes:
                     exclude_targets.add(node_id)
 
         for node_id in scope_nodes:
@@ -433,9 +505,9 @@ class CycleExecutor:
 
     def _execute_scope_layers(
         self,
-        execution_layers: List[List[Dict[str, Any]]],
+        execution_layers: Sequence[Sequence[Mapping[str, Any]]],
         parent_cycle_id: str,
-        parent_cycle_nodes: List[str],
+        parent_cycle_nodes: Sequence[str],
         initial_node_id: Optional[str] = None,
         is_first_iteration: bool = False
     ) -> Set[str]:
@@ -603,12 +675,12 @@ class CycleExecutor:
             True if the initial node is retriggered by an internal edge
         """
         initial_node = self.nodes[initial_node_id]
+        if not initial_node.is_triggered():
+            return False
 
-        for predecessor in initial_node.predecessors:
+        for edge in initial_node.iter_incoming_edges():
             # Only check predecessors within the cycle
-            if predecessor.id in cycle_nodes:
-                edge = predecessor.find_outgoing_edge(initial_node_id)
-                if edge and edge.trigger and edge.triggered:
-                    return True
+            if edge.source.id in cycle_nodes and edge.trigger and edge.triggered:
+                return True
 
         return False
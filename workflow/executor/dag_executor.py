@@ -1,10 +1,11 @@
 """Executor for DAG (Directed Acyclic Graph) workflows."""
 
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Optional
 
 from entity.configs import Node
 from utils.log_manager import LogManager
 from workflow.executor.parallel_executor import ParallelExecutor
+from workflow.executor.worker_pool import WorkerScope
 
 
 class DAGExecutor:
@@ -21,7 +22,8 @@ class DAGExecutor:
         log_manager: LogManager,
         nodes: Dict[str, Node],
         layers: List[List[str]],
-        execute_node_func: Callable[[Node], None]
+        execute_node_func: Callable[[Node], None],
+        worker_scope: Optional[WorkerScope] = None,
     ):
         """Initialize the executor.
         
@@ -30,12 +32,13 @@ class DAGExecutor:
             nodes: Mapping of node ids to ``Node`` objects
             layers: Topological layers
             execute_node_func: Callable used to execute a single node
+            worker_scope: Scope on the shared worker pool
         """
         self.log_manager = log_manager
         self.nodes = nodes
         self.layers = layers
         self.execute_node_func = execute_node_func
-        self.parallel_executor = ParallelExecutor(log_manager, nodes)
+        self.parallel_executor = ParallelExecutor(log_manager, nodes, worker_scope)
     
     def execute(self) -> None:
         """Execute the DAG workflow."""
@@ -5,7 +5,6 @@ When a message passes through an edge with dynamic config, the target node
 is virtually expanded into multiple instances based on split results.
 """
 
-import concurrent.futures
 from typing import Callable, Dict, List, Optional
 
 from entity.configs import Node
@@ -13,6 +12,7 @@ from entity.configs.edge.dynamic_edge_config import DynamicEdgeConfig
 from entity.messages import Message, MessageRole
 from runtime.node.splitter import create_splitter_from_config, group_messages
 from utils.log_manager import LogManager
+from workflow.executor.worker_pool import WorkerScope, get_worker_pool
 
 
 class DynamicEdgeExecutor:
@@ -28,15 +28,18 @@ class DynamicEdgeExecutor:
         self,
         log_manager: LogManager,
         node_executor_func: Callable[[Node, List[Message]], List[Message]],
+        worker_scope: Optional[WorkerScope] = None,
     ):
         """Initialize the dynamic edge executor.
         
         Args:
             log_manager: Logger instance
             node_executor_func: Function to execute a node with inputs
+            worker_scope: Scope on the shared worker pool (defaults to an anonymous scope)
         """
         self.log_manager = log_manager
         self.node_executor_func = node_executor_func
+        self.worker_scope = worker_scope or get_worker_pool().create_scope()
     
     def execute(
         self,
@@ -170,40 +173,37 @@ class DynamicEdgeExecutor:
             outputs = self._execute_unit(target_node, unit_inputs, 0)
             all_outputs.extend(outputs)
         else:
-            # Multiple units - parallel execution
-            effective_workers = min(len(execution_units), max_parallel)
+            # Multiple units - parallel execution on the shared worker pool
+            unit_args = [
+                (idx, list(static_inputs) + unit)
+                for idx, unit in enumerate(execution_units)
+            ]
+            futures = self.worker_scope.run_batch(
+                unit_args,
+                lambda args: self._execute_unit(target_node, args[1], args[0]),
+                max_parallel=max_parallel,
+            )
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers) as executor:
-                futures: Dict[concurrent.futures.Future, int] = {}
-                
-                for idx, unit in enumerate(execution_units):
-                    unit_inputs = list(static_inputs) + unit
-                    future = executor.submit(
-                        self._execute_unit, target_node, unit_inputs, idx
+            results_by_idx: Dict[int, List[Message]] = {}
+            for idx, future in enumerate(futures):
+                try:
+                    result = future.result()
+                    results_by_idx[idx] = result
+                    self.log_manager.debug(
+                        f"Dynamic edge -> {target_node.id}#{idx}: "
+                        f"completed with {len(result)} outputs"
                     )
-                    futures[future] = idx
-                
-                results_by_idx: Dict[int, List[Message]] = {}
-                for future in concurrent.futures.as_completed(futures):
-                    idx = futures[future]
-                    try:
-                        result = future.result()
-                        results_by_idx[idx] = result
-                        self.log_manager.debug(
-                            f"Dynamic edge -> {target_node.id}#{idx}: "
-                            f"completed with {len(result)} outputs"
-                        )
-                    except Exception as e:
-                        self.log_manager.error(
-                            f"Dynamic edge -> {target_node.id}#{idx}: "
-                            f"failed with error: {e}"
-                        )
-                        raise
-                
-                # Combine results in original order
-                for idx in range(len(execution_units)):
-                    if idx in results_by_idx:
-                        all_outputs.extend(results_by_idx[idx])
+                except Exception as e:
+                    self.log_manager.error(
+                        f"Dynamic edge -> {target_node.id}#{idx}: "
+                        f"failed with error: {e}"
+                    )
+                    raise
+            
+            # Combine results in original order
+            for idx in range(len(execution_units)):
+                if idx in results_by_idx:
+                    all_outputs.extend(results_by_idx[idx])
         
         self.log_manager.info(
             f"Dynamic edge -> {target_node.id}: "
@@ -276,37 +276,34 @@ class DynamicEdgeExecutor:
                 outputs = self._execute_group(target_node, group_inputs, layer, 0)
                 layer_outputs.extend(outputs)
             else:
-                # Multiple groups - parallel execution
-                effective_workers = min(len(groups), max_parallel)
+                # Multiple groups - parallel execution on the shared worker pool
+                group_args = []
+                for idx, group in enumerate(groups):
+                    group_inputs = group
+                    if is_first_layer:
+                        group_inputs = list(static_inputs) + group_inputs
+                    group_args.append((idx, group_inputs))
+                futures = self.worker_scope.run_batch(
+                    group_args,
+                    lambda args: self._execute_group(target_node, args[1], layer, args[0]),
+                    max_parallel=max_parallel,
+                )
                 
-                with concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers) as executor:
-                    futures: Dict[concurrent.futures.Future, int] = {}
-                    
-                    for idx, group in enumerate(groups):
-                        group_inputs = group
-                        if is_first_layer:
-                            group_inputs = list(static_inputs) + group_inputs
-                        future = executor.submit(
-                            self._execute_group, target_node, group_inputs, layer, idx
+                results_by_idx: Dict[int, List[Message]] = {}
+                for idx, future in enumerate(futures):
+                    try:
+                        result = future.result()
+                        results_by_idx[idx] = result
+                    except Exception as e:
+                        self.log_manager.error(
+                            f"Dynamic edge -> {target_node.id}#{layer}-{idx}: "
+                            f"failed with error: {e}"
                         )
-                        futures[future] = idx
-                    
-                    results_by_idx: Dict[int, List[Message]] = {}
-                    for future in concurrent.futures.as_completed(futures):
-                        idx = futures[future]
-                        try:
-                            result = future.result()
-                            results_by_idx[idx] = result
-                        except Exception as e:
-                            self.log_manager.error(
-                                f"Dynamic edge -> {target_node.id}#{layer}-{idx}: "
-                                f"failed with error: {e}"
-                            )
-                            raise
-                    
-                    for idx in range(len(groups)):
-                        if idx in results_by_idx:
-                            layer_outputs.extend(results_by_idx[idx])
+                        raise
+                
+                for idx in range(len(groups)):
+                    if idx in results_by_idx:
+                        layer_outputs.extend(results_by_idx[idx])
             
             self.log_manager.debug(
                 f"Dynamic edge -> {target_node.id} layer {layer}: "
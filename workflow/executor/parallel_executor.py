@@ -1,9 +1,9 @@
 """Parallel execution helpers that eliminate duplicated code."""
 
-import concurrent.futures
 from typing import Any, Callable, List, Tuple
 
 from utils.log_manager import LogManager
+from workflow.executor.worker_pool import WorkerScope, get_worker_pool
 
 
 class ParallelExecutor:
@@ -12,15 +12,17 @@ class ParallelExecutor:
     Provides shared logic for parallel batches and serializes Human nodes when needed.
     """
     
-    def __init__(self, log_manager: LogManager, nodes_dict: dict):
+    def __init__(self, log_manager: LogManager, nodes_dict: dict, worker_scope: WorkerScope | None = None):
         """Initialize the parallel executor.
         
         Args:
             log_manager: Logger instance
             nodes_dict: Mapping of ``node_id`` to ``Node``
+            worker_scope: Scope on the shared worker pool (defaults to an anonymous scope)
         """
         self.log_manager = log_manager
         self.nodes_dict = nodes_dict
+        self.worker_scope = worker_scope or get_worker_pool().create_scope()
     
     def execute_items_parallel(
         self,
@@ -103,20 +105,16 @@ class ParallelExecutor:
         """
         self.log_manager.debug(f"Executing {len(items)} items in parallel")
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(items)) as executor:
-            futures = []
-            for item in items:
-                future = executor.submit(executor_func, item)
-                futures.append((item, future))
-            
-            # Wait for every future to finish
-            for item, future in futures:
-                try:
-                    future.result()
-                    self.log_manager.debug(f"{item_desc_func(item)} completed successfully")
-                except Exception as e:
-                    self.log_manager.error(f"{item_desc_func(item)} failed: {str(e)}")
-                    raise
+        futures = self.worker_scope.run_batch(items, executor_func)
+        
+        # Every item has finished; report them in submission order
+        for item, future in zip(items, futures):
+            try:
+                future.result()
+                self.log_manager.debug(f"{item_desc_func(item)} completed successfully")
+            except Exception as e:
+                self.log_manager.error(f"{item_desc_func(item)} failed: {str(e)}")
+                raise
     
     def _execute_sequential_batch(
         self,
@@ -0,0 +1,129 @@
+"""Dependency-driven executor for DAG workflows."""
+
+import concurrent.futures
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from entity.configs import Node
+from utils.log_manager import LogManager
+from workflow.executor.worker_pool import WorkerScope, get_worker_pool
+
+
+class ReadyQueueExecutor:
+    """Execute DAG workflows without layer barriers.
+
+    Features:
+    - Dispatch a node as soon as every predecessor has been resolved
+    - Submit nodes to the shared worker pool; when no slot is free, keep them queued
+      until a running node finishes, so the dispatcher never blocks on a node
+    - Resolve untriggered nodes in place so their successors are not held back
+    - Stop dispatching on the first failure or cancellation
+    """
+
+    def __init__(
+        self,
+        log_manager: LogManager,
+        nodes: Dict[str, Node],
+        execute_node_func: Callable[[Node], None],
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        worker_scope: Optional[WorkerScope] = None,
+    ):
+        """Initialize the executor.
+
+        Args:
+            log_manager: Logger instance
+            nodes: Mapping of node ids to ``Node`` objects
+            execute_node_func: Callable used to execute a single node
+            max_workers: Upper bound on concurrently running nodes (defaults to the node count)
+            cancel_event: Optional event that stops further dispatching once set
+            worker_scope: Scope on the shared worker pool (defaults to an anonymous scope)
+        """
+        self.log_manager = log_manager
+        self.nodes = nodes
+        self.execute_node_func = execute_node_func
+        self.max_workers = max(1, max_workers or len(nodes) or 1)
+        self.cancel_event = cancel_event
+        self.worker_scope = worker_scope or get_worker_pool().create_scope()
+
+    def execute(self) -> None:
+        """Execute the DAG workflow."""
+        pending = self._count_pending_predecessors()
+        ready: Deque[str] = deque(node_id for node_id, count in pending.items() if count == 0)
+        running: Dict[concurrent.futures.Future, str] = {}
+        failure: Optional[BaseException] = None
+
+        def resolve(node_id: str) -> None:
+            for successor in self.nodes[node_id].successors:
+                if successor.id not in pending:
+                    continue
+                pending[successor.id] -= 1
+                if pending[successor.id] == 0:
+                    ready.append(successor.id)
+
+        while ready or running:
+            while ready and failure is None and len(running) < self.max_workers:
+                if self._is_cancelled():
+                    ready.clear()
+                    break
+                node_id = ready.popleft()
+                node = self.nodes[node_id]
+                if not node.is_triggered():
+                    self.log_manager.debug(f"Node {node_id} skipped - not triggered")
+                    resolve(node_id)
+                    continue
+                future = self.worker_scope.try_submit(self.execute_node_func, node)
+                if future is None:
+                    if running or self.worker_scope.wait_for_slot():
+                        # Retry once one of our nodes finishes or another workflow frees a slot
+                        ready.appendleft(node_id)
+                        break
+                    # Nothing of ours is in flight and the pool stayed saturated: run inline
+                    # so nested workflows cannot deadlock waiting on each other's slots
+                    self.log_manager.debug(f"Executing node {node_id} inline")
+                    future = self.worker_scope.run_inline(self.execute_node_func, node)
+                else:
+                    self.log_manager.debug(f"Dispatching node {node_id}")
+                running[future] = node_id
+
+            if not running:
+                if ready and failure is None:
+                    continue
+                break
+
+            done, _ = concurrent.futures.wait(
+                running,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                node_id = running.pop(future)
+                try:
+                    future.result()
+                except Exception as exc:
+                    self.log_manager.error(f"node {node_id} failed: {exc}")
+                    if failure is None:
+                        failure = exc
+                    continue
+                self.log_manager.debug(f"node {node_id} completed successfully")
+                resolve(node_id)
+
+        if failure is not None:
+            raise failure
+
+        unresolved: List[str] = [node_id for node_id, count in pending.items() if count > 0]
+        if unresolved and not self._is_cancelled():
+            self.log_manager.warning(
+                f"Nodes never became ready (unresolved predecessors): {sorted(unresolved)}"
+            )
+
+    def _count_pending_predecessors(self) -> Dict[str, int]:
+        """Return the number of unresolved predecessors for every node."""
+        return {
+            node_id: sum(1 for predecessor in node.predecessors if predecessor.id in self.nodes)
+            for node_id, node in self.nodes.items()
+        }
+
+    def _is_cancelled(self) -> bool:
+        return bool(self.cancel_event and self.cancel_event.is_set())
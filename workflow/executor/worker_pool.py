@@ -0,0 +1,222 @@
+"""Process-wide worker pool shared by every running workflow.
+
+All parallel work (DAG/cycle layers, dynamic edge fan-out, ready-queue
+dispatch) is submitted through a ``WorkerScope`` so the whole process is
+bounded by a single thread budget instead of one short-lived pool per layer.
+"""
+
+import concurrent.futures
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_MAX_WORKERS = int(os.getenv("WORKFLOW_MAX_WORKERS", "64"))
+# 0 disables the explicit quota; scopes then only get their fair share.
+DEFAULT_WORKFLOW_QUOTA = int(os.getenv("WORKFLOW_WORKER_QUOTA", "0"))
+# How long a dispatcher with nothing in flight waits for a slot before running work inline.
+SLOT_WAIT_SECONDS = float(os.getenv("WORKFLOW_SLOT_WAIT_SECONDS", "5"))
+
+
+class WorkerPool:
+    """Bounded thread pool that hands out slots to per-workflow scopes.
+
+    A slot is only granted when a pool thread is guaranteed to be free, so a
+    submitted task starts immediately. Callers that cannot get a slot run the
+    work inline, which keeps nested parallelism (cycles inside layers,
+    subgraphs inside cycles) deadlock-free even when the pool is saturated.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="workflow-worker",
+        )
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._in_use = 0
+        self._active_scopes: Dict[int, "WorkerScope"] = {}
+
+    def create_scope(self, workflow_id: str = "default", quota: Optional[int] = None) -> "WorkerScope":
+        """Create a scope that submits work on behalf of a single workflow run."""
+        if quota is None:
+            quota = DEFAULT_WORKFLOW_QUOTA
+        return WorkerScope(self, workflow_id, quota)
+
+    def fair_share(self) -> int:
+        """Return the number of slots each active workflow may hold at once."""
+        with self._lock:
+            return self._fair_share_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool utilization for diagnostics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_use": self._in_use,
+                "active_workflows": {
+                    scope.workflow_id: scope.in_use for scope in self._active_scopes.values()
+                },
+            }
+
+    def _fair_share_locked(self) -> int:
+        return max(1, self.max_workers // max(1, len(self._active_scopes)))
+
+    def _activate(self, scope: "WorkerScope") -> None:
+        with self._lock:
+            self._active_scopes[id(scope)] = scope
+
+    def _deactivate(self, scope: "WorkerScope") -> None:
+        with self._lock:
+            self._active_scopes.pop(id(scope), None)
+
+    def _has_slot_locked(self, scope: "WorkerScope") -> bool:
+        if self._in_use >= self.max_workers:
+            return False
+        limit = self._fair_share_locked()
+        if scope.quota > 0:
+            limit = min(limit, scope.quota)
+        return scope.in_use < limit
+
+    def _try_acquire(self, scope: "WorkerScope") -> bool:
+        with self._lock:
+            if not self._has_slot_locked(scope):
+                return False
+            self._in_use += 1
+            scope.in_use += 1
+            return True
+
+    def _wait_for_slot(self, scope: "WorkerScope", timeout: float) -> bool:
+        with self._lock:
+            return self._slot_freed.wait_for(lambda: self._has_slot_locked(scope), timeout)
+
+    def _release(self, scope: "WorkerScope") -> None:
+        with self._lock:
+            self._in_use -= 1
+            scope.in_use -= 1
+            self._slot_freed.notify_all()
+
+    def _submit(self, scope: "WorkerScope", fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        def run() -> Any:
+            # Release before the future resolves so whoever is waiting on it can reuse the slot
+            try:
+                return fn(*args)
+            finally:
+                self._release(scope)
+
+        return self._executor.submit(run)
+
+
+class WorkerScope:
+    """Per-workflow handle onto the shared ``WorkerPool``.
+
+    Use the scope as a context manager around a workflow run so it takes part
+    in fair-share accounting while the run is active.
+    """
+
+    def __init__(self, pool: WorkerPool, workflow_id: str, quota: int = 0):
+        self.pool = pool
+        self.workflow_id = workflow_id
+        self.quota = max(0, quota)
+        self.in_use = 0
+
+    def __enter__(self) -> "WorkerScope":
+        self.pool._activate(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.pool._deactivate(self)
+
+    def try_submit(self, fn: Callable[..., Any], *args: Any) -> Optional[concurrent.futures.Future]:
+        """Submit ``fn`` if a slot is free right now; return ``None`` otherwise."""
+        if not self.pool._try_acquire(self):
+            return None
+        try:
+            return self.pool._submit(self, fn, *args)
+        except Exception:
+            self.pool._release(self)
+            raise
+
+    def wait_for_slot(self, timeout: float = SLOT_WAIT_SECONDS) -> bool:
+        """Block until a slot is likely free for this scope; return ``False`` on timeout."""
+        return self.pool._wait_for_slot(self, timeout)
+
+    def run_inline(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        """Run ``fn`` in the calling thread and wrap the outcome in a future."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    def run_batch(
+        self,
+        items: Sequence[Any],
+        func: Callable[[Any], Any],
+        *,
+        max_parallel: Optional[int] = None,
+    ) -> List[concurrent.futures.Future]:
+        """Run ``func`` over ``items`` and return one completed future per item.
+
+        The calling thread works through the batch alongside any helpers it can
+        borrow from the pool, so the batch always makes progress. Every item is
+        executed even if some of them fail; inspect the returned futures (in
+        item order) for results and exceptions.
+        """
+        futures: List[concurrent.futures.Future] = [concurrent.futures.Future() for _ in items]
+        if not futures:
+            return futures
+
+        lock = threading.Lock()
+        cursor = 0
+
+        def claim() -> Optional[int]:
+            nonlocal cursor
+            with lock:
+                if cursor >= len(futures):
+                    return None
+                index = cursor
+                cursor += 1
+                return index
+
+        def run_item(index: int) -> None:
+            future = futures[index]
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(items[index]))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        def drain() -> None:
+            while (index := claim()) is not None:
+                run_item(index)
+
+        wanted_helpers = min(len(futures), max_parallel or len(futures)) - 1
+        helpers = 0
+        while True:
+            while helpers < wanted_helpers and self.try_submit(drain) is not None:
+                helpers += 1
+            index = claim()
+            if index is None:
+                break
+            run_item(index)
+
+        concurrent.futures.wait(futures)
+        return futures
+
+
+_worker_pool: Optional[WorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide worker pool, creating it on first use."""
+    global _worker_pool
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                _worker_pool = WorkerPool()
+    return _worker_pool
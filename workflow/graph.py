@@ -1,6 +1,8 @@
 ﻿"""Graph orchestration adapted to ChatDev design_0.4.0 workflows."""
 
+import os
 import threading
+import uuid
 from typing import Any, Callable, Dict, List, Optional
 
 from runtime.node.agent.memory import MemoryBase, MemoryFactory, MemoryManager
@@ -27,6 +29,7 @@ from workflow.runtime import (
     RuntimeBuilder,
     ResultArchiver,
     DagExecutionStrategy,
+    ReadyQueueExecutionStrategy,
     CycleExecutionStrategy,
     MajorityVoteStrategy,
 )
@@ -50,6 +53,11 @@ class ExecutionError(RuntimeError):
     """Raised when the workflow graph cannot be executed."""
 
 
+# "ready_queue" dispatches DAG nodes as soon as their predecessors finish;
+# "layered" keeps the legacy layer-by-layer barrier execution.
+DAG_SCHEDULER = os.getenv("WORKFLOW_DAG_SCHEDULER", "ready_queue").strip().lower()
+
+
 class GraphExecutor:
     """Executes ChatDev_new graph workflows with integrated memory and thinking management."""
 
@@ -66,6 +74,8 @@ class GraphExecutor:
         self.graph: GraphContext = graph
         self.outputs = {}
         self.logger = self._create_logger()
+        # Subgraph executors share the graph directory, so each run streams to its own file
+        self.logger.stream_to(self.graph.directory / f"execution_logs.{uuid.uuid4().hex[:12]}.jsonl")
         self._cancel_event = cancel_event or threading.Event()
         self._cancel_reason: Optional[str] = None
         runtime = RuntimeBuilder(graph).build(logger=self.logger, session_id=session_id)
@@ -77,6 +87,7 @@ class GraphExecutor:
         self.edge_processor_function_manager = runtime.edge_processor_function_manager
         self.log_manager = runtime.log_manager
         self.resource_manager = ResourceManager(self.log_manager)
+        self.worker_scope = runtime.worker_scope
 
         # Memory and Thinking management (moved from Graph)
         self.thinking_managers: Dict[str, ThinkingManagerBase] = {}
@@ -298,6 +309,27 @@ class GraphExecutor:
                     node.append_input(message.clone())
 
         # Execute based on graph type (using strategy objects)
+        with self.worker_scope:
+            self._run_strategy()
+
+        self._raise_if_cancelled()
+
+        # Collect final outputs and save memories
+        self._collect_all_outputs()
+        
+        # Get the final result according to the new logic
+        final_result = self.get_final_output()
+        
+        self._save_memories()
+
+        # Export runtime artifacts
+        archiver = ResultArchiver(self.graph, self.log_manager, self.token_tracker)
+        archiver.export(final_result)
+
+        return self.outputs
+
+    def _run_strategy(self) -> None:
+        """Run the execution strategy matching the graph topology."""
         if self.graph.is_majority_voting:
             strategy = MajorityVoteStrategy(
                 log_manager=self.log_manager,
@@ -305,6 +337,7 @@ class GraphExecutor:
                 initial_messages=self.initial_task_messages,
                 execute_node_func=self._execute_node,
                 payload_to_text_func=self._payload_to_text,
+                worker_scope=self.worker_scope,
             )
             self.majority_result = strategy.run()
         elif self.graph.has_cycles:
@@ -314,32 +347,27 @@ class GraphExecutor:
                 cycle_execution_order=self.graph.cycle_execution_order,
                 cycle_manager=self.cycle_manager,
                 execute_node_func=self._execute_node,
+                worker_scope=self.worker_scope,
             )
             strategy.run()
-        else:
+        elif DAG_SCHEDULER == "layered":
             strategy = DagExecutionStrategy(
                 log_manager=self.log_manager,
                 nodes=self.graph.nodes,
                 layers=self.graph.layers,
                 execute_node_func=self._execute_node,
+                worker_scope=self.worker_scope,
+            )
+            strategy.run()
+        else:
+            strategy = ReadyQueueExecutionStrategy(
+                log_manager=self.log_manager,
+                nodes=self.graph.nodes,
+                execute_node_func=self._execute_node,
+                cancel_event=self._cancel_event,
+                worker_scope=self.worker_scope,
             )
             strategy.run()
-
-        self._raise_if_cancelled()
-
-        # Collect final outputs and save memories
-        self._collect_all_outputs()
-        
-        # Get the final result according to the new logic
-        final_result = self.get_final_output()
-        
-        self._save_memories()
-
-        # Export runtime artifacts
-        archiver = ResultArchiver(self.graph, self.log_manager, self.token_tracker)
-        archiver.export(final_result)
-
-        return self.outputs
     
     def _prepare_edge_conditions(self) -> None:
         """Compile registered edge condition types into callable evaluators."""
@@ -453,10 +481,9 @@ class GraphExecutor:
         
         found_configs = []  # List of (source_node_id, dynamic_config)
         
-        for predecessor in node.predecessors:
-            for edge_link in predecessor.iter_outgoing_edges():
-                if edge_link.target is node and edge_link.dynamic_config is not None:
-                    found_configs.append((predecessor.id, edge_link.dynamic_config))
+        for edge_link in node.iter_incoming_edges():
+            if edge_link.dynamic_config is not None:
+                found_configs.append((edge_link.source.id, edge_link.dynamic_config))
         
         if not found_configs:
             return None
@@ -537,7 +564,7 @@ class GraphExecutor:
             return self._process_result(n, inp)
         
         # Execute with dynamic edge executor
-        dynamic_executor = DynamicEdgeExecutor(self.log_manager, node_executor_func)
+        dynamic_executor = DynamicEdgeExecutor(self.log_manager, node_executor_func, self.worker_scope)
         
         # Pass dynamic inputs for splitting, static inputs for replication
         return dynamic_executor.execute_from_inputs(
@@ -43,6 +43,8 @@ class GraphManager:
             node_instance.predecessors = []
             node_instance.successors = []
             node_instance._outgoing_edges = []
+            node_instance._incoming_edges = []
+            node_instance._triggered_incoming = 0
             node_instance.vars = dict(self.graph.vars)
             self.graph.nodes[node_id] = node_instance
 
@@ -327,14 +329,7 @@ class GraphManager:
             if node_id in start_nodes:
                 continue
 
-            has_triggerable_edge = False
-            for predecessor in node.predecessors:
-                for edge_link in predecessor.iter_outgoing_edges():
-                    if edge_link.target is node and edge_link.trigger:
-                        has_triggerable_edge = True
-                        break
-                if has_triggerable_edge:
-                    break
+            has_triggerable_edge = any(edge_link.trigger for edge_link in node.iter_incoming_edges())
 
             if not has_triggerable_edge:
                 print(
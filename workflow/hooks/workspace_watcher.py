@@ -0,0 +1,306 @@
+"""Shared change tracker for a run's code workspace."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Files modified this close to when they were hashed are rehashed next time, since a
+# write within the filesystem's timestamp granularity can leave size and mtime unchanged.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class FileSignature:
+    sha256: str
+    size: int
+    mtime_ns: int
+    inode: int
+    checked_ns: int
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (
+            self.size == stat.st_size
+            and self.mtime_ns == stat.st_mtime_ns
+            and self.inode == stat.st_ino
+            and stat.st_mtime_ns + _RACY_WINDOW_NS < self.checked_ns
+        )
+
+
+@dataclass(frozen=True)
+class WorkspaceChange:
+    """A file that appeared, changed or disappeared between two scans."""
+
+    relative_path: str
+    change_type: str  # "modified" or "deleted"
+    signature: Optional[FileSignature]
+    detected_at: float
+
+    @property
+    def written_ns(self) -> Optional[int]:
+        return self.signature.mtime_ns if self.signature else None
+
+
+@dataclass
+class _NodeWindow:
+    node_id: str
+    start_ns: int
+    end_ns: Optional[int] = None
+
+    def contains(self, timestamp_ns: int) -> bool:
+        return self.start_ns <= timestamp_ns and (self.end_ns is None or timestamp_ns <= self.end_ns)
+
+
+class WorkspaceWatcher:
+    """Scans one workspace on behalf of every node in a run.
+
+    Nodes open a window with :meth:`begin` and close it with :meth:`end`,
+    which rescans the workspace and returns the changes attributed to that
+    node. Concurrent ``end`` calls share a single scan. A change goes to the
+    node that claimed the path through a file tool; otherwise to the node
+    whose window contains the file's mtime, the first of them to finish when
+    windows overlap. Changes written outside every window, and deletions, go
+    to the node that finishes next. Changes made only by a node that fails
+    are discarded when its window closes.
+    """
+
+    def __init__(
+        self,
+        *,
+        exclude_dirs: Sequence[str],
+        max_files_scanned: int,
+        max_bytes_scanned: int,
+    ) -> None:
+        self.exclude_dirs = set(exclude_dirs)
+        self.max_files_scanned = max_files_scanned
+        self.max_bytes_scanned = max_bytes_scanned
+        self.logger = logging.getLogger(__name__)
+        self.workspace: Optional[Path] = None
+        self.signatures: Dict[str, FileSignature] = {}
+        self.truncated = False
+        self._has_baseline = False
+        self._lock = threading.Condition()
+        self._windows: Dict[Tuple[str, int], _NodeWindow] = {}
+        self._pending: List[WorkspaceChange] = []
+        self._claims: Dict[str, str] = {}
+        self._scanning = False
+        self._requested = 0
+        self._completed = 0
+        self.scan_count = 0
+
+    # ------------------------------------------------------------------
+    # Node windows
+    # ------------------------------------------------------------------
+    def begin(self, node_id: str, workspace: Path) -> None:
+        with self._lock:
+            if self.workspace != workspace:
+                self.workspace = workspace
+                self.signatures = {}
+                self._pending.clear()
+                self._has_baseline = False
+            self._windows[(node_id, threading.get_ident())] = _NodeWindow(node_id, time.time_ns())
+            needs_baseline = not self._has_baseline
+        if needs_baseline:
+            self.refresh()
+
+    def end(self, node_id: str, *, collect: bool = True) -> List[WorkspaceChange]:
+        """Close ``node_id``'s window and return the changes attributed to it.
+
+        With ``collect`` False (the node failed) the changes the node made are
+        discarded instead, so they are not reported for the next node to finish.
+        """
+        self.refresh()
+        with self._lock:
+            window = self._windows.pop((node_id, threading.get_ident()), None)
+            if window is None:
+                return []
+            window.end_ns = time.time_ns()
+            if collect:
+                attributed = self._attribute(window)
+            else:
+                self._discard(window)
+                attributed = []
+            self._prune_claims()
+            return attributed
+
+    def claim(self, node_id: str, relative_path: str | Path) -> None:
+        """Record that ``node_id`` wrote ``relative_path`` (a file or directory) via a tool."""
+        with self._lock:
+            self._claims[str(Path(relative_path))] = node_id
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Make sure a scan that started after this call has completed."""
+        with self._lock:
+            self._requested += 1
+            ticket = self._requested
+            while self._completed < ticket:
+                if not self._scanning:
+                    break
+                self._lock.wait()
+            else:
+                return
+            self._scanning = True
+            covered = self._requested
+            workspace = self.workspace
+            known = dict(self.signatures)
+        result = None
+        try:
+            if workspace is not None:
+                result = self._scan(workspace, known)
+        finally:
+            with self._lock:
+                if result is not None and self.workspace == workspace:
+                    self._record(known, *result)
+                self._scanning = False
+                self._completed = covered
+                self._lock.notify_all()
+
+    def _record(self, known: Dict[str, FileSignature], entries: Dict[str, FileSignature], truncated: bool) -> None:
+        # The first scan of a workspace only establishes what was already there
+        report = self._has_baseline
+        detected_at = time.time()
+        for path, signature in entries.items():
+            previous = known.get(path)
+            if report and (previous is None or previous.sha256 != signature.sha256):
+                self._pending.append(WorkspaceChange(path, "modified", signature, detected_at))
+        if not truncated:
+            if report:
+                for path in known.keys() - entries.keys():
+                    self._pending.append(WorkspaceChange(path, "deleted", None, detected_at))
+            self.signatures = entries
+        else:
+            self.signatures.update(entries)
+        self.truncated = truncated
+        self._has_baseline = True
+        self.scan_count += 1
+
+    def _scan(self, workspace: Path, known: Dict[str, FileSignature]) -> Tuple[Dict[str, FileSignature], bool]:
+        """Walk the workspace, hashing only files whose (size, mtime, inode) changed."""
+        entries: Dict[str, FileSignature] = {}
+        total_bytes = 0
+        file_count = 0
+        hashed = 0
+        for root, dirs, files in os.walk(workspace):
+            rel_root = Path(root).relative_to(workspace)
+            dirs[:] = [d for d in dirs if not self._is_excluded(rel_root / d)]
+            for filename in files:
+                rel_path = rel_root / filename
+                if self._is_excluded(rel_path):
+                    continue
+                key = str(rel_path)
+                full_path = Path(root) / filename
+                try:
+                    stat = full_path.stat()
+                    signature = known.get(key)
+                    if signature is None or not signature.matches(stat):
+                        checked_ns = time.time_ns()
+                        signature = FileSignature(
+                            sha256=self._hash_file(full_path),
+                            size=stat.st_size,
+                            mtime_ns=stat.st_mtime_ns,
+                            inode=stat.st_ino,
+                            checked_ns=checked_ns,
+                        )
+                        hashed += 1
+                except OSError:
+                    continue
+                file_count += 1
+                total_bytes += stat.st_size
+                entries[key] = signature
+                if file_count >= self.max_files_scanned or total_bytes >= self.max_bytes_scanned:
+                    self.logger.warning(
+                        "Workspace scan truncated (files=%s total_bytes=%s) for %s",
+                        file_count,
+                        total_bytes,
+                        workspace,
+                    )
+                    return entries, True
+        self.logger.debug("Workspace scan of %s: %s files, %s hashed", workspace, file_count, hashed)
+        return entries, False
+
+    def _is_excluded(self, rel_path: Path) -> bool:
+        if not rel_path.parts:
+            return False
+        return rel_path.parts[0] in self.exclude_dirs
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Attribution (callers hold the lock)
+    # ------------------------------------------------------------------
+    def _attribute(self, window: _NodeWindow) -> List[WorkspaceChange]:
+        attributed: List[WorkspaceChange] = []
+        remaining: List[WorkspaceChange] = []
+        running = list(self._windows.values())
+        for change in self._pending:
+            owner = self._claimed_by(change.relative_path)
+            if owner is not None:
+                if owner == window.node_id:
+                    attributed.append(change)
+                elif any(other.node_id == owner for other in running):
+                    remaining.append(change)
+                else:
+                    # Claimed by a node that already finished; nobody else wrote it
+                    attributed.append(change)
+                continue
+            written_ns = change.written_ns
+            if (
+                written_ns is not None
+                and not window.contains(written_ns)
+                and any(other.contains(written_ns) for other in running)
+            ):
+                remaining.append(change)
+            else:
+                attributed.append(change)
+        self._pending = remaining
+        for change in attributed:
+            self._claims.pop(change.relative_path, None)
+        return attributed
+
+    def _discard(self, window: _NodeWindow) -> None:
+        """Drop pending changes that only ``window``'s node can have made."""
+        remaining: List[WorkspaceChange] = []
+        running = list(self._windows.values())
+        for change in self._pending:
+            owner = self._claimed_by(change.relative_path)
+            written_ns = change.written_ns
+            if owner is not None:
+                owned = owner == window.node_id
+            else:
+                owned = (
+                    written_ns is not None
+                    and window.contains(written_ns)
+                    and not any(other.contains(written_ns) for other in running)
+                )
+            if owned:
+                self._claims.pop(change.relative_path, None)
+            else:
+                remaining.append(change)
+        self._pending = remaining
+
+    def _claimed_by(self, relative_path: str) -> Optional[str]:
+        if not self._claims:
+            return None
+        path = Path(relative_path)
+        for candidate in (path, *path.parents):
+            owner = self._claims.get(str(candidate))
+            if owner is not None:
+                return owner
+        return None
+
+    def _prune_claims(self) -> None:
+        running_ids: Set[str] = {window.node_id for window in self._windows.values()}
+        self._claims = {path: owner for path, owner in self._claims.items() if owner in running_ids}
@@ -4,6 +4,7 @@ from .runtime_context import RuntimeContext
 from .runtime_builder import RuntimeBuilder
 from .execution_strategy import (
     DagExecutionStrategy,
+    ReadyQueueExecutionStrategy,
     CycleExecutionStrategy,
     MajorityVoteStrategy,
 )
@@ -13,6 +14,7 @@ __all__ = [
     "RuntimeContext",
     "RuntimeBuilder",
     "DagExecutionStrategy",
+    "ReadyQueueExecutionStrategy",
     "CycleExecutionStrategy",
     "MajorityVoteStrategy",
     "ResultArchiver",
@@ -1,7 +1,8 @@
 """Execution strategies for different graph topologies."""
 
+import threading
 from collections import Counter
-from typing import Callable, Dict, List, Sequence
+from typing import Callable, Dict, List, Optional, Sequence
 
 from entity.configs import Node
 from entity.messages import Message
@@ -9,6 +10,8 @@ from utils.log_manager import LogManager
 from workflow.executor.dag_executor import DAGExecutor
 from workflow.executor.cycle_executor import CycleExecutor
 from workflow.executor.parallel_executor import ParallelExecutor
+from workflow.executor.ready_queue_executor import ReadyQueueExecutor
+from workflow.executor.worker_pool import WorkerScope
 
 
 class DagExecutionStrategy:
@@ -20,11 +23,13 @@ class DagExecutionStrategy:
         nodes: Dict[str, Node],
         layers: List[List[str]],
         execute_node_func: Callable[[Node], None],
+        worker_scope: Optional[WorkerScope] = None,
     ) -> None:
         self.log_manager = log_manager
         self.nodes = nodes
         self.layers = layers
         self.execute_node_func = execute_node_func
+        self.worker_scope = worker_scope
 
     def run(self) -> None:
         dag_executor = DAGExecutor(
@@ -32,10 +37,43 @@ class DagExecutionStrategy:
             nodes=self.nodes,
             layers=self.layers,
             execute_node_func=self.execute_node_func,
+            worker_scope=self.worker_scope,
         )
         dag_executor.execute()
 
 
+class ReadyQueueExecutionStrategy:
+    """Executes acyclic graphs by dispatching nodes as soon as their predecessors finish."""
+
+    def __init__(
+        self,
+        log_manager: LogManager,
+        nodes: Dict[str, Node],
+        execute_node_func: Callable[[Node], None],
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        worker_scope: Optional[WorkerScope] = None,
+    ) -> None:
+        self.log_manager = log_manager
+        self.nodes = nodes
+        self.execute_node_func = execute_node_func
+        self.max_workers = max_workers
+        self.cancel_event = cancel_event
+        self.worker_scope = worker_scope
+
+    def run(self) -> None:
+        ready_queue_executor = ReadyQueueExecutor(
+            log_manager=self.log_manager,
+            nodes=self.nodes,
+            execute_node_func=self.execute_node_func,
+            max_workers=self.max_workers,
+            cancel_event=self.cancel_event,
+            worker_scope=self.worker_scope,
+        )
+        ready_queue_executor.execute()
+
+
 class CycleExecutionStrategy:
     """Executes graphs containing cycles via CycleExecutor."""
 
@@ -46,12 +84,14 @@ class CycleExecutionStrategy:
         cycle_execution_order: List[Dict[str, str]],
         cycle_manager,
         execute_node_func: Callable[[Node], None],
+        worker_scope: Optional[WorkerScope] = None,
     ) -> None:
         self.log_manager = log_manager
         self.nodes = nodes
         self.cycle_execution_order = cycle_execution_order
         self.cycle_manager = cycle_manager
         self.execute_node_func = execute_node_func
+        self.worker_scope = worker_scope
 
     def run(self) -> None:
         cycle_executor = CycleExecutor(
@@ -60,6 +100,7 @@ class CycleExecutionStrategy:
             cycle_execution_order=self.cycle_execution_order,
             cycle_manager=self.cycle_manager,
             execute_node_func=self.execute_node_func,
+            worker_scope=self.worker_scope,
         )
         cycle_executor.execute()
 
@@ -74,12 +115,14 @@ class MajorityVoteStrategy:
         initial_messages: Sequence[Message],
         execute_node_func: Callable[[Node], None],
         payload_to_text_func: Callable[[object], str],
+        worker_scope: Optional[WorkerScope] = None,
     ) -> None:
         self.log_manager = log_manager
         self.nodes = nodes
         self.initial_messages = initial_messages
         self.execute_node_func = execute_node_func
         self.payload_to_text = payload_to_text_func
+        self.worker_scope = worker_scope
 
     def run(self) -> str:
         self.log_manager.info("Executing graph with majority voting approach")
@@ -98,7 +141,7 @@ class MajorityVoteStrategy:
         def _execute(node_id: str) -> None:
             self.execute_node_func(self.nodes[node_id])
 
-        parallel_executor = ParallelExecutor(self.log_manager, self.nodes)
+        parallel_executor = ParallelExecutor(self.log_manager, self.nodes, self.worker_scope)
         parallel_executor.execute_nodes_parallel(node_ids, _execute)
 
         return self._collect_majority_result()
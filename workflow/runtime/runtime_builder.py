@@ -3,12 +3,13 @@
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-from runtime.node.agent import ToolManager
+from runtime.node.agent import get_tool_manager
 from utils.attachments import AttachmentStore
 from utils.function_manager import EDGE_FUNCTION_DIR, EDGE_PROCESSOR_FUNCTION_DIR, get_function_manager
 from utils.log_manager import LogManager
 from utils.logger import WorkflowLogger
 from utils.token_tracker import TokenTracker
+from workflow.executor.worker_pool import get_worker_pool
 from workflow.graph_context import GraphContext
 
 from .runtime_context import RuntimeContext
@@ -21,12 +22,13 @@ class RuntimeBuilder:
     graph: GraphContext
 
     def build(self, logger: Optional[WorkflowLogger] = None, *, session_id: Optional[str] = None) -> RuntimeContext:
-        tool_manager = ToolManager()
+        tool_manager = get_tool_manager()
         function_manager = get_function_manager(EDGE_FUNCTION_DIR)
         processor_function_manager = get_function_manager(EDGE_PROCESSOR_FUNCTION_DIR)
         logger = logger or WorkflowLogger(self.graph.name, self.graph.log_level)
         log_manager = LogManager(logger)
         token_tracker = TokenTracker(workflow_id=self.graph.name)
+        worker_scope = get_worker_pool().create_scope(self.graph.name)
 
         code_workspace = (self.graph.directory / "code_workspace").resolve()
         code_workspace.mkdir(parents=True, exist_ok=True)
@@ -50,6 +52,7 @@ class RuntimeBuilder:
             token_tracker=token_tracker,
             attachment_store=attachment_store,
             code_workspace=code_workspace,
+            worker_scope=worker_scope,
             global_state=global_state,
         )
         context.session_id = session_id
@@ -10,6 +10,7 @@ from utils.logger import WorkflowLogger
 from utils.log_manager import LogManager
 from utils.token_tracker import TokenTracker
 from utils.attachments import AttachmentStore
+from workflow.executor.worker_pool import WorkerScope
 
 
 @dataclass
@@ -24,6 +25,7 @@ class RuntimeContext:
     token_tracker: TokenTracker
     attachment_store: AttachmentStore
     code_workspace: Path
+    worker_scope: WorkerScope
     global_state: Dict[str, Any] = field(default_factory=dict)
     cycle_manager: Optional[Any] = None  # Late-bound by GraphManager
     session_id: Optional[str] = None